@@ -9,6 +9,15 @@ block_cipher = None
 # Platform detection
 is_windows = sys.platform == 'win32'
 
+# Precompile the JSON catalogs so the app can skip parsing them at startup;
+# a stale or missing .catalog is rebuilt at runtime.
+sys.path.insert(0, os.path.abspath('.'))
+try:
+    from src.core.catalog_index import compile_to_disk
+    compile_to_disk([os.path.join('config', 'system_tools.json'), os.path.join('config', 'bloatware_config.json')])
+except Exception as _e:
+    print(f"Warning: could not precompile catalogs: {_e}")
+
 added_files = [
     ('config', 'config'),
     ('images', 'images'),
@@ -1,16 +1,41 @@
 import os
+import re
 import sys
 import subprocess
-import json
 import logging
+from fnmatch import fnmatchcase
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
 from typing import Optional, Dict, List, Tuple, Callable, Any
 from src.utils.helpers import get_resource_path
+from src.utils.powershell_host import run_powershell, get_powershell_pool
+from src.core.catalog_index import LazyCatalog, load_index
 
 CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
 
 logger = logging.getLogger(__name__)
 
+# Check commands of these shapes are answered from one bulk snapshot per kind
+# instead of one PowerShell call per item.  Anything else is a custom check.
+_CHECK_PATTERNS = {
+    "appx": re.compile(r"^Get-AppxPackage -Name '([^']+)' \| Select-Object -First 1$", re.IGNORECASE),
+    "feature": re.compile(r"^Get-WindowsOptionalFeature -Online -FeatureName '([^']+)' \| "
+                          r"Where-Object \{\$_\.State -eq 'Enabled'\}$", re.IGNORECASE),
+    "service": re.compile(r"^Get-Service -Name '([^']+)' \| Where-Object \{\$_\.Status -eq 'Running'\}$",
+                          re.IGNORECASE),
+    "capability": re.compile(r"^Get-WindowsCapability -Online \| Where-Object \{\$_\.Name -like '([^']+)' "
+                             r"-and \$_\.State -eq 'Installed'\}$", re.IGNORECASE),
+}
+
+_SNAPSHOT_COMMANDS = {
+    "appx": "Get-AppxPackage | Select-Object -ExpandProperty Name",
+    "feature": "Get-WindowsOptionalFeature -Online | Where-Object {$_.State -eq 'Enabled'} | "
+               "Select-Object -ExpandProperty FeatureName",
+    "service": "Get-Service | Where-Object {$_.Status -eq 'Running'} | Select-Object -ExpandProperty Name",
+    "capability": "Get-WindowsCapability -Online | Where-Object {$_.State -eq 'Installed'} | "
+                  "Select-Object -ExpandProperty Name",
+}
+
 class BloatwareCategory(Enum):
     MICROSOFT_STORE_APPS = "Microsoft Store Apps"
     WINDOWS_FEATURES = "Windows Features"
@@ -26,6 +51,9 @@ class SafetyLevel(Enum):
     RISKY = "risky"
 
 class BloatwareItem:
+    __slots__ = ("id", "name", "description", "category", "safety_level", "commands",
+                 "check_command", "requires_admin", "requires_restart", "is_installed")
+
     def __init__(self, item_id, name, description, category, safety_level, commands, 
                  check_command=None, requires_admin=True, requires_restart=False):
         self.id = item_id
@@ -39,6 +67,37 @@ class BloatwareItem:
         self.requires_restart = requires_restart
         self.is_installed = False
 
+
+CATEGORY_MAPPING = {
+    "Microsoft Store Apps": BloatwareCategory.MICROSOFT_STORE_APPS,
+    "Windows Features": BloatwareCategory.WINDOWS_FEATURES,
+    "OneDrive": BloatwareCategory.ONEDRIVE,
+    "Telemetry And Privacy": BloatwareCategory.TELEMETRY,
+    "OEM Bloatware": BloatwareCategory.OEM_BLOATWARE,
+    "Windows Services": BloatwareCategory.WINDOWS_SERVICES,
+    "Optional Components": BloatwareCategory.OPTIONAL_COMPONENTS,
+}
+
+
+def prepare_bloat_entry(entry):
+    """Catalog compile step: drop entries whose category the app does not know."""
+    return entry if entry.get("category") in CATEGORY_MAPPING else None
+
+
+def _item_from_entry(item_data):
+    return BloatwareItem(
+        item_id=item_data["id"],
+        name=item_data["name"],
+        description=item_data["description"],
+        category=CATEGORY_MAPPING[item_data["category"]],
+        safety_level=SafetyLevel[item_data["safety_level"].upper()],
+        commands=item_data["commands"],
+        check_command=item_data.get("check_command"),
+        requires_admin=item_data.get("requires_admin", True),
+        requires_restart=item_data.get("requires_restart", False)
+    )
+
+
 class BloatRemover:
     def __init__(self, config_path=None):
         self.items = {}
@@ -49,57 +108,95 @@ class BloatRemover:
         self._load_config()
         
     def _load_config(self):
+        """Open the compiled catalog; BloatwareItem objects are built per category on first use."""
         try:
             if not os.path.exists(self.config_path):
                 logger.error(f"Bloatware config not found: {self.config_path}")
                 return
-            
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            category_mapping = {
-                "Microsoft Store Apps": BloatwareCategory.MICROSOFT_STORE_APPS,
-                "Windows Features": BloatwareCategory.WINDOWS_FEATURES,
-                "OneDrive": BloatwareCategory.ONEDRIVE,
-                "Telemetry And Privacy": BloatwareCategory.TELEMETRY,
-                "OEM Bloatware": BloatwareCategory.OEM_BLOATWARE,
-                "Windows Services": BloatwareCategory.WINDOWS_SERVICES,
-                "Optional Components": BloatwareCategory.OPTIONAL_COMPONENTS,
-            }
-            
-            for item_data in config.get("items", []):
-                category = category_mapping.get(item_data["category"])
-                if not category: continue
-                
-                item = BloatwareItem(
-                    item_id=item_data["id"],
-                    name=item_data["name"],
-                    description=item_data["description"],
-                    category=category,
-                    safety_level=SafetyLevel[item_data["safety_level"].upper()],
-                    commands=item_data["commands"],
-                    check_command=item_data.get("check_command"),
-                    requires_admin=item_data.get("requires_admin", True),
-                    requires_restart=item_data.get("requires_restart", False)
-                )
-                self.items[item.id] = item
+            self.items = LazyCatalog(load_index(self.config_path, prepare_bloat_entry), _item_from_entry)
         except Exception as e:
             logger.error(f"Failed to load bloatware config: {e}")
 
+    def summaries(self):
+        """(id, name, description, category, safety_level) per item, without building the items."""
+        if not isinstance(self.items, LazyCatalog):
+            return [(i.id, i.name, i.description, i.category, i.safety_level) for i in self.items.values()]
+        return [(item_id, name, description, CATEGORY_MAPPING[category], SafetyLevel[safety.upper()])
+                for item_id, name, description, category, safety in self.items.summaries()]
+
     def execute_powershell(self, command, timeout=300):
         if sys.platform != 'win32':
             return False, "", "PowerShell is not available on this platform."
-        from src.utils.helpers import run_command
         try:
-            ps_command = ["powershell.exe", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass", "-Command", command]
-            result = run_command(ps_command, timeout=timeout)
+            # Runs on the shared persistent host instead of a fresh powershell.exe
+            result = run_powershell(command, timeout=timeout)
             return result.returncode == 0, result.stdout.strip(), result.stderr.strip()
         except Exception as e:
             return False, "", str(e)
 
-    def scan_system(self, progress_callback=None):
-        results = {}
+    def scan_system(self, progress_callback=None, batched=True):
+        """Check which catalog items are present; returns {item_id: bool}.
+
+        With ``batched`` the Appx packages, enabled features, running services
+        and installed capabilities are each fetched once and the standard
+        checks are answered from those snapshots.  Custom checks, and any kind
+        whose snapshot failed, run in parallel on the PowerShell pool.
+        """
         items = list(self.items.values())
+        if not batched:
+            return self._scan_sequential(items, progress_callback)
+
+        results = {}
+        parsed = {}
+        custom = []
+        for item in items:
+            if not item.check_command:
+                results[item.id] = True
+                continue
+            match = self._parse_check(item.check_command)
+            if match:
+                parsed[item.id] = match
+            else:
+                custom.append(item)
+
+        kinds = sorted({kind for kind, _ in parsed.values()})
+        if progress_callback: progress_callback(0, f"Collecting {', '.join(kinds) or 'system'} snapshots...")
+        snapshots = self._take_snapshots(kinds)
+
+        for item in items:
+            if item.id not in parsed:
+                continue
+            kind, pattern = parsed[item.id]
+            if kind not in snapshots:
+                custom.append(item)
+                continue
+            results[item.id] = any(fnmatchcase(name, pattern) for name in snapshots[kind])
+
+        total = len(items)
+        done = total - len(custom)
+        if progress_callback: progress_callback(int(done / total * 100) if total else 100, "Snapshot checks evaluated")
+
+        if custom:
+            workers = min(len(custom), max(1, get_powershell_pool().size))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(self.execute_powershell, item.check_command): item for item in custom}
+                for future in as_completed(futures):
+                    item = futures[future]
+                    try:
+                        success, stdout, _ = future.result()
+                    except Exception:
+                        success, stdout = False, ""
+                    results[item.id] = success and bool(stdout.strip())
+                    done += 1
+                    if progress_callback: progress_callback(int(done / total * 100), f"Checked {item.name}")
+
+        for item in items:
+            item.is_installed = results.get(item.id, False)
+        if progress_callback: progress_callback(100, "Scan complete")
+        return {item.id: item.is_installed for item in items}
+
+    def _scan_sequential(self, items, progress_callback=None):
+        results = {}
         for i, item in enumerate(items):
             if progress_callback: progress_callback(int((i / len(items)) * 100), f"Checking {item.name}...")
             if not item.check_command:
@@ -112,6 +209,31 @@ class BloatRemover:
         if progress_callback: progress_callback(100, "Scan complete")
         return results
 
+    @staticmethod
+    def _parse_check(command):
+        """Return (kind, lowercase wildcard pattern) for a standard check, else None."""
+        command = " ".join(command.split())
+        for kind, regex in _CHECK_PATTERNS.items():
+            m = regex.match(command)
+            if m:
+                return kind, m.group(1).lower()
+        return None
+
+    def _take_snapshots(self, kinds):
+        """Run one bulk query per kind; kinds whose query fails are left out."""
+        snapshots = {}
+        if not kinds or sys.platform != 'win32':
+            return snapshots
+        with ThreadPoolExecutor(max_workers=len(kinds)) as pool:
+            futures = {kind: pool.submit(self.execute_powershell, _SNAPSHOT_COMMANDS[kind]) for kind in kinds}
+            for kind, future in futures.items():
+                success, stdout, stderr = future.result()
+                if not success:
+                    logger.warning(f"Bloatware {kind} snapshot failed, falling back to per-item checks: {stderr}")
+                    continue
+                snapshots[kind] = {line.strip().lower() for line in stdout.splitlines() if line.strip()}
+        return snapshots
+
     def remove_items(self, item_ids, output_callback=None):
         """Standard removal method used by Ghosty Tools.py (in _run_bloat_removal)"""
         for item_id in item_ids:
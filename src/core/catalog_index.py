@@ -0,0 +1,209 @@
+"""Precompiled, lazily materialized item catalogs.
+
+The JSON catalogs in config/ are compiled into a ``.catalog`` file holding
+one small summary row per entry plus each category's raw entries serialized
+separately.  Loading a catalog only parses the outer index; a category's
+entries are parsed and turned into item objects the first time something in
+that category is looked up.  The format is plain JSON, so a tampered cache
+file can at worst be rejected, never execute code.
+
+Build step:  python -m src.core.catalog_index config/system_tools.json config/bloatware_config.json
+"""
+import os
+import sys
+import json
+import hashlib
+import logging
+import threading
+from collections.abc import Mapping
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+SUMMARY_FIELDS = ("id", "name", "description", "category", "safety_level")
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def compile_catalog(json_path, prepare=None, list_key=None):
+    """Parse a JSON catalog and return the compiled index dict.
+
+    ``prepare(entry)`` may add precomputed fields (e.g. a parsed winget id)
+    so that work is done once here rather than on every load, or return
+    None to drop the entry.
+    """
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    config = json.loads(raw.decode('utf-8'))
+    if list_key is None:
+        list_key = "tools" if "tools" in config else "items"
+
+    by_category = {}
+    summaries = []
+    for entry in config.get(list_key, []):
+        if prepare:
+            entry = prepare(entry)
+            if entry is None:
+                continue
+        by_category.setdefault(entry.get("category"), []).append(entry)
+        summaries.append(tuple(entry.get(k) for k in SUMMARY_FIELDS))
+
+    return {
+        "version": FORMAT_VERSION,
+        "source_digest": _digest(raw),
+        "summaries": summaries,
+        "categories": {cat: json.dumps(entries, separators=(",", ":"))
+                       for cat, entries in by_category.items()},
+    }
+
+
+def _dump(index, path):
+    # Category names may be None, which JSON objects cannot key, so store pairs.
+    data = dict(index, categories=list(index["categories"].items()))
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+        return None
+    data["summaries"] = [tuple(row) for row in data["summaries"]]
+    data["categories"] = {cat: packed for cat, packed in data["categories"]}
+    return data
+
+
+def _cache_path(json_path):
+    from src.utils.helpers import get_config_dir
+    return os.path.join(get_config_dir(), "catalog_cache", os.path.basename(json_path) + ".catalog")
+
+
+def load_index(json_path, prepare=None):
+    """Return the compiled index for ``json_path``, rebuilding it if the JSON changed.
+
+    A ``<json>.catalog`` shipped next to the JSON is used first, then the
+    per-user cache; either is only trusted while its digest matches the
+    JSON bytes.  A fresh build is written back to the per-user cache.
+    """
+    with open(json_path, 'rb') as f:
+        digest = _digest(f.read())
+
+    for path in (json_path + ".catalog", _cache_path(json_path)):
+        try:
+            index = _read(path)
+        except (OSError, ValueError, TypeError, KeyError):
+            continue
+        if index is not None and index.get("source_digest") == digest:
+            return index
+
+    index = compile_catalog(json_path, prepare)
+    try:
+        cache = _cache_path(json_path)
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        _dump(index, cache)
+    except OSError as e:
+        logger.debug(f"Could not cache compiled catalog for {json_path}: {e}")
+    return index
+
+
+class LazyCatalog(Mapping):
+    """Read-only {item_id: item} mapping that builds items one category at a time.
+
+    ``factory(entry)`` turns a raw JSON entry into an item object, or returns
+    None to skip it.  Iteration order follows the JSON file and does not
+    materialize anything; summaries() gives the fields needed to list items
+    without building them.
+    """
+
+    def __init__(self, index, factory):
+        self._factory = factory
+        self._packed = index["categories"]
+        self._summaries = index["summaries"]
+        self._order = [row[0] for row in self._summaries]
+        self._category_of = {row[0]: row[3] for row in self._summaries}
+        self._items = {}
+        self._loaded = set()
+        self._lock = threading.Lock()
+
+    def _materialize(self, category):
+        with self._lock:
+            if category in self._loaded:
+                return
+            for entry in json.loads(self._packed[category]):
+                try:
+                    item = self._factory(entry)
+                except Exception as e:
+                    logger.error(f"Skipping malformed catalog entry {entry.get('id')}: {e}")
+                    continue
+                if item is not None:
+                    self._items[entry["id"]] = item
+            self._loaded.add(category)
+
+    def __getitem__(self, item_id):
+        category = self._category_of.get(item_id, _MISSING)
+        if category is _MISSING:
+            raise KeyError(item_id)
+        if category not in self._loaded:
+            self._materialize(category)
+        return self._items[item_id]
+
+    def __iter__(self):
+        for item_id in self._order:
+            if item_id in self:
+                yield item_id
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, item_id):
+        category = self._category_of.get(item_id, _MISSING)
+        if category is _MISSING:
+            return False
+        if category in self._loaded:
+            return item_id in self._items
+        return True
+
+    def values(self):
+        for category in self.categories():
+            self._materialize(category)
+        return [self._items[i] for i in self._order if i in self._items]
+
+    def items(self):
+        return [(item.id, item) for item in self.values()]
+
+    def categories(self):
+        """Raw category names in file order."""
+        return list(dict.fromkeys(row[3] for row in self._summaries))
+
+    def category(self, name):
+        """All items in one raw category, materializing just that category."""
+        if name in self._packed:
+            self._materialize(name)
+        return [self._items[i] for i in self._order if self._category_of[i] == name and i in self._items]
+
+    def summaries(self):
+        """(id, name, description, category, safety_level) rows without building items."""
+        return list(self._summaries)
+
+
+_MISSING = object()
+
+
+def compile_to_disk(json_paths):
+    """Build step: write a ``.catalog`` next to each JSON catalog."""
+    from src.core.bloat_remover import prepare_bloat_entry
+    from src.core.system_tools_installer import prepare_tool_entry
+    preparers = {"system_tools.json": prepare_tool_entry, "bloatware_config.json": prepare_bloat_entry}
+    for json_path in json_paths:
+        index = compile_catalog(json_path, preparers.get(os.path.basename(json_path)))
+        _dump(index, json_path + ".catalog")
+        print(f"Compiled {json_path}: {len(index['summaries'])} entries, {len(index['categories'])} categories")
+
+
+if __name__ == "__main__":
+    compile_to_disk(sys.argv[1:])
@@ -2,13 +2,39 @@ import os
 import sys
 import logging
 import shutil
+import threading
+from contextlib import contextmanager
 from src.utils.helpers import run_command, is_admin
+from src.core.size_engine import DirSizeScan, LargestFiles, get_dir_size
 
 logger = logging.getLogger(__name__)
 
 class CleanupEngine:
-    def __init__(self):
+    def __init__(self, index=None):
         self.is_windows = sys.platform == "win32"
+        # Optional FileIndex; when set, large-file searches are answered from it.
+        self.index = index
+        # One event per running scan: cancel() stops those, and a scan started
+        # afterwards (or alongside) cannot clear another scan's cancellation.
+        self._scans = set()
+        self._scans_lock = threading.Lock()
+
+    def cancel(self):
+        """Stop every directory scan that is currently running."""
+        with self._scans_lock:
+            for event in self._scans:
+                event.set()
+
+    @contextmanager
+    def _scan(self):
+        event = threading.Event()
+        with self._scans_lock:
+            self._scans.add(event)
+        try:
+            yield event
+        finally:
+            with self._scans_lock:
+                self._scans.discard(event)
 
     def get_windows_update_cache_size(self):
         if not self.is_windows: return 0
@@ -81,19 +107,47 @@ class CleanupEngine:
             return f"Windows.old detected ({size / (1024**3):.2f} GB). Use Disk Cleanup to remove it safely."
         return None
 
-    def find_large_files(self, root_dir, min_size_mb=100):
-        large_files = []
-        for root, dirs, files in os.walk(root_dir):
-            for file in files:
-                path = os.path.join(root, file)
-                try:
-                    size = os.path.getsize(path)
-                    if size > min_size_mb * 1024 * 1024:
-                        large_files.append((path, size))
-                except:
-                    continue
+    def find_large_files(self, root_dir, min_size_mb=100, progress_callback=None):
+        threshold = min_size_mb * 1024 * 1024
+        with self._scan() as cancel_event:
+            if self.index is not None:
+                return self._largest_from_index(root_dir, threshold, None, cancel_event, progress_callback)
+
+            large_files = []
+
+            def on_file(path, st):
+                if st.st_size > threshold:
+                    large_files.append((path, st.st_size))
+
+            scan = DirSizeScan(root_dir, on_file=on_file, cancel_event=cancel_event)
+            scan.run(progress_callback)
         return sorted(large_files, key=lambda x: x[1], reverse=True)
 
+    def iter_large_files(self, root_dir, min_size_mb=100, limit=100, interval=0.5):
+        """Yield the current top ``limit`` large files while the scan runs.
+
+        Each item is a (path, size) list, largest first; the last one yielded
+        is the final result.  Only ``limit`` entries are held at any time.
+        With a FileIndex the index is refreshed (only changed directories are
+        listed) and its largest rows are yielded once.
+        """
+        threshold = min_size_mb * 1024 * 1024
+        with self._scan() as cancel_event:
+            if self.index is not None:
+                yield self._largest_from_index(root_dir, threshold, limit, cancel_event)
+                return
+            top = LargestFiles(limit, min_size=threshold)
+            scan = DirSizeScan(root_dir, on_file=top.add, cancel_event=cancel_event)
+            for _ in scan.iter_progress(interval):
+                yield top.results()
+
+    def _largest_from_index(self, root_dir, threshold, limit, cancel_event, progress_callback=None):
+        self.index.refresh(root_dir, progress_callback=progress_callback, cancel_event=cancel_event)
+        rows = self.index.largest(limit, root=root_dir, min_size=threshold)
+        # Indexed sizes can be stale for files rewritten in place; report what is on disk.
+        live = [(path, size) for path, size, _, _, _ in self.index.restat([r[0] for r in rows]) if size > threshold]
+        return sorted(live, key=lambda x: x[1], reverse=True)
+
     def clean_broken_shortcuts(self, root_dir):
         if not self.is_windows: return []
         broken = []
@@ -113,16 +167,9 @@ class CleanupEngine:
                         continue
         return broken
 
-    def _get_dir_size(self, path):
-        total = 0
-        try:
-            for root, dirs, files in os.walk(path):
-                for f in files:
-                    fp = os.path.join(root, f)
-                    total += os.path.getsize(fp)
-        except:
-            pass
-        return total
+    def _get_dir_size(self, path, progress_callback=None):
+        with self._scan() as cancel_event:
+            return get_dir_size(path, cancel_event=cancel_event, progress_callback=progress_callback)
 
     def _empty_dir(self, path):
         for filename in os.listdir(path):
@@ -2,7 +2,6 @@ import os
 import sys
 import platform
 import socket
-import requests
 import psutil
 import logging
 import shutil
@@ -84,7 +83,8 @@ class Diagnostics:
     def _check_update_server(self):
         try:
             from src.core.update_manager import REPO_URL
-            response = requests.head(REPO_URL, timeout=5)
+            from src.utils.http_client import get_client
+            response = get_client().head(REPO_URL, timeout=5, retries=0)
             if response.status_code < 400:
                 self._add_result("Update Server", "PASS", "Update server is reachable.")
             else:
@@ -0,0 +1,189 @@
+import math
+import time
+import random
+import struct
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOLVERS = {
+    "Google (8.8.8.8)": "8.8.8.8",
+    "Cloudflare (1.1.1.1)": "1.1.1.1",
+    "OpenDNS (208.67.222.222)": "208.67.222.222",
+    "Quad9 (9.9.9.9)": "9.9.9.9",
+}
+
+# Popular names a public resolver almost certainly has cached.
+CACHED_NAMES = [
+    "www.google.com", "www.youtube.com", "www.facebook.com", "www.amazon.com", "www.wikipedia.org",
+    "www.microsoft.com", "www.apple.com", "www.netflix.com", "www.reddit.com", "www.github.com",
+]
+# Random labels under these zones force a full recursive lookup on every query.
+UNCACHED_ZONES = ["google.com", "cloudflare.com", "wikipedia.org", "microsoft.com", "amazon.com"]
+
+DEFAULT_TIMEOUT = 2.0
+PER_RESOLVER_CONCURRENCY = 8
+
+
+def build_query(qid, name, qtype=1):
+    """A minimal recursive DNS query (A record by default)."""
+    header = struct.pack("!HHHHHH", qid, 0x0100, 1, 0, 0, 0)  # RD set, one question
+    qname = b"".join(bytes([len(label)]) + label.encode("ascii") for label in name.strip(".").split(".")) + b"\x00"
+    return header + qname + struct.pack("!HH", qtype, 1)
+
+
+def parse_response(data):
+    """Return (qid, rcode) for a DNS response, or None if it is not a response."""
+    if len(data) < 12:
+        return None
+    qid, flags = struct.unpack("!HH", data[:4])
+    if not flags & 0x8000:
+        return None
+    return qid, flags & 0x000F
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return -1
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, timeouts, timeout_ms):
+    """Latency stats where each timeout counts as ``timeout_ms`` in the percentiles.
+
+    Dropping timeouts would let a resolver that loses half its queries
+    report the p95 of the half that came back.  min and mean cover the
+    answered queries only; with no answers at all every figure is -1.
+    """
+    values = sorted(latencies)
+    censored = values + [timeout_ms] * timeouts if values else []
+    return {
+        "count": len(values) + timeouts,
+        "timeouts": timeouts,
+        "p50": percentile(censored, 50),
+        "p95": percentile(censored, 95),
+        "p99": percentile(censored, 99),
+        "min": values[0] if values else -1,
+        "mean": sum(values) / len(values) if values else -1,
+    }
+
+
+def split_server(server, default_port=53):
+    """(host, port) from "ip", "ip:port", an IPv6 address or "[ipv6]:port"."""
+    if server.startswith("["):
+        host, _, rest = server[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else default_port
+    if server.count(":") == 1:
+        host, _, port = server.partition(":")
+        return host, int(port or default_port)
+    return server, default_port
+
+
+class _ResolverProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.waiters = {}
+
+    def datagram_received(self, data, addr):
+        parsed = parse_response(data)
+        if parsed is None:
+            return
+        waiter = self.waiters.pop(parsed[0], None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result((time.perf_counter(), parsed[1]))
+
+    def error_received(self, exc):
+        # ICMP port unreachable and similar; let the pending queries time out.
+        logger.debug(f"DNS socket error: {exc}")
+
+
+class DnsBenchmark:
+    """Times raw UDP DNS queries against several resolvers at once.
+
+    Each resolver gets its own socket and answers two name sets: popular
+    names it should have cached, and random labels under real zones that
+    it cannot have cached.  Resolvers run concurrently, each with a small
+    window of queries in flight.  Resolvers are given as "ip", "ip:port"
+    or "[ipv6]:port", so a local stub server can stand in for a real one.
+    """
+
+    def __init__(self, resolvers=None, cached_names=None, uncached_count=10, rounds=1,
+                 timeout=DEFAULT_TIMEOUT, concurrency=PER_RESOLVER_CONCURRENCY):
+        self.resolvers = resolvers or DEFAULT_RESOLVERS
+        self.cached_names = cached_names if cached_names is not None else CACHED_NAMES
+        self.uncached_count = uncached_count
+        self.rounds = rounds
+        self.timeout = timeout
+        self.concurrency = concurrency
+
+    def run(self):
+        """Benchmark every resolver; results are sorted fastest first."""
+        return asyncio.run(self._run())
+
+    def _uncached_names(self):
+        names = []
+        for i in range(self.uncached_count):
+            label = "".join(random.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(12))
+            names.append(f"gt-{label}.{UNCACHED_ZONES[i % len(UNCACHED_ZONES)]}")
+        return names
+
+    async def _run(self):
+        results = await asyncio.gather(*(self._bench_resolver(name, server)
+                                         for name, server in self.resolvers.items()))
+        return sorted(results, key=lambda r: r["latency"] if r["latency"] > 0 else float("inf"))
+
+    async def _bench_resolver(self, name, server):
+        loop = asyncio.get_running_loop()
+        result = {"name": name, "server": server, "latency": -1}
+        timeout_ms = self.timeout * 1000
+        try:
+            transport, protocol = await loop.create_datagram_endpoint(
+                _ResolverProtocol, remote_addr=split_server(server))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Cannot reach resolver {server}: {e}")
+            result["error"] = str(e)
+            result["cached"] = summarize([], len(self.cached_names) * self.rounds, timeout_ms)
+            result["uncached"] = summarize([], self.uncached_count * self.rounds, timeout_ms)
+            return result
+
+        window = asyncio.Semaphore(self.concurrency)
+        used_ids = set()
+
+        async def query(qname):
+            async with window:
+                qid = random.randrange(0x10000)
+                while qid in used_ids:
+                    qid = random.randrange(0x10000)
+                used_ids.add(qid)
+                waiter = loop.create_future()
+                protocol.waiters[qid] = waiter
+                start = time.perf_counter()
+                transport.sendto(build_query(qid, qname))
+                try:
+                    answered_at, _ = await asyncio.wait_for(waiter, self.timeout)
+                    return (answered_at - start) * 1000
+                except asyncio.TimeoutError:
+                    return None
+                finally:
+                    protocol.waiters.pop(qid, None)
+                    used_ids.discard(qid)
+
+        try:
+            for label, names in (("cached", self.cached_names), ("uncached", None)):
+                latencies, timeouts = [], 0
+                for _ in range(self.rounds):
+                    batch = names if names is not None else self._uncached_names()
+                    for rtt in await asyncio.gather(*(query(n) for n in batch)):
+                        if rtt is None:
+                            timeouts += 1
+                        else:
+                            latencies.append(rtt)
+                result[label] = summarize(latencies, timeouts, timeout_ms)
+        finally:
+            transport.close()
+
+        # Headline number: median over cached names, which is what browsing feels like.
+        result["latency"] = result["cached"]["p50"] if result["cached"]["p50"] > 0 else result["uncached"]["p50"]
+        return result
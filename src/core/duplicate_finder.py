@@ -0,0 +1,195 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from src.core.size_engine import DirSizeScan
+
+logger = logging.getLogger(__name__)
+
+EDGE_BYTES = 4096          # bytes read from each end of a file for the partial hash
+CHUNK_BYTES = 1024 * 1024  # read size when hashing whole files
+
+
+def _new_hash():
+    return hashlib.blake2b(digest_size=20)
+
+
+def partial_hash(path, size):
+    """Hash the first and last EDGE_BYTES of a file.
+
+    Files no larger than two edges are read completely, so for them the
+    partial hash is also the full-content hash.
+    """
+    h = _new_hash()
+    with open(path, "rb") as f:
+        if size <= 2 * EDGE_BYTES:
+            h.update(f.read())
+        else:
+            h.update(f.read(EDGE_BYTES))
+            f.seek(-EDGE_BYTES, os.SEEK_END)
+            h.update(f.read(EDGE_BYTES))
+    return h.hexdigest()
+
+
+_buffers = threading.local()
+
+
+def full_hash(path, cancel_event=None):
+    """Hash a whole file in fixed-size chunks through a reusable per-thread buffer."""
+    buf = getattr(_buffers, "buf", None)
+    if buf is None:
+        buf = _buffers.buf = bytearray(CHUNK_BYTES)
+    view = memoryview(buf)
+    h = _new_hash()
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            n = f.readinto(buf)
+            if not n:
+                break
+            # hashlib releases the GIL for large updates, so threads hash in parallel.
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+class DuplicateFinder:
+    """Finds duplicate files in three tiers: size, partial hash, full hash.
+
+    Only files that share a size are read at all, only the first and last
+    few KB are hashed for those, and full-content hashes are computed just
+    for files that still collide.  Hashing runs on a thread pool.  When a
+    FileIndex is supplied, candidates come from the index and hashes are
+    cached in it keyed on size, mtime and inode, so repeat runs only read
+    files that changed.
+    """
+
+    def __init__(self, index=None, workers=None):
+        self.index = index
+        self.workers = workers or min(8, os.cpu_count() or 4)
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def find(self, roots, min_size=1, progress_callback=None):
+        """Return duplicate groups, biggest waste first.
+
+        Each group is {"size", "hash", "paths", "wasted"}; paths are ordered
+        oldest first so the first entry is the likely original.
+        progress_callback(stage, done, total) reports each hashing stage.
+        """
+        if isinstance(roots, (str, os.PathLike)):
+            roots = [roots]
+        self._cancel_event.clear()
+
+        candidates = self._collect(roots, min_size)
+        by_size = defaultdict(list)
+        seen_inodes = set()
+        for path, size, mtime, inode, device in candidates:
+            if inode:
+                # Hard links share storage; they are not wasted space.  Inode
+                # numbers are only unique within one device.
+                if (device, inode) in seen_inodes:
+                    continue
+                seen_inodes.add((device, inode))
+            by_size[size].append((path, size, mtime, inode))
+        files = [f for group in by_size.values() if len(group) > 1 for f in group]
+        info = {f[0]: f for f in files}
+
+        cached = self.index.cached_hashes(files) if self.index is not None else {}
+        partial = {p: c[0] for p, c in cached.items() if c[0]}
+        full = {p: c[1] for p, c in cached.items() if c[1]}
+        fresh = set()
+
+        # Tier 2: partial hashes for every size collision not already cached.
+        todo = [p for p in info if p not in partial]
+        for path, digest in self._hash_all(todo, lambda p: partial_hash(p, info[p][1]), "partial", progress_callback):
+            partial[path] = digest
+            fresh.add(path)
+
+        by_partial = defaultdict(list)
+        for path in info:
+            if partial.get(path):
+                by_partial[(info[path][1], partial[path])].append(path)
+
+        # Tier 3: full hashes only for files that still collide.
+        todo = []
+        for (size, digest), paths in by_partial.items():
+            if len(paths) < 2:
+                continue
+            for path in paths:
+                if size <= 2 * EDGE_BYTES:
+                    full[path] = digest
+                elif path not in full:
+                    todo.append(path)
+        todo.sort(key=lambda p: info[p][1], reverse=True)  # start the biggest reads first
+        hash_full = lambda p: full_hash(p, self._cancel_event)  # noqa: E731
+        for path, digest in self._hash_all(todo, hash_full, "full", progress_callback):
+            full[path] = digest
+            fresh.add(path)
+
+        if self.index is not None and fresh:
+            self.index.store_hashes([
+                (p, info[p][1], info[p][2], info[p][3], partial.get(p), full.get(p)) for p in fresh
+            ])
+
+        groups = defaultdict(list)
+        for paths in by_partial.values():
+            if len(paths) < 2:
+                continue
+            for path in paths:
+                if full.get(path):
+                    groups[(info[path][1], full[path])].append(path)
+
+        results = []
+        for (size, digest), paths in groups.items():
+            if len(paths) < 2:
+                continue
+            paths.sort(key=lambda p: info[p][2])
+            results.append({"size": size, "hash": digest, "paths": paths, "wasted": size * (len(paths) - 1)})
+        results.sort(key=lambda g: g["wasted"], reverse=True)
+        return results
+
+    def _collect(self, roots, min_size):
+        if self.index is not None:
+            files = []
+            for root in roots:
+                self.index.refresh(root, cancel_event=self._cancel_event)
+                files.extend(self.index.same_size_files(root, min_size=min_size))
+            # A file rewritten in place keeps its old indexed size and mtime until its
+            # directory changes, so check the disk before trusting cached hashes.
+            return [f for f in self.index.restat([f[0] for f in files]) if f[1] >= min_size]
+
+        files = []
+
+        def on_file(path, st):
+            if st.st_size >= min_size:
+                files.append((path, st.st_size, st.st_mtime, st.st_ino, st.st_dev))
+
+        DirSizeScan(roots, on_file=on_file, cancel_event=self._cancel_event).run()
+        return files
+
+    def _hash_all(self, paths, func, stage, progress_callback):
+        if not paths:
+            return
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(func, p): p for p in paths}
+            for future, path in futures.items():
+                if self._cancel_event.is_set():
+                    for f in futures:
+                        f.cancel()
+                    return
+                try:
+                    digest = future.result()
+                except OSError as e:
+                    logger.debug(f"Cannot hash {path}: {e}")
+                    digest = None
+                done += 1
+                if progress_callback and (done % 50 == 0 or done == len(paths)):
+                    progress_callback(stage, done, len(paths))
+                if digest:
+                    yield path, digest
@@ -2,7 +2,7 @@ import sys
 import logging
 import csv
 import io
-from src.utils.helpers import run_command
+from src.utils.powershell_host import run_powershell
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +18,7 @@ class EventViewer:
             # 1: Critical, 2: Error, 3: Warning, 4: Information
             filter_str = f"| Where-Object {{ $_.Level -eq {level} }}"
             
-        cmd = ["powershell", "-Command", f"Get-WinEvent -LogName {log_name} -MaxEvents {count} {filter_str} | Select-Object TimeCreated, LevelDisplayName, ProviderName, Message | ConvertTo-Json"]
-        proc = run_command(cmd)
+        proc = run_powershell(f"Get-WinEvent -LogName {log_name} -MaxEvents {count} {filter_str} | Select-Object TimeCreated, LevelDisplayName, ProviderName, Message | ConvertTo-Json")
         
         import json
         try:
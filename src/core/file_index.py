@@ -0,0 +1,292 @@
+import os
+import stat
+import time
+import sqlite3
+import logging
+import threading
+from src.utils.helpers import get_config_dir
+
+logger = logging.getLogger(__name__)
+
+
+def _subtree_bounds(path):
+    """Return (lo, hi) so that lo <= p < hi matches every path below ``path``.
+
+    Range comparisons use the primary-key index directly and, unlike LIKE,
+    need no escaping for paths containing '%' or '_'.
+    """
+    prefix = path.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+class FileIndex:
+    """On-disk index of file sizes used by the Cleanup page.
+
+    Every directory is stored with its mtime.  A directory's mtime only
+    changes when entries are added, removed or renamed inside it, so on a
+    rescan an unchanged directory costs a single stat(): its cached file
+    rows and subdirectory list are reused and only its children are
+    visited.  Directories whose mtime moved are listed again with
+    os.scandir and their rows replaced.
+
+    Files rewritten in place do not touch their directory's mtime, so their
+    size is refreshed the next time something else in that directory
+    changes.  Queries such as largest() and older_than() read straight from
+    the database without touching the disk.
+    """
+
+    def __init__(self, db_path=None):
+        if db_path is None:
+            db_path = os.path.join(get_config_dir(), "file_index.db")
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_db()
+
+    def _init_db(self):
+        with self._lock:
+            self.conn.executescript('''
+                CREATE TABLE IF NOT EXISTS dirs (
+                    path TEXT PRIMARY KEY,
+                    parent TEXT,
+                    mtime_ns INTEGER,
+                    scanned_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_dirs_parent ON dirs(parent);
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    dir TEXT,
+                    size INTEGER,
+                    mtime REAL,
+                    inode INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS idx_files_dir ON files(dir);
+                CREATE INDEX IF NOT EXISTS idx_files_size ON files(size);
+                CREATE INDEX IF NOT EXISTS idx_files_mtime ON files(mtime);
+                CREATE TABLE IF NOT EXISTS hashes (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER,
+                    mtime REAL,
+                    inode INTEGER,
+                    partial_hash TEXT,
+                    full_hash TEXT
+                );
+            ''')
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # ── refreshing ───────────────────────────────────────────────────────
+    def refresh(self, root, max_depth=None, progress_callback=None, cancel_event=None):
+        """Bring the index for ``root`` up to date and return scan statistics.
+
+        max_depth=0 indexes only the files directly inside ``root``;
+        None walks the whole tree.
+        """
+        root = os.path.abspath(root)
+        stats = {"dirs_scanned": 0, "dirs_reused": 0, "files_indexed": 0, "dirs_removed": 0}
+        started = time.perf_counter()
+
+        if not os.path.isdir(root):
+            with self._lock, self.conn:
+                stats["dirs_removed"] += self._forget_subtree(root)
+            return stats
+
+        stack = [(root, os.path.dirname(root), 0)]
+        with self._lock:
+            try:
+                while stack:
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+                    path, parent, depth = stack.pop()
+                    try:
+                        mtime_ns = os.stat(path).st_mtime_ns
+                    except OSError:
+                        stats["dirs_removed"] += self._forget_subtree(path)
+                        continue
+
+                    row = self.conn.execute(
+                        "SELECT mtime_ns FROM dirs WHERE path = ?", (path,)
+                    ).fetchone()
+                    if row and row[0] == mtime_ns:
+                        stats["dirs_reused"] += 1
+                        children = [r[0] for r in self.conn.execute(
+                            "SELECT path FROM dirs WHERE parent = ?", (path,))]
+                    else:
+                        children, count, removed = self._rescan_dir(path, parent, mtime_ns)
+                        stats["dirs_scanned"] += 1
+                        stats["files_indexed"] += count
+                        stats["dirs_removed"] += removed
+
+                    if max_depth is None or depth < max_depth:
+                        stack.extend((c, path, depth + 1) for c in children)
+
+                    if progress_callback and (stats["dirs_scanned"] + stats["dirs_reused"]) % 200 == 0:
+                        progress_callback(dict(stats))
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+        logger.debug(
+            f"Indexed {root}: {stats['dirs_scanned']} listed, {stats['dirs_reused']} reused "
+            f"({time.perf_counter() - started:.2f}s)"
+        )
+        return stats
+
+    def _rescan_dir(self, path, parent, mtime_ns):
+        files = []
+        children = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if getattr(entry, "is_junction", None) and entry.is_junction():
+                                continue
+                            children.append(entry.path)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                        if stat.S_ISREG(st.st_mode):
+                            files.append((entry.path, path, st.st_size, st.st_mtime, entry.inode()))
+                    except OSError:
+                        continue
+        except OSError as e:
+            # Keep whatever was indexed before; the next refresh retries.
+            logger.debug(f"Cannot list {path}: {e}")
+            return [r[0] for r in self.conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,))], 0, 0
+
+        # Drop subtrees of directories that disappeared since the last scan.
+        known = {r[0] for r in self.conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,))}
+        removed = sum(self._forget_subtree(gone) for gone in known.difference(children))
+
+        self.conn.execute("DELETE FROM files WHERE dir = ?", (path,))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO files (path, dir, size, mtime, inode) VALUES (?, ?, ?, ?, ?)", files
+        )
+        # New children get a NULL mtime so they are listed on this pass too.
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO dirs (path, parent, mtime_ns, scanned_at) VALUES (?, ?, NULL, NULL)",
+            [(c, path) for c in children],
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns, scanned_at) VALUES (?, ?, ?, ?)",
+            (path, parent, mtime_ns, time.time()),
+        )
+        return children, len(files), removed
+
+    def _forget_subtree(self, path):
+        lo, hi = _subtree_bounds(path)
+        cur = self.conn.execute(
+            "DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (path, lo, hi))
+        removed = cur.rowcount
+        self.conn.execute(
+            "DELETE FROM files WHERE dir = ? OR (dir >= ? AND dir < ?)", (path, lo, hi))
+        self.conn.execute("DELETE FROM hashes WHERE path >= ? AND path < ?", (lo, hi))
+        return removed
+
+    # ── queries ──────────────────────────────────────────────────────────
+    def _scope(self, root, recursive):
+        if root is None:
+            return "1", ()
+        root = os.path.abspath(root)
+        if not recursive:
+            return "dir = ?", (root,)
+        lo, hi = _subtree_bounds(root)
+        return "(dir = ? OR (dir >= ? AND dir < ?))", (root, lo, hi)
+
+    def largest(self, n=50, root=None, min_size=0, recursive=True):
+        """Return the ``n`` largest indexed files as (path, size) tuples (all if n is None)."""
+        where, args = self._scope(root, recursive)
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT path, size FROM files WHERE {where} AND size > ? "
+                "ORDER BY size DESC LIMIT ?", args + (min_size, -1 if n is None else n)
+            ).fetchall()
+
+    def older_than(self, days, root=None, recursive=True):
+        """Return (path, size, mtime) for indexed files not modified in ``days`` days."""
+        cutoff = time.time() - days * 86400
+        where, args = self._scope(root, recursive)
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT path, size, mtime FROM files WHERE {where} AND mtime < ? "
+                "ORDER BY mtime", args + (cutoff,)
+            ).fetchall()
+
+    def total_size(self, root=None, recursive=True):
+        where, args = self._scope(root, recursive)
+        with self._lock:
+            row = self.conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM files WHERE {where}", args).fetchone()
+        return row[0]
+
+    def same_size_files(self, root=None, min_size=1, recursive=True):
+        """Return (path, size, mtime, inode) for files sharing their size with another file."""
+        where, args = self._scope(root, recursive)
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT path, size, mtime, inode FROM files WHERE {where} AND size >= ? AND size IN ("
+                f"  SELECT size FROM files WHERE {where} AND size >= ? GROUP BY size HAVING COUNT(*) > 1"
+                ") ORDER BY size DESC", args + (min_size,) + args + (min_size,)
+            ).fetchall()
+
+    def restat(self, paths):
+        """Return live (path, size, mtime, inode, device) for ``paths``, updating the index as it goes.
+
+        Query results can be stale for files rewritten in place, so callers
+        that act on them (hashing, deleting) check the disk first.  Files
+        that are gone are dropped from the result and forgotten.
+        """
+        live, changed, gone = [], [], []
+        with self._lock:
+            for path in paths:
+                try:
+                    st = os.stat(path, follow_symlinks=False)
+                except OSError:
+                    gone.append(path)
+                    continue
+                if not stat.S_ISREG(st.st_mode):
+                    gone.append(path)
+                    continue
+                live.append((path, st.st_size, st.st_mtime, st.st_ino, st.st_dev))
+                indexed = self.conn.execute(
+                    "SELECT size, mtime, inode FROM files WHERE path = ?", (path,)
+                ).fetchone()
+                if indexed != (st.st_size, st.st_mtime, st.st_ino):
+                    changed.append((st.st_size, st.st_mtime, st.st_ino, path))
+            if changed:
+                with self.conn:
+                    self.conn.executemany("UPDATE files SET size = ?, mtime = ?, inode = ? WHERE path = ?", changed)
+        if gone:
+            self.forget(gone)
+        return live
+
+    def forget(self, paths):
+        """Remove deleted files from the index without waiting for a rescan."""
+        rows = [(p,) for p in paths]
+        with self._lock, self.conn:
+            self.conn.executemany("DELETE FROM files WHERE path = ?", rows)
+            self.conn.executemany("DELETE FROM hashes WHERE path = ?", rows)
+
+    # ── content hashes (duplicate finder) ────────────────────────────────
+    def cached_hashes(self, files):
+        """Map path -> (partial_hash, full_hash) for files whose size, mtime and inode still match."""
+        found = {}
+        with self._lock:
+            for path, size, mtime, inode in files:
+                row = self.conn.execute(
+                    "SELECT size, mtime, inode, partial_hash, full_hash FROM hashes WHERE path = ?", (path,)
+                ).fetchone()
+                if row and row[:3] == (size, mtime, inode):
+                    found[path] = (row[3], row[4])
+        return found
+
+    def store_hashes(self, rows):
+        """Store (path, size, mtime, inode, partial_hash, full_hash) rows."""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO hashes (path, size, mtime, inode, partial_hash, full_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
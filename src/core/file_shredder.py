@@ -1,25 +1,255 @@
 import os
+import sys
+import glob
+import json
+import time
 import secrets
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 4 * 1024 * 1024  # 4 MB per write keeps memory flat for any file size
+
+# Overwrite patterns: "random" draws fresh CSPRNG data for every chunk, the
+# others fill the reusable buffer once and write it repeatedly.
+PATTERNS = ("random", "random_block", "zeros", "ones")
+
+# Parallel writes help on SSDs but make a spinning disk seek back and forth
+# between files, so HDDs get a single writer.
+SSD_WORKERS = 4
+HDD_WORKERS = 1
+
+_rotational_cache = {}
+
+
 class FileShredder:
     @staticmethod
-    def shred(file_path, passes=3):
-        """Securely delete a file by overwriting it multiple times."""
+    def _fill(buf, pattern):
+        if pattern == "zeros":
+            buf[:] = bytes(len(buf))
+        elif pattern == "ones":
+            buf[:] = b"\xff" * len(buf)
+        else:
+            buf[:] = secrets.token_bytes(len(buf))
+
+    @staticmethod
+    def shred(file_path, passes=3, pattern="random", chunk_size=CHUNK_SIZE,
+              progress_callback=None, bytes_callback=None, cancel_event=None):
+        """Securely delete a file by overwriting it multiple times.
+
+        The file is overwritten in place, chunk by chunk, from a single
+        reusable buffer and fsync'd after every pass.  ``pattern`` is one of
+        PATTERNS, or a list with one pattern per pass.
+        progress_callback(percent, message) reports progress and MB/s;
+        bytes_callback(n) is called with the byte count of each write.
+        """
         if not os.path.isfile(file_path):
             return False, "File not found."
-        
+
+        pass_patterns = list(pattern) if isinstance(pattern, (list, tuple)) else [pattern] * passes
+        for p in pass_patterns:
+            if p not in PATTERNS:
+                return False, f"Unknown shred pattern: {p}"
+
         try:
             length = os.path.getsize(file_path)
-            with open(file_path, "ba+", buffering=0) as f:
-                for _ in range(passes):
+            total = length * len(pass_patterns)
+            written = 0
+            buf = bytearray(min(chunk_size, length) or 1)
+            view = memoryview(buf)
+            started = time.perf_counter()
+            last_report = 0.0
+
+            # r+b, not append mode: appending would write past the old data
+            # instead of over it.
+            with open(file_path, "r+b", buffering=0) as f:
+                for pass_no, pass_pattern in enumerate(pass_patterns, 1):
+                    if pass_pattern != "random":
+                        FileShredder._fill(buf, pass_pattern)
                     f.seek(0)
-                    f.write(secrets.token_bytes(length))
-            
+                    remaining = length
+                    while remaining > 0:
+                        if cancel_event is not None and cancel_event.is_set():
+                            return False, f"Shredding of {file_path} cancelled; file left partially overwritten."
+                        n = min(len(buf), remaining)
+                        if pass_pattern == "random":
+                            buf[:n] = secrets.token_bytes(n)
+                        # A raw (unbuffered) write may be short; finish the chunk before moving on.
+                        offset = 0
+                        while offset < n:
+                            count = f.write(view[offset:n])
+                            if not count:
+                                raise OSError(f"Write to {file_path} made no progress")
+                            offset += count
+                        remaining -= n
+                        written += n
+                        if bytes_callback:
+                            bytes_callback(n)
+                        now = time.perf_counter()
+                        if progress_callback and (now - last_report >= 0.25 or written == total):
+                            last_report = now
+                            rate = written / (1024 * 1024) / max(now - started, 1e-6)
+                            progress_callback(int(written * 100 / total),
+                                              f"Pass {pass_no}/{len(pass_patterns)} ({pass_pattern}) - {rate:.1f} MB/s")
+                    os.fsync(f.fileno())
+
             os.remove(file_path)
-            return True, f"File {file_path} shredded successfully."
+            elapsed = time.perf_counter() - started
+            rate = total / (1024 * 1024) / elapsed if elapsed > 0 else 0
+            return True, f"File {file_path} shredded successfully ({len(pass_patterns)} passes, {rate:.1f} MB/s)."
         except Exception as e:
             logger.error(f"Error shredding file {file_path}: {e}")
             return False, str(e)
+
+    # ── batch mode ───────────────────────────────────────────────────────
+    @staticmethod
+    def expand_targets(targets):
+        """Resolve files, directories and glob patterns into a sorted file list."""
+        files = set()
+        for target in targets:
+            if os.path.isfile(target):
+                files.add(os.path.abspath(target))
+            elif os.path.isdir(target):
+                for root, _, names in os.walk(target):
+                    for name in names:
+                        path = os.path.join(root, name)
+                        if os.path.isfile(path) and not os.path.islink(path):
+                            files.add(os.path.abspath(path))
+            else:
+                for match in glob.glob(target, recursive=True):
+                    if os.path.isfile(match) and not os.path.islink(match):
+                        files.add(os.path.abspath(match))
+        return sorted(files)
+
+    @staticmethod
+    def is_rotational(path):
+        """Best-effort check whether ``path`` lives on a spinning disk (cached per device)."""
+        try:
+            dev = os.stat(path).st_dev
+        except OSError:
+            return False
+        if dev in _rotational_cache:
+            return _rotational_cache[dev]
+
+        rotational = False
+        try:
+            if sys.platform.startswith("linux"):
+                sys_dev = f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}"
+                # Partitions have no queue/ of their own; their parent disk does.
+                for candidate in (os.path.join(sys_dev, "queue", "rotational"),
+                                  os.path.join(sys_dev, "..", "queue", "rotational")):
+                    if os.path.exists(candidate):
+                        with open(candidate) as f:
+                            rotational = f.read().strip() == "1"
+                        break
+            elif sys.platform == "win32":
+                from src.utils.powershell_host import run_powershell
+                drive = os.path.splitdrive(os.path.abspath(path))[0].rstrip(":")
+                if drive:
+                    proc = run_powershell(
+                        f"(Get-Partition -DriveLetter '{drive}' | Get-Disk | Get-PhysicalDisk).MediaType",
+                        timeout=15)
+                    rotational = "HDD" in proc.stdout
+        except Exception as e:
+            logger.debug(f"Could not determine disk type for {path}: {e}")
+
+        _rotational_cache[dev] = rotational
+        return rotational
+
+    @staticmethod
+    def shred_batch(targets, passes=3, pattern="random", workers=None, progress_callback=None,
+                    file_callback=None, cancel_event=None, remove_empty_dirs=True):
+        """Shred every file matched by ``targets`` through a bounded worker pool.
+
+        Directories are shredded recursively and glob patterns are expanded.
+        The pool size defaults to SSD_WORKERS or HDD_WORKERS depending on the
+        disk holding the first file.  progress_callback(percent, message)
+        reports aggregate progress and MB/s, file_callback(path, success,
+        message) fires as each file finishes.  Returns a manifest dict listing
+        every file and whether it was destroyed.
+        """
+        cancel_event = cancel_event or threading.Event()
+        files = FileShredder.expand_targets(targets)
+        sizes = {}
+        for path in files:
+            try:
+                sizes[path] = os.path.getsize(path)
+            except OSError:
+                sizes[path] = 0
+        if workers is None:
+            workers = HDD_WORKERS if files and FileShredder.is_rotational(files[0]) else SSD_WORKERS
+
+        passes_per_file = len(pattern) if isinstance(pattern, (list, tuple)) else passes
+        total = sum(sizes.values()) * passes_per_file
+        state = {"written": 0, "last": 0.0}
+        lock = threading.Lock()
+        started = time.perf_counter()
+
+        def on_bytes(n):
+            with lock:
+                state["written"] += n
+                now = time.perf_counter()
+                if not progress_callback or (now - state["last"] < 0.25 and state["written"] < total):
+                    return
+                state["last"] = now
+                written = state["written"]
+            rate = written / (1024 * 1024) / max(now - started, 1e-6)
+            percent = int(written * 100 / total) if total else 100
+            progress_callback(percent, f"{written / (1024 ** 2):.0f}/{total / (1024 ** 2):.0f} MB written - {rate:.1f} MB/s")
+
+        def shred_one(path):
+            if cancel_event.is_set():
+                return path, False, "Cancelled before shredding."
+            success, msg = FileShredder.shred(path, passes=passes, pattern=pattern,
+                                              bytes_callback=on_bytes, cancel_event=cancel_event)
+            return path, success, msg
+
+        entries = []
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for future in as_completed([pool.submit(shred_one, p) for p in files]):
+                path, success, msg = future.result()
+                entries.append({"path": path, "size": sizes[path], "shredded": success, "message": msg})
+                if file_callback:
+                    file_callback(path, success, msg)
+
+        if remove_empty_dirs and not cancel_event.is_set():
+            for target in targets:
+                if os.path.isdir(target):
+                    for root, _, _ in os.walk(target, topdown=False):
+                        try:
+                            os.rmdir(root)
+                        except OSError:
+                            pass
+
+        elapsed = time.perf_counter() - started
+        shredded = [e for e in entries if e["shredded"]]
+        destroyed = sum(e["size"] for e in shredded)
+        entries.sort(key=lambda e: e["path"])
+        return {
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - elapsed)),
+            "targets": list(targets),
+            "passes": passes_per_file,
+            "pattern": pattern,
+            "workers": workers,
+            "cancelled": cancel_event.is_set(),
+            "files_total": len(files),
+            "files_shredded": len(shredded),
+            "files_failed": len(entries) - len(shredded),
+            "bytes_destroyed": destroyed,
+            "elapsed_sec": round(elapsed, 2),
+            "mb_per_sec": round(state["written"] / (1024 * 1024) / elapsed, 1) if elapsed > 0 else 0,
+            "entries": entries,
+        }
+
+    @staticmethod
+    def save_manifest(manifest, path):
+        """Write a batch manifest as JSON; returns True on success."""
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save shred manifest: {e}")
+            return False
@@ -1,6 +1,7 @@
 import sys
 import logging
 from src.utils.helpers import run_command
+from src.utils.powershell_host import run_powershell
 
 logger = logging.getLogger(__name__)
 
@@ -9,11 +10,9 @@ class HardwareInfo:
     def get_disk_health():
         """Get SMART-like data for disks."""
         if sys.platform == "win32":
-            cmd = [
-                "powershell", "-NoProfile", "-Command",
+            proc = run_powershell(
                 "Get-PhysicalDisk | Select-Object FriendlyName, MediaType, OperationalStatus, HealthStatus, Usage, Size | Format-List"
-            ]
-            proc = run_command(cmd)
+            )
             result = proc.stdout.strip()
             return result if result else "No disk data returned. Administrator privileges may be required."
         elif sys.platform == "linux":
@@ -38,13 +37,11 @@ class HardwareInfo:
         """Get battery wear, cycle count, etc."""
         if sys.platform == "win32":
             # Get-CimInstance replaces the deprecated Get-WmiObject on modern Windows
-            cmd = [
-                "powershell", "-NoProfile", "-Command",
+            proc = run_powershell(
                 "Get-CimInstance -ClassName Win32_Battery | "
                 "Select-Object Name, DesignCapacity, FullChargeCapacity, EstimatedRunTime, BatteryStatus | "
                 "Format-List"
-            ]
-            proc = run_command(cmd)
+            )
             result = proc.stdout.strip()
             if not result:
                 return "No battery detected or battery data unavailable."
@@ -78,13 +75,11 @@ class HardwareInfo:
     def get_ram_whea_errors():
         """Check for WHEA (Hardware Error) events related to RAM (Windows only)."""
         if sys.platform == "win32":
-            cmd = [
-                "powershell", "-NoProfile", "-Command",
+            proc = run_powershell(
                 "Get-WinEvent -FilterHashtable @{LogName='System'; ProviderName='Microsoft-Windows-WHEA-Logger'} "
                 "-MaxEvents 20 -ErrorAction SilentlyContinue | "
                 "Select-Object TimeCreated, Id, LevelDisplayName, Message | Format-List"
-            ]
-            proc = run_command(cmd)
+            )
             result = proc.stdout.strip()
             if not result:
                 return "No WHEA hardware errors found."
@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import socket
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.helpers import get_config_dir
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_ENDPOINT = "https://ipapi.co/json/"
+DEFAULT_TTL = 600           # seconds before a lookup is refreshed even on an unchanged network
+PUBLIC_TIMEOUT = 5
+LOCAL_PROBE_ADDR = ("8.8.8.8", 80)  # connect() only picks a route; nothing is sent
+
+_EMPTY = {"local_ip": "N/A", "public_ip": "N/A", "isp": "N/A", "location": "N/A"}
+
+
+def network_signature():
+    """A cheap fingerprint of the interface state: which NICs are up, their speed and IPv4s.
+
+    When it changes (Wi-Fi switch, VPN up/down, cable pulled) cached
+    addresses are stale.  Without psutil it falls back to the routed
+    local address.
+    """
+    try:
+        import psutil
+        stats = psutil.net_if_stats()
+        addrs = psutil.net_if_addrs()
+        sig = []
+        for name in sorted(stats):
+            st = stats[name]
+            if not st.isup:
+                continue
+            ips = sorted(a.address for a in addrs.get(name, ()) if a.family == socket.AF_INET)
+            sig.append(f"{name}:{st.speed}:{','.join(ips)}")
+        return "|".join(sig)
+    except Exception:
+        return f"local:{_local_ip()}"
+
+
+def _local_ip(probe_addr=LOCAL_PROBE_ADDR):
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        s.connect(probe_addr)
+        return s.getsockname()[0]
+    finally:
+        s.close()
+
+
+class IpIntelService:
+    """Cached local/public IP details.
+
+    The local route and the public lookup run concurrently, the latter
+    over the shared pooled HTTP client.  Results are kept for ``ttl``
+    seconds and dropped as soon as the interface signature changes, and
+    the last result is persisted so the network page can show it
+    immediately on the next launch.  ``endpoint`` may point at a local
+    stub server.
+    """
+
+    def __init__(self, endpoint=PUBLIC_ENDPOINT, ttl=DEFAULT_TTL, cache_file=None, client=None,
+                 local_probe=LOCAL_PROBE_ADDR):
+        self.endpoint = endpoint
+        self.ttl = ttl
+        self.local_probe = local_probe
+        self.cache_file = cache_file or os.path.join(get_config_dir(), "ip_intel.json")
+        self._client = client
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ip-intel")
+        self._entry = self._load()  # {"checked_at", "signature", "details"}
+
+    # ── cache ────────────────────────────────────────────────────────────
+    def _load(self):
+        try:
+            with open(self.cache_file, "r") as f:
+                entry = json.load(f)
+            if {"checked_at", "signature", "details"} <= set(entry):
+                return entry
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _save(self, entry):
+        try:
+            with open(self.cache_file, "w") as f:
+                json.dump(entry, f)
+        except OSError as e:
+            logger.debug(f"Could not persist IP details: {e}")
+
+    def cached(self):
+        """The last known details (possibly stale), or None; never blocks on the network."""
+        entry = self._entry
+        return dict(entry["details"]) if entry else None
+
+    def is_fresh(self, signature=None):
+        entry = self._entry
+        if not entry or time.time() - entry["checked_at"] >= self.ttl:
+            return False
+        return entry["signature"] == (signature or network_signature())
+
+    def invalidate(self):
+        with self._lock:
+            self._entry = None
+
+    # ── lookups ──────────────────────────────────────────────────────────
+    @property
+    def client(self):
+        if self._client is None:
+            from src.utils.http_client import get_client
+            self._client = get_client()
+        return self._client
+
+    def _lookup_local(self):
+        try:
+            return _local_ip(self.local_probe)
+        except OSError as e:
+            logger.error(f"Error getting local IP: {e}")
+            return "N/A"
+
+    def _lookup_public(self):
+        try:
+            response = self.client.get(self.endpoint, timeout=PUBLIC_TIMEOUT)
+            if response.status_code == 200:
+                data = response.json()
+                return {
+                    "public_ip": data.get("ip", "N/A"),
+                    "isp": data.get("org", "N/A"),
+                    "location": f"{data.get('city', 'N/A')}, {data.get('region', 'N/A')}, {data.get('country_name', 'N/A')}",
+                }
+            logger.error(f"IP lookup returned HTTP {response.status_code}")
+        except Exception as e:
+            logger.error(f"Error getting public IP info: {e}")
+        return {}
+
+    def get(self, force=False):
+        """Return {"local_ip", "public_ip", "isp", "location"}, from cache when still valid."""
+        signature = network_signature()
+        if not force and self.is_fresh(signature):
+            return self.cached()
+        with self._lock:
+            # Another thread may have refreshed while we waited.
+            if not force and self.is_fresh(signature):
+                return self.cached()
+            public = self._pool.submit(self._lookup_public)
+            local = self._pool.submit(self._lookup_local)
+            details = dict(_EMPTY, local_ip=local.result())
+            details.update(public.result())
+            if details["public_ip"] == "N/A" and self._entry and self._entry["signature"] == signature:
+                # Offline right now; keep the last public answer for this network rather than blanking it.
+                for key in ("public_ip", "isp", "location"):
+                    details[key] = self._entry["details"].get(key, "N/A")
+                checked_at = self._entry["checked_at"]
+            else:
+                checked_at = time.time()
+            self._entry = {"checked_at": checked_at, "signature": signature, "details": details}
+            self._save(self._entry)
+            return dict(details)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = IpIntelService()
+        return _service
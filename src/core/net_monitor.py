@@ -0,0 +1,247 @@
+import math
+import time
+import asyncio
+import logging
+import threading
+from array import array
+
+from src.core.net_path import default_gateway
+from src.core.probe_engine import EchoSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGETS = ["1.1.1.1", "8.8.8.8"]
+DEFAULT_INTERVAL = 0.2      # seconds between probes to each target
+DEFAULT_CAPACITY = 3000     # samples kept per target (10 minutes at 5 Hz)
+SPIKE_MIN_MS = 20           # a spike must also exceed the baseline by this much
+
+_NAN = float("nan")
+
+
+class RingBuffer:
+    """Fixed-size (timestamp, rtt) history backed by two preallocated arrays.
+
+    Lost probes are stored as NaN.  Appending never allocates, and readers
+    copy into arrays they own, so a chart can redraw every tick without
+    creating new objects.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.times = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.head = 0       # next write position
+        self.count = 0
+        self.version = 0    # bumped on every append, so readers can skip unchanged buffers
+        self._lock = threading.Lock()
+
+    def append(self, timestamp, rtt):
+        with self._lock:
+            self.times[self.head] = timestamp
+            self.values[self.head] = _NAN if rtt is None else rtt
+            self.head = (self.head + 1) % self.capacity
+            if self.count < self.capacity:
+                self.count += 1
+            self.version += 1
+
+    def __len__(self):
+        return self.count
+
+    def copy_into(self, out_times, out_values, limit=None):
+        """Copy the newest ``limit`` samples, oldest first, into caller-owned arrays.
+
+        Returns the number of samples written.  The output arrays must hold
+        at least that many items.
+        """
+        with self._lock:
+            n = self.count if limit is None else min(limit, self.count)
+            start = (self.head - n) % self.capacity
+            first = min(n, self.capacity - start)
+            out_times[:first] = self.times[start:start + first]
+            out_values[:first] = self.values[start:start + first]
+            if first < n:
+                out_times[first:n] = self.times[:n - first]
+                out_values[first:n] = self.values[:n - first]
+            return n
+
+    def iter_recent(self, since):
+        """Yield (timestamp, rtt-or-NaN) for samples newer than ``since``, oldest first."""
+        with self._lock:
+            head, count = self.head, self.count
+        for i in range(count):
+            idx = (head - count + i) % self.capacity
+            t = self.times[idx]
+            if t >= since:
+                yield t, self.values[idx]
+
+
+def window_stats(samples):
+    """Rolling quality stats from (timestamp, rtt-or-NaN) samples.
+
+    jitter: mean absolute difference between consecutive replies.
+    loss_bursts: runs of two or more consecutive lost probes; max_burst: the longest run.
+    baseline: 5th percentile RTT (the unloaded path); bloat: p95 above it.
+    spikes: replies more than twice the median and SPIKE_MIN_MS over baseline.
+    """
+    rtts = []
+    lost = total = bursts = max_burst = run = 0
+    jitter_sum = 0.0
+    prev = None
+    for _, rtt in samples:
+        total += 1
+        if math.isnan(rtt):
+            lost += 1
+            run += 1
+            continue
+        if run:
+            bursts += 1 if run > 1 else 0
+            max_burst = max(max_burst, run)
+            run = 0
+        if prev is not None:
+            jitter_sum += abs(rtt - prev)
+        prev = rtt
+        rtts.append(rtt)
+    if run:
+        bursts += 1 if run > 1 else 0
+        max_burst = max(max_burst, run)
+
+    stats = {"samples": total, "loss": (100.0 * lost / total) if total else 0.0,
+             "loss_bursts": bursts, "max_burst": max_burst}
+    if not rtts:
+        stats.update({"avg": -1, "p50": -1, "p95": -1, "jitter": -1, "baseline": -1, "bloat": -1,
+                      "spikes": 0, "grade": "F" if total else "-"})
+        return stats
+
+    ordered = sorted(rtts)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
+    baseline, p50, p95 = pct(5), pct(50), pct(95)
+    bloat = p95 - baseline
+    spike_floor = max(2 * p50, baseline + SPIKE_MIN_MS)
+    stats.update({
+        "avg": sum(rtts) / len(rtts),
+        "p50": p50,
+        "p95": p95,
+        "jitter": jitter_sum / (len(rtts) - 1) if len(rtts) > 1 else 0.0,
+        "baseline": baseline,
+        "bloat": bloat,
+        "spikes": sum(1 for r in rtts if r > spike_floor),
+        "grade": _bloat_grade(bloat),
+    })
+    return stats
+
+
+def _bloat_grade(bloat_ms):
+    for limit, grade in ((5, "A+"), (30, "A"), (60, "B"), (200, "C"), (400, "D")):
+        if bloat_ms < limit:
+            return grade
+    return "F"
+
+
+class NetworkMonitor:
+    """Background prober that keeps a RingBuffer of RTTs per target.
+
+    The default gateway (read from the routing table) is probed alongside
+    the configured targets every ``interval`` seconds, on one asyncio loop
+    in a daemon thread.  Looking the gateway up can take seconds on
+    Windows, so it happens in that thread too: the gateway joins
+    ``targets`` (at the front) once it is known.  stats() and copy_into()
+    are safe to call from the GUI thread at any time.
+    """
+
+    def __init__(self, targets=None, include_gateway=True, interval=DEFAULT_INTERVAL,
+                 capacity=DEFAULT_CAPACITY, timeout=1.0):
+        self.interval = interval
+        self.capacity = capacity
+        self.include_gateway = include_gateway
+        self.gateway = None
+        self.targets = list(targets or DEFAULT_TARGETS)
+        self.buffers = {t: RingBuffer(capacity) for t in self.targets}
+        self._timeout = min(timeout, max(interval * 4, 0.2))
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    async def _run(self):
+        loops = [self._probe_loop(t) for t in self.targets]
+        if self.include_gateway:
+            loops.append(self._gateway_loop())
+        await asyncio.gather(*loops)
+
+    async def _gateway_loop(self):
+        try:
+            gateway = (await asyncio.get_running_loop().run_in_executor(None, default_gateway))[0]
+        except Exception as e:
+            logger.debug(f"Monitor gateway lookup failed: {e}")
+            return
+        if not gateway or self._stop.is_set():
+            return
+        self.gateway = gateway
+        if gateway in self.buffers:
+            return  # already probed as a configured target
+        self.buffers[gateway] = RingBuffer(self.capacity)
+        self.targets = [gateway] + self.targets
+        await self._probe_loop(gateway)
+
+    async def _probe_loop(self, target):
+        buf = self.buffers[target]
+        # Resolve once and keep the socket open; a tick is then just one echo.
+        session = EchoSession(target, timeout=self._timeout)
+        while not self._stop.is_set():
+            try:
+                await session.open()
+                break
+            except (OSError, UnicodeError) as e:
+                logger.debug(f"Monitor cannot resolve {target}: {e}")
+                buf.append(time.time(), None)
+                await asyncio.sleep(max(self.interval, 5.0))
+        # TCP fallback connects are rate-limited by the session.
+        interval = max(self.interval, session.min_interval)
+        next_at = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                sent = time.time()
+                try:
+                    rtt = await session.ping()
+                except Exception as e:
+                    logger.debug(f"Monitor probe of {target} failed: {e}")
+                    rtt = None
+                buf.append(sent, rtt)
+                # Keep a fixed cadence; after an overrun the next probe goes out at once.
+                next_at += interval
+                delay = next_at - time.monotonic()
+                if delay < 0:
+                    next_at = time.monotonic()
+                    delay = 0
+                await asyncio.sleep(delay)
+        finally:
+            session.close()
+
+    def stats(self, target, window=30.0):
+        """Quality stats for ``target`` over the last ``window`` seconds."""
+        buf = self.buffers.get(target)
+        if buf is None:
+            return window_stats(())
+        return window_stats(buf.iter_recent(time.time() - window))
+
+    def summary(self, window=30.0):
+        return {t: self.stats(t, window) for t in self.targets}
+
+    def copy_into(self, target, out_times, out_values, limit=None):
+        """Fill caller-owned arrays with ``target``'s newest samples; returns the count."""
+        return self.buffers[target].copy_into(out_times, out_values, limit)
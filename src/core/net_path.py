@@ -0,0 +1,360 @@
+import re
+import sys
+import socket
+import struct
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _linux_default_gateway(route_file="/proc/net/route"):
+    """Gateway of the lowest-metric default route in the kernel routing table."""
+    best = None
+    with open(route_file) as f:
+        next(f, None)  # header
+        for line in f:
+            fields = line.split()
+            if len(fields) < 8:
+                continue
+            iface, dest, gateway, flags, metric = fields[0], fields[1], fields[2], int(fields[3], 16), int(fields[6])
+            # RTF_UP (0x1) and RTF_GATEWAY (0x2) on the 0.0.0.0 destination
+            if dest != "00000000" or flags & 0x3 != 0x3:
+                continue
+            if best is None or metric < best[0]:
+                ip = socket.inet_ntoa(struct.pack("<L", int(gateway, 16)))
+                best = (metric, ip, iface)
+    return (best[1], best[2]) if best else (None, None)
+
+
+def _windows_default_gateway():
+    from src.utils.powershell_host import run_powershell
+    proc = run_powershell(
+        "Get-NetRoute -DestinationPrefix '0.0.0.0/0' | Sort-Object RouteMetric | "
+        "Select-Object -First 1 | ForEach-Object { \"$($_.NextHop) $($_.InterfaceAlias)\" }",
+        timeout=15)
+    parts = proc.stdout.strip().split(" ", 1)
+    if proc.returncode == 0 and parts and parts[0] and parts[0] != "0.0.0.0":
+        return parts[0], parts[1] if len(parts) > 1 else None
+    return None, None
+
+
+def _bsd_default_gateway():
+    from src.utils.helpers import run_command
+    out = run_command(["route", "-n", "get", "default"], timeout=5).stdout
+    gateway = re.search(r"gateway:\s*(\S+)", out)
+    iface = re.search(r"interface:\s*(\S+)", out)
+    return (gateway.group(1) if gateway else None, iface.group(1) if iface else None)
+
+
+GATEWAY_CACHE_TTL = 30      # seconds a default-route lookup is reused
+
+_gateway_cache = None       # (timestamp, (gateway_ip, interface))
+
+
+def default_gateway(use_cache=True):
+    """Return (gateway_ip, interface) for the IPv4 default route, or (None, None).
+
+    The lookup costs a PowerShell call on Windows, so the answer is reused
+    for GATEWAY_CACHE_TTL seconds.
+    """
+    import time
+
+    global _gateway_cache
+    cached = _gateway_cache
+    if use_cache and cached and time.time() - cached[0] < GATEWAY_CACHE_TTL:
+        return cached[1]
+    try:
+        if sys.platform.startswith("linux"):
+            result = _linux_default_gateway()
+        elif sys.platform == "win32":
+            result = _windows_default_gateway()
+        else:
+            result = _bsd_default_gateway()
+    except Exception as e:
+        logger.debug(f"Could not read the default route: {e}")
+        result = (None, None)
+    _gateway_cache = (time.time(), result)
+    return result
+
+
+# ── hop mapping ──────────────────────────────────────────────────────────
+TRACE_BASE_PORT = 33434
+TRACE_MAX_HOPS = 20
+TRACE_PROBES = 3            # probes per hop
+TRACE_TIMEOUT = 1.5         # seconds to wait for every hop's answers
+TRACE_ROUND_GAP = 0.25      # seconds between probe rounds, so routers see one probe at a time
+PATH_CACHE_TTL = 300        # seconds a mapped path is reused
+
+_IP_RECVERR = getattr(socket, "IP_RECVERR", 11)
+_MSG_ERRQUEUE = getattr(socket, "MSG_ERRQUEUE", 0x2000)
+_SO_EE_ORIGIN_ICMP = 2
+_ICMP_TIME_EXCEEDED = 11
+_ICMP_DEST_UNREACH = 3
+
+_path_cache = {}
+
+
+def _linux_trace(dest_ip, max_hops, probes, timeout, gap=TRACE_ROUND_GAP):
+    """Probe every TTL in rounds and collect the ICMP errors via IP_RECVERR.
+
+    Unprivileged UDP sockets with IP_RECVERR receive the Time Exceeded and
+    Port Unreachable messages on their error queue (the way tracepath
+    works), so no raw socket is needed.  Each round sends one probe per TTL
+    and rounds are ``gap`` seconds apart: routers rate-limit the ICMP errors
+    they generate, and a burst of all probes at once shows up as loss.
+    Returns {ttl: (address, [rtt or None])}.
+    """
+    import select
+    import time
+
+    poller = select.poll()
+    probes_by_fd = {}
+    socks = []
+    pending = 0
+
+    def collect(until):
+        nonlocal pending
+        while pending:
+            remaining = until - time.perf_counter()
+            if remaining <= 0:
+                return
+            for fd, _ in poller.poll(remaining * 1000):
+                entry = probes_by_fd[fd]
+                try:
+                    _, ancdata, _, _ = entry[0].recvmsg(512, 512, _MSG_ERRQUEUE)
+                except (BlockingIOError, InterruptedError):
+                    continue
+                except OSError:
+                    poller.unregister(fd)
+                    pending -= 1
+                    continue
+                now = time.perf_counter()
+                for level, ctype, data in ancdata:
+                    if level != socket.IPPROTO_IP or ctype != _IP_RECVERR or len(data) < 24:
+                        continue
+                    _, origin, icmp_type, _ = struct.unpack("=IBBB", data[:7])
+                    if origin != _SO_EE_ORIGIN_ICMP:
+                        continue
+                    entry[3] = socket.inet_ntoa(data[20:24])  # offender sockaddr_in.sin_addr
+                    entry[4] = (now - entry[2]) * 1000
+                    if icmp_type not in (_ICMP_TIME_EXCEEDED, _ICMP_DEST_UNREACH):
+                        entry[4] = None
+                poller.unregister(fd)
+                pending -= 1
+
+    try:
+        for n in range(probes):
+            if n:
+                round_end = time.perf_counter() + gap
+                collect(round_end)
+                time.sleep(max(0.0, round_end - time.perf_counter()))  # even when every hop has answered
+            for ttl in range(1, max_hops + 1):
+                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                socks.append(s)
+                s.setblocking(False)
+                s.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+                s.setsockopt(socket.IPPROTO_IP, _IP_RECVERR, 1)
+                s.connect((dest_ip, TRACE_BASE_PORT + ttl * probes + n))
+                probes_by_fd[s.fileno()] = [s, ttl, time.perf_counter(), None, None]
+                try:
+                    s.send(b"GHOSTY-TRACE")
+                except OSError:
+                    pass
+                poller.register(s.fileno(), select.POLLERR)
+                pending += 1
+        collect(time.perf_counter() + timeout)
+    finally:
+        for s in socks:
+            s.close()
+
+    hops = {}
+    for _, ttl, _, address, rtt in probes_by_fd.values():
+        addr, rtts = hops.setdefault(ttl, [None, []])
+        rtts.append(rtt)
+        if address and not addr:
+            hops[ttl][0] = address
+    return {ttl: (addr, rtts) for ttl, (addr, rtts) in hops.items()}
+
+
+def _windows_trace(dest_ip, max_hops, probes, timeout):
+    """Send every TTL's echo requests at once through the ICMP helper API.
+
+    IcmpSendEcho takes a TTL and reports the router that answered Time
+    Exceeded, without admin rights or raw sockets.  Each call blocks
+    (outside the GIL) until its reply or the timeout, so the probes run on
+    one thread each.  Returns {ttl: (address, [rtt or None])}.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from src.utils import win_icmp
+
+    if not win_icmp.available():
+        raise OSError("ICMP helper API is not available")
+    answered = (win_icmp.IP_SUCCESS, win_icmp.IP_TTL_EXPIRED_TRANSIT)
+
+    def probe(ttl):
+        status, address, rtt = win_icmp.echo(dest_ip, ttl=ttl, timeout=timeout, payload=b"GHOSTY-TRACE")
+        if status is None or not (status in answered or status in win_icmp.IP_DEST_UNREACHABLE):
+            return ttl, None, None
+        return ttl, address, rtt
+
+    ttls = [ttl for ttl in range(1, max_hops + 1) for _ in range(probes)]
+    with ThreadPoolExecutor(max_workers=len(ttls)) as pool:
+        results = list(pool.map(probe, ttls))
+
+    hops = {}
+    for ttl, address, rtt in results:
+        addr, rtts = hops.setdefault(ttl, [None, []])
+        rtts.append(rtt)
+        if address and not addr:
+            hops[ttl][0] = address
+    return {ttl: (addr, rtts) for ttl, (addr, rtts) in hops.items()}
+
+
+_TRACE_LINE = re.compile(r"^\s*(\d+)\s+(.*)$")
+_TRACE_MS = re.compile(r"(<?\d+(?:\.\d+)?)\s*ms")
+_TRACE_IP = re.compile(r"(\d{1,3}(?:\.\d{1,3}){3})")
+
+
+def _command_trace(dest_ip, max_hops, probes, timeout):
+    """Fallback when no native trace is available: parse tracert/traceroute output (one hop at a time)."""
+    from src.utils.helpers import run_command
+    wait_ms = max(200, int(timeout * 1000 / 2))
+    if sys.platform == "win32":
+        cmd = ["tracert", "-d", "-h", str(max_hops), "-w", str(wait_ms), dest_ip]
+    else:
+        cmd = ["traceroute", "-n", "-q", str(probes), "-w", str(max(1, wait_ms // 1000)), "-m", str(max_hops), dest_ip]
+    out = run_command(cmd, timeout=max_hops * probes * timeout + 10).stdout
+    hops = {}
+    for line in out.splitlines():
+        m = _TRACE_LINE.match(line)
+        if not m:
+            continue
+        ttl, rest = int(m.group(1)), m.group(2)
+        ip = _TRACE_IP.search(rest)
+        rtts = [float(t.lstrip("<")) for t in _TRACE_MS.findall(rest)]
+        rtts += [None] * rest.count("*")
+        hops[ttl] = (ip.group(1) if ip else None, rtts[:probes] or [None] * probes)
+    return hops
+
+
+def _supports_recverr():
+    return sys.platform.startswith("linux") and hasattr(socket.socket, "recvmsg")
+
+
+def map_path(target, max_hops=TRACE_MAX_HOPS, probes=TRACE_PROBES, timeout=TRACE_TIMEOUT, use_cache=True):
+    """Map the hops to ``target``; returns a list of hop dicts in TTL order.
+
+    Each hop is {"ttl", "address", "rtts", "loss", "avg", "min"}; the list
+    stops at the destination.  Paths are cached for PATH_CACHE_TTL seconds
+    per (gateway, target).
+    """
+    import time
+
+    gateway = default_gateway(use_cache=use_cache)[0]
+    key = (gateway, target)
+    cached = _path_cache.get(key)
+    if use_cache and cached and time.time() - cached[0] < PATH_CACHE_TTL:
+        return cached[1]
+
+    dest_ip = socket.gethostbyname(target)
+    raw = {}
+    if _supports_recverr():
+        try:
+            raw = _linux_trace(dest_ip, max_hops, probes, timeout)
+        except OSError as e:
+            logger.debug(f"Native trace failed, falling back to traceroute: {e}")
+    elif sys.platform == "win32":
+        try:
+            raw = _windows_trace(dest_ip, max_hops, probes, timeout)
+        except (OSError, AttributeError) as e:
+            logger.debug(f"ICMP helper trace failed, falling back to tracert: {e}")
+    if not raw:
+        try:
+            raw = _command_trace(dest_ip, max_hops, probes, timeout)
+        except Exception as e:
+            logger.debug(f"traceroute fallback failed: {e}")
+
+    hops = []
+    for ttl in sorted(raw):
+        address, rtts = raw[ttl]
+        got = [r for r in rtts if r is not None]
+        hops.append({
+            "ttl": ttl,
+            "address": address,
+            "rtts": rtts,
+            "loss": 100.0 * (len(rtts) - len(got)) / len(rtts) if rtts else 100.0,
+            "avg": sum(got) / len(got) if got else -1,
+            "min": min(got) if got else -1,
+        })
+        if address == dest_ip:
+            break
+    # Drop the silent tail past the last hop that answered.
+    while hops and hops[-1]["address"] is None:
+        hops.pop()
+    _path_cache[key] = (time.time(), hops)
+    return hops
+
+
+def _is_lan(address):
+    import ipaddress
+    ip = ipaddress.ip_address(address)
+    return ip.is_private and ip not in ipaddress.ip_network("100.64.0.0/10")
+
+
+def attribute_path(hops, gateway=None):
+    """Split hops into LAN, ISP edge and remote segments and attribute latency and loss.
+
+    LAN is the gateway plus any private hops before the first public (or
+    CGNAT) address; the ISP edge is the next two responding hops; the rest
+    is remote.  Loss counts only if it persists to every later hop, since
+    routers often rate-limit their own ICMP replies.  Each segment gets
+    the latency it adds over the previous segment.
+    """
+    responding = [h for h in hops if h["address"]]
+    segments = {"lan": [], "isp": [], "remote": []}
+    stage = "lan"
+    isp_count = 0
+    for hop in responding:
+        if stage == "lan" and not (hop["address"] == gateway or _is_lan(hop["address"])):
+            stage = "isp"
+        if stage == "isp":
+            if isp_count == 2:
+                stage = "remote"
+            else:
+                isp_count += 1
+        segments[stage].append(hop)
+
+    # Loss carried forward: the minimum loss from this hop to the end of the path.
+    carried = {}
+    floor = 100.0
+    for hop in reversed(responding):
+        floor = min(floor, hop["loss"])
+        carried[hop["ttl"]] = floor
+
+    result = {}
+    prev_latency, prev_loss = 0.0, 0.0
+    for name in ("lan", "isp", "remote"):
+        seg = segments[name]
+        answered = [h for h in seg if h["min"] >= 0]
+        if not seg:
+            result[name] = {"hops": [], "latency": 0.0, "loss": 0.0}
+            continue
+        last = seg[-1]
+        latency = (answered[-1]["min"] if answered else prev_latency)
+        loss = carried.get(last["ttl"], 0.0)
+        result[name] = {
+            "hops": [h["address"] for h in seg],
+            "latency": max(0.0, latency - prev_latency),
+            "loss": max(0.0, loss - prev_loss),
+        }
+        prev_latency, prev_loss = max(prev_latency, latency), max(prev_loss, loss)
+    return result
+
+
+def format_path(hops):
+    """Render mapped hops as traceroute-style text."""
+    lines = []
+    for hop in hops:
+        rtts = "  ".join("*" if r is None else f"{r:.1f} ms" for r in hop["rtts"])
+        lines.append(f"{hop['ttl']:>2}  {hop['address'] or '*':<15}  {rtts}")
+    return "\n".join(lines)
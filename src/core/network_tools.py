@@ -1,9 +1,8 @@
-import socket
-import requests
-import time
 import logging
 import subprocess
-import sys
+from src.core.probe_engine import ping_many
+from src.core.port_scanner import PortScanner
+from src.core.dns_bench import DnsBenchmark, DEFAULT_RESOLVERS
 
 logger = logging.getLogger(__name__)
 
@@ -17,91 +16,94 @@ class NetworkTools:
     }
 
     @staticmethod
-    def ping_multi(targets=None):
-        """Ping multiple targets and return latency, jitter, and loss."""
+    def ping_multi(targets=None, count=4):
+        """Ping multiple targets at once and return latency, jitter, and loss.
+
+        Each result also carries the per-probe "rtts" (ms, None = lost) and
+        the probe "method" used.
+        """
         if targets is None:
             targets = ["8.8.8.8", "1.1.1.1", "google.com"]
-        
-        results = {}
-        for target in targets:
-            results[target] = NetworkTools.ping_stats(target)
-        return results
+        return ping_many(targets, count=count)
 
     @staticmethod
     def ping_stats(target, count=4):
         """Calculate latency, jitter, and packet loss for a target."""
-        from src.utils.helpers import run_command
-        import re
-        
-        latencies = []
-        loss = 0
-        
-        if sys.platform == "win32":
-            cmd = ["ping", "-n", str(count), target]
-        else:
-            cmd = ["ping", "-c", str(count), target]
-            
-        proc = run_command(cmd)
-        
-        if sys.platform == "win32":
-            # Extract latencies and loss from Windows ping output
-            # Example: Reply from 8.8.8.8: bytes=32 time=10ms TTL=117
-            times = re.findall(r"time[=<](\d+)ms", proc.stdout)
-            latencies = [float(t) for t in times]
-            
-            loss_match = re.search(r"\((\d+)% loss\)", proc.stdout)
-            if loss_match:
-                loss = int(loss_match.group(1))
-        else:
-            # Extract latencies and loss from Linux/macOS ping output
-            # Example: 64 bytes from 8.8.8.8: icmp_seq=1 ttl=117 time=10.2 ms
-            times = re.findall(r"time=(\d+\.?\d*) ms", proc.stdout)
-            latencies = [float(t) for t in times]
-            
-            loss_match = re.search(r"(\d+)% packet loss", proc.stdout)
-            if loss_match:
-                loss = int(loss_match.group(1))
-
-        if not latencies:
-            return {"avg": -1, "jitter": -1, "loss": 100}
-            
-        avg = sum(latencies) / len(latencies)
-        jitter = 0
-        if len(latencies) > 1:
-            jitter = sum(abs(latencies[i] - latencies[i-1]) for i in range(1, len(latencies))) / (len(latencies) - 1)
-            
-        return {"avg": avg, "jitter": jitter, "loss": loss}
+        return ping_many([target], count=count)[target]
 
     @staticmethod
-    def get_auto_verdict():
+    def diagnose_path(target="8.8.8.8"):
+        """Attribute latency and loss to the LAN, ISP edge and remote segments.
+
+        The hop map (cached by net_path) and a short probe of the real
+        default gateway and the target run side by side, so a fresh
+        diagnosis takes about as long as the slowest hop's reply.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from src.core.net_path import default_gateway, map_path, attribute_path
+
+        gateway = default_gateway()[0]
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            path_future = pool.submit(map_path, target)
+            stats = NetworkTools.ping_multi([t for t in (gateway, target) if t], count=4)
+            try:
+                hops = path_future.result()
+            except Exception as e:
+                logger.debug(f"Path mapping to {target} failed: {e}")
+                hops = []
+        return {
+            "gateway": gateway,
+            "target": target,
+            "gateway_stats": stats.get(gateway) if gateway else None,
+            "target_stats": stats[target],
+            "hops": hops,
+            "segments": attribute_path(hops, gateway),
+        }
+
+    @staticmethod
+    def get_auto_verdict(target="8.8.8.8"):
         """Determine where the network issue lies: local, ISP, or remote."""
-        # 1. Ping Gateway (local)
-        # 2. Ping ISP/Next Hop (ISP)
-        # 3. Ping global target (Remote)
-        # This is a simplified version.
-        
-        local = NetworkTools.ping_stats("192.168.1.1", count=2) # Common gateway
-        remote = NetworkTools.ping_stats("8.8.8.8", count=2)
-        
+        diag = NetworkTools.diagnose_path(target)
+        local, remote, segments = diag["gateway_stats"], diag["target_stats"], diag["segments"]
+
+        if diag["gateway"] is None:
+            return "LOCAL ISSUE (No default route)"
         if local["loss"] > 50:
-            return "LOCAL ISSUE (Gateway unreachable)"
+            return f"LOCAL ISSUE (Gateway {diag['gateway']} unreachable)"
+        if local["loss"] > 10 or local["avg"] > 20:
+            return f"LOCAL ISSUE (Gateway {local['avg']:.0f} ms, {local['loss']}% loss - check Wi-Fi/cabling)"
         if remote["loss"] > 50:
+            if segments["isp"]["hops"] and segments["isp"]["loss"] > 50:
+                return "ISP ISSUE (Gateway OK, traffic dies at the ISP edge)"
             return "ISP / GLOBAL ISSUE (Gateway OK, Remote unreachable)"
+
+        # Blame the segment that adds the most latency or persistent loss.
+        worst = max(("lan", "isp", "remote"),
+                    key=lambda name: segments[name]["loss"] * 10 + segments[name]["latency"])
+        seg = segments[worst]
+        label = {"lan": "LOCAL", "isp": "ISP", "remote": "REMOTE"}[worst]
+        # A single dropped trace probe is noise; only trust loss the target itself shows.
+        if seg["loss"] > 34 and remote["loss"] >= 10:
+            return f"{label} ISSUE ({seg['loss']:.0f}% loss from the {worst.upper()} segment on)"
         if remote["avg"] > 150:
-            return "HIGH LATENCY (ISP / Remote)"
-            
+            return f"HIGH LATENCY ({label}: +{seg['latency']:.0f} ms of {remote['avg']:.0f} ms)"
+
         return "HEALTHY"
 
     @staticmethod
     def run_traceroute(target):
-        """Run traceroute to a target."""
-        from src.utils.helpers import run_command
-        if sys.platform == "win32":
-            cmd = ["tracert", "-d", target]
-        else:
-            cmd = ["traceroute", "-n", target]
-        
-        return run_command(cmd).stdout
+        """Map the path to a target and return a traceroute-style hop list with segment totals."""
+        from src.core.net_path import default_gateway, map_path, attribute_path, format_path
+        try:
+            hops = map_path(target, use_cache=False)
+        except OSError as e:
+            return f"Traceroute failed: {e}"
+        if not hops:
+            return "Traceroute returned no hops."
+        segments = attribute_path(hops, default_gateway()[0])
+        summary = "  ".join(f"{name.upper()} +{seg['latency']:.1f} ms / {seg['loss']:.0f}% loss"
+                            for name, seg in segments.items() if seg["hops"])
+        return f"{format_path(hops)}\n{summary}"
 
     @staticmethod
     def speedtest_ookla():
@@ -118,92 +120,44 @@ class NetworkTools:
         return None
 
     @staticmethod
-    def get_ip_intelligence():
-        """Get local and public IP details."""
-        details = {
-            "local_ip": "N/A",
-            "public_ip": "N/A",
-            "isp": "N/A",
-            "location": "N/A"
-        }
-        try:
-            # Local IP
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            details["local_ip"] = s.getsockname()[0]
-            s.close()
-        except Exception as e:
-            logger.error(f"Error getting local IP: {e}")
+    def get_ip_intelligence(force=False):
+        """Get local and public IP details (cached until the TTL expires or the network changes)."""
+        from src.core.ip_intel import get_service
+        return get_service().get(force=force)
 
-        try:
-            # Public IP and ISP info
-            response = requests.get("https://ipapi.co/json/", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                details["public_ip"] = data.get("ip", "N/A")
-                details["isp"] = data.get("org", "N/A")
-                details["location"] = f"{data.get('city', 'N/A')}, {data.get('region', 'N/A')}, {data.get('country_name', 'N/A')}"
-        except Exception as e:
-            logger.error(f"Error getting public IP info: {e}")
-            
-        return details
+    @staticmethod
+    def cached_ip_intelligence():
+        """Last known IP details without touching the network, or None if there are none yet.
+
+        The second value is False when the details are stale and should be refreshed.
+        """
+        from src.core.ip_intel import get_service
+        service = get_service()
+        details = service.cached()
+        return details, details is not None and service.is_fresh()
 
     @staticmethod
-    def benchmark_dns():
-        """Compare response times of popular DNS servers."""
-        dns_servers = {
-            "Google (8.8.8.8)": "8.8.8.8",
-            "Cloudflare (1.1.1.1)": "1.1.1.1",
-            "OpenDNS (208.67.222.222)": "208.67.222.222",
-            "Quad9 (9.9.9.9)": "9.9.9.9"
-        }
-        results = []
-        host = "www.google.com"
+    def benchmark_dns(resolvers=None, uncached_count=10, timeout=2.0):
+        """Compare response times of popular DNS servers.
 
-        for name, ip in dns_servers.items():
-            try:
-                # Use platform-specific ping or socket-based check? 
-                # Better to use socket to measure actual DNS resolution time if possible,
-                # but simple ping is a good proxy for latency.
-                # Actually, measuring resolution time is better.
-                start = time.time()
-                # We can't easily force a specific DNS server with socket.gethostbyname
-                # without using a 3rd party lib like dnspython. 
-                # Let's use subprocess to call 'nslookup' or 'dig'?
-                
-                from src.utils.helpers import run_command
-                cmd = []
-                if sys.platform == "win32":
-                    cmd = ["nslookup", host, ip]
-                else:
-                    cmd = ["nslookup", host, ip] # nslookup is common on Linux/macOS too
-
-                proc = run_command(cmd, timeout=2)
-                end = time.time()
-                
-                if proc.returncode == 0:
-                    latency = (end - start) * 1000
-                    results.append({"name": name, "latency": latency})
-                else:
-                    results.append({"name": name, "latency": -1}) # Failed
-            except Exception:
-                results.append({"name": name, "latency": -1})
-
-        return sorted(results, key=lambda x: x["latency"] if x["latency"] > 0 else float('inf'))
+        Queries are sent straight over UDP, so the numbers are resolver
+        latency rather than nslookup start-up time.  Each entry has the
+        headline "latency" (median cached lookup, -1 if none answered) plus
+        "cached"/"uncached" dicts with p50/p95/p99 and timeout counts.
+        """
+        try:
+            return DnsBenchmark(resolvers, uncached_count=uncached_count, timeout=timeout).run()
+        except Exception as e:
+            logger.error(f"DNS benchmark failed: {e}")
+            return [{"name": name, "latency": -1} for name in (resolvers or DEFAULT_RESOLVERS)]
 
     @staticmethod
-    def port_scan(target="127.0.0.1", ports=None):
-        """Simple port scanner for the local machine."""
-        if ports is None:
-            ports = [21, 22, 23, 25, 53, 80, 110, 135, 139, 143, 443, 445, 993, 995, 1723, 3306, 3389, 5900, 8080]
-        
-        open_ports = []
-        for port in ports:
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.settimeout(0.1)
-                    if s.connect_ex((target, port)) == 0:
-                        open_ports.append(port)
-            except Exception:
-                pass
-        return open_ports
+    def port_scan(target="127.0.0.1", ports=None, on_open=None, progress_callback=None):
+        """Scan ports on a host or subnet and return the sorted open port numbers.
+
+        ``ports`` is a list or a spec such as "1-1024,3389"; it defaults to the
+        common ports.  on_open(result) streams each open port with its
+        service name and banner as it is found.
+        """
+        results = PortScanner().scan(target, ports, on_open=on_open, progress_callback=progress_callback)
+        return sorted({entry["port"] for entries in results.values() for entry in entries})
@@ -1,24 +1,136 @@
 import os
 import sqlite3
-import json
 import logging
-import base64
+import json
 import secrets
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
 from cryptography.fernet import Fernet, InvalidToken
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.backends import default_backend
+
+from src.core.vault_index import SiteIndex
+from src.core.vault_kdf import LEGACY_PARAMS, KeySession, calibrated_params, derive_key
 
 logger = logging.getLogger(__name__)
 
+# Fixed SQL text so sqlite3's statement cache reuses the prepared statements.
+_SELECT_META = "SELECT value FROM metadata WHERE key = ?"
+_UPSERT_META = "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)"
+_SELECT_ALL = "SELECT site, encrypted_password FROM passwords"
+_UPSERT_PASSWORD = "INSERT OR REPLACE INTO passwords (site, encrypted_password) VALUES (?, ?)"
+_DELETE_PASSWORD = "DELETE FROM passwords WHERE site = ?"
+
+LAZY_CACHE_SIZE = 32  # decrypted entries kept in memory in lazy mode
+
+
+class _LazyPasswords(MutableMapping):
+    """Site -> password mapping that holds only ciphertext until a value is read.
+
+    Decrypted values live in a small LRU cache; evicted ones are decrypted
+    again on their next read.  An entry that fails to decrypt is dropped,
+    as the eager loader skips it.
+    """
+
+    def __init__(self, cipher, capacity=LAZY_CACHE_SIZE):
+        self._cipher = cipher
+        self._capacity = capacity
+        self._ciphertexts = {}
+        self._cache = OrderedDict()
+
+    def load(self, rows):
+        self._ciphertexts = dict(rows)
+        self._cache.clear()
+
+    def put(self, site, password, ciphertext):
+        self._ciphertexts[site] = ciphertext
+        self._remember(site, password)
+
+    def _remember(self, site, password):
+        self._cache[site] = password
+        self._cache.move_to_end(site)
+        while len(self._cache) > self._capacity:
+            self._cache.popitem(last=False)
+
+    def __getitem__(self, site):
+        if site in self._cache:
+            self._cache.move_to_end(site)
+            return self._cache[site]
+        token = self._ciphertexts[site]
+        try:
+            password = self._cipher.decrypt(token).decode()
+        except Exception:
+            logger.warning(f"Dropping vault entry that failed to decrypt: {site}")
+            del self._ciphertexts[site]
+            raise KeyError(site)
+        self._remember(site, password)
+        return password
+
+    def __setitem__(self, site, password):
+        self.put(site, password, self._cipher.encrypt(password.encode()))
+
+    def __delitem__(self, site):
+        del self._ciphertexts[site]
+        self._cache.pop(site, None)
+
+    def __contains__(self, site):
+        return site in self._ciphertexts
+
+    def __iter__(self):
+        return iter(self._ciphertexts)
+
+    def __len__(self):
+        return len(self._ciphertexts)
+
+    def clear(self):
+        self._cache.clear()
+        self._ciphertexts.clear()
+
+
 class PasswordManager:
-    def __init__(self, db_path):
+    def __init__(self, db_path, lazy=False, cache_size=LAZY_CACHE_SIZE, key_session_timeout=0):
         self.db_path = db_path
         self.key = None
         self.cipher = None
+        # Opt-in: keep the derived key for a while after lock() so the vault reopens without the KDF.
+        self.key_session = KeySession(key_session_timeout)
+        # lazy: unlock reads only names and ciphertext; entries are decrypted on access.
+        self.lazy = lazy
+        self.cache_size = cache_size
         self.passwords = {}
+        self.index = SiteIndex()  # site names only, kept in step with self.passwords
+        self._conn = None
+        self._lock = threading.RLock()
         self._init_db()
 
+    def _connect(self):
+        """The vault's single connection, opened on first use and kept until close().
+
+        WAL lets readers proceed during a write and makes each commit an
+        append instead of a rollback-journal rewrite; synchronous=NORMAL is
+        crash-safe in WAL mode.
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=32)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Checkpoints the WAL and closes the connection."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                    self._conn.close()
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to close vault database: {e}")
+                self._conn = None
+
+    def _get_meta(self, key):
+        row = self._connect().execute(_SELECT_META, (key,)).fetchone()
+        return row[0] if row else None
+
     def _init_db(self):
         """Initialize SQLite database tables."""
         try:
@@ -27,22 +139,20 @@ class PasswordManager:
             if db_dir and not os.path.exists(db_dir):
                 os.makedirs(db_dir, exist_ok=True)
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS metadata (
-                    key TEXT PRIMARY KEY,
-                    value BLOB
-                )
-            ''')
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS passwords (
-                    site TEXT PRIMARY KEY,
-                    encrypted_password BLOB
-                )
-            ''')
-            conn.commit()
-            conn.close()
+            with self._lock, self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS metadata (
+                        key TEXT PRIMARY KEY,
+                        value BLOB
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS passwords (
+                        site TEXT PRIMARY KEY,
+                        encrypted_password BLOB
+                    )
+                ''')
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
 
@@ -51,30 +161,38 @@ class PasswordManager:
         try:
             if not os.path.exists(self.db_path):
                 return False
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT value FROM metadata WHERE key = 'salt'")
-            row = cursor.fetchone()
-            conn.close()
-            return row is not None
+            with self._lock:
+                return self._get_meta("salt") is not None
         except Exception:
             return False
 
-    def initialize_vault(self, master_password):
-        """Creates a new vault with master password and salt."""
+    def kdf_params(self):
+        """The vault's stored KDF parameters; vaults that predate them use LEGACY_PARAMS."""
+        with self._lock:
+            raw = self._get_meta("kdf")
+        if raw is None:
+            return dict(LEGACY_PARAMS)
+        return json.loads(raw)
+
+    def initialize_vault(self, master_password, kdf_params=None):
+        """Creates a new vault with master password and salt.
+
+        The KDF defaults to this machine's calibrated parameters (see
+        vault_kdf.calibrated_params); they are stored in the metadata table.
+        """
         salt = secrets.token_bytes(16)
-        self.key = self._derive_key(master_password, salt)
+        params = kdf_params or calibrated_params()
+        self.key = self._derive_key(master_password, salt, params)
         self.cipher = Fernet(self.key)
+        self.passwords = _LazyPasswords(self.cipher, self.cache_size) if self.lazy else {}
+        self.index.clear()
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES ('salt', ?)", (salt,))
             # Store a verification block to check password later
             verify_block = self.cipher.encrypt(b"VERIFY_KEY_OK")
-            cursor.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES ('verify', ?)", (verify_block,))
-            conn.commit()
-            conn.close()
+            with self._lock, self._connect() as conn:
+                conn.executemany(_UPSERT_META, [("salt", salt), ("verify", verify_block),
+                                                ("kdf", json.dumps(params))])
             return True
         except Exception as e:
             logger.error(f"Failed to initialize vault: {e}")
@@ -86,27 +204,17 @@ class PasswordManager:
             if not os.path.exists(self.db_path):
                 return False
                 
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT value FROM metadata WHERE key = 'salt'")
-            salt_row = cursor.fetchone()
-            if not salt_row:
-                conn.close()
-                return False
-            
-            salt = salt_row[0]
-            cursor.execute("SELECT value FROM metadata WHERE key = 'verify'")
-            verify_row = cursor.fetchone()
-            conn.close()
-            
-            if not verify_row:
+            with self._lock:
+                salt = self._get_meta("salt")
+                verify = self._get_meta("verify")
+            if salt is None or verify is None:
                 return False
             
-            self.key = self._derive_key(master_password, salt)
+            self.key = self._derive_key(master_password, salt, self.kdf_params())
             self.cipher = Fernet(self.key)
             
             # This will raise InvalidToken if password is wrong
-            self.cipher.decrypt(verify_row[0])
+            self.cipher.decrypt(verify)
             
             # If we reached here, password is correct. Load all entries.
             return self._load_all()
@@ -118,20 +226,24 @@ class PasswordManager:
             return False
 
     def _load_all(self):
-        """Loads and decrypts all passwords from the database."""
+        """Loads all passwords from the database; decrypts them unless the manager is lazy."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT site, encrypted_password FROM passwords")
-            rows = cursor.fetchall()
-            conn.close()
-            
+            with self._lock:
+                rows = self._connect().execute(_SELECT_ALL).fetchall()
+
+            if self.lazy:
+                self.passwords = _LazyPasswords(self.cipher, self.cache_size)
+                self.passwords.load(rows)
+                self.index.rebuild(self.passwords.keys())
+                return True
+
             self.passwords = {}
             for site, enc_pw in rows:
                 try:
                     self.passwords[site] = self.cipher.decrypt(enc_pw).decode()
                 except Exception:
                     continue # Skip entries that fail to decrypt
+            self.index.rebuild(self.passwords.keys())
             return True
         except Exception as e:
             logger.error(f"Failed to load passwords: {e}")
@@ -145,42 +257,136 @@ class PasswordManager:
             
         try:
             enc_pw = self.cipher.encrypt(password.encode())
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("INSERT OR REPLACE INTO passwords (site, encrypted_password) VALUES (?, ?)", (site, enc_pw))
-            conn.commit()
-            conn.close()
-            self.passwords[site] = password
+            with self._lock, self._connect() as conn:
+                conn.execute(_UPSERT_PASSWORD, (site, enc_pw))
+            self._remember(site, password, enc_pw)
             return True
         except Exception as e:
             logger.error(f"Failed to save password: {e}")
             return False
 
+    def save_many(self, entries):
+        """Encrypts and saves many entries in one transaction.
+
+        ``entries`` is a dict or an iterable of (site, password) pairs.
+        Unsafe entries are skipped; returns the number saved.  If the write
+        fails nothing is saved and 0 is returned.
+        """
+        if not self.cipher: return 0
+        items = entries.items() if isinstance(entries, dict) else entries
+        batch = {}
+        for site, password in items:
+            if self.is_safe_input(site) and self.is_safe_input(password):
+                batch[site] = password
+        if not batch:
+            return 0
+        try:
+            rows = [(site, self.cipher.encrypt(pw.encode())) for site, pw in batch.items()]
+            with self._lock, self._connect() as conn:
+                conn.executemany(_UPSERT_PASSWORD, rows)
+            for site, enc_pw in rows:
+                self._remember(site, batch[site], enc_pw)
+            return len(batch)
+        except Exception as e:
+            logger.error(f"Failed to save passwords: {e}")
+            return 0
+
+    def write_encrypted(self, rows, metadata=None):
+        """Stores already-encrypted (site, password, token) rows, plus optional metadata
+        key/values, in one transaction.  Unsafe entries are skipped; returns the
+        number of entries written.  Raises if the write fails or the vault is locked."""
+        rows = [r for r in rows if self.is_safe_input(r[0]) and self.is_safe_input(r[1])]
+        with self._lock:
+            if not self.cipher:
+                raise RuntimeError("Vault is locked")
+            with self._connect() as conn:
+                conn.executemany(_UPSERT_PASSWORD, [(site, token) for site, _, token in rows])
+                if metadata:
+                    conn.executemany(_UPSERT_META, list(metadata.items()))
+            for site, password, token in rows:
+                self._remember(site, password, token)
+        return len(rows)
+
+    def get_metadata(self, key):
+        with self._lock:
+            return self._get_meta(key)
+
+    def delete_metadata(self, key):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM metadata WHERE key = ?", (key,))
+
+    def _remember(self, site, password, enc_pw):
+        if isinstance(self.passwords, _LazyPasswords):
+            self.passwords.put(site, password, enc_pw)
+        else:
+            self.passwords[site] = password
+        self.index.add(site)
+
+    def get_password(self, site, default=""):
+        """Returns the password for ``site``, decrypting it on demand in lazy mode."""
+        password = self.passwords.get(site)
+        if password is None:
+            self.index.remove(site)  # a lazy entry that failed to decrypt has been dropped
+            return default
+        return password
+
     def delete_password(self, site):
         """Deletes a password entry."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM passwords WHERE site = ?", (site,))
-            conn.commit()
-            conn.close()
+            with self._lock, self._connect() as conn:
+                conn.execute(_DELETE_PASSWORD, (site,))
             if site in self.passwords:
                 del self.passwords[site]
+            self.index.remove(site)
             return True
         except Exception as e:
             logger.error(f"Failed to delete password: {e}")
             return False
 
-    def _derive_key(self, password, salt):
-        """Derives a 32-byte key using PBKDF2."""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=390000,
-            backend=default_backend()
-        )
-        return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+    def delete_many(self, sites):
+        """Deletes many entries in one transaction; returns the number of rows removed."""
+        sites = list(dict.fromkeys(sites))
+        if not sites:
+            return 0
+        try:
+            with self._lock, self._connect() as conn:
+                before = conn.total_changes
+                conn.executemany(_DELETE_PASSWORD, [(site,) for site in sites])
+                removed = conn.total_changes - before
+            for site in sites:
+                self.passwords.pop(site, None)
+                self.index.remove(site)
+            return removed
+        except Exception as e:
+            logger.error(f"Failed to delete passwords: {e}")
+            return 0
+
+    def _derive_key(self, password, salt, params=None):
+        """Derives the Fernet key; ``params`` defaults to the legacy PBKDF2 settings."""
+        return derive_key(password, salt, params or LEGACY_PARAMS)
+
+    def lock(self):
+        """Clears decrypted data; with a key session the key is kept until it expires."""
+        with self._lock:
+            key = self.key
+            self.clear_memory()
+        self.key_session.store(key)
+
+    def resume_session(self):
+        """Reopens a locked vault from the key session without the master password."""
+        key = self.key_session.take()
+        if key is None:
+            return False
+        try:
+            with self._lock:
+                verify = self._get_meta("verify")
+            cipher = Fernet(key)
+            cipher.decrypt(verify)
+        except Exception:
+            self.key_session.clear()
+            return False
+        self.key, self.cipher = key, cipher
+        return self._load_all()
 
     def is_safe_input(self, user_input):
         if not isinstance(user_input, str) or len(user_input) > 4096:
@@ -188,15 +394,22 @@ class PasswordManager:
         return all(ord(c) >= 32 for c in user_input)
 
     def get_all_sites(self):
-        return sorted(list(self.passwords.keys()))
+        return self.index.all()
+
+    def search_sites(self, query):
+        """Site names containing ``query``, case-insensitive, prefix matches first."""
+        return self.index.search(query)
 
     def clear_memory(self):
         """Best effort to clear sensitive data from memory."""
-        for site in list(self.passwords.keys()):
-            self.passwords[site] = ""
+        if isinstance(self.passwords, dict):
+            for site in list(self.passwords.keys()):
+                self.passwords[site] = ""
         self.passwords.clear()
+        self.index.clear()
         self.key = None
         self.cipher = None
+        self.key_session.clear()
 
     def migrate_from_json(self, json_path, salt_path, master_password):
         """Attempts to migrate data from old JSON/salt files."""
@@ -213,43 +426,15 @@ class PasswordManager:
                     if not self.unlock(master_password):
                         return False
 
-            # 2. Open and decrypt the old legacy vault
-            with open(salt_path, "rb") as f:
-                old_salt = f.read()
-            
-            # Derive the OLD key using the same logic
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=old_salt,
-                iterations=390000,
-                backend=default_backend()
-            )
-            old_key = base64.urlsafe_b64encode(kdf.derive(master_password.encode()))
-            old_cipher = Fernet(old_key)
-            
-            with open(json_path, "r") as f:
-                data = json.load(f)
-            
-            # Verify the old password works for the JSON vault if it has __verify__
-            if "__verify__" in data:
-                try:
-                    old_cipher.decrypt(data["__verify__"].encode())
-                except InvalidToken:
-                    logger.error("Migration failed: Master password incorrect for legacy vault.")
-                    return False
-            
-            # 3. Migrate entries to the current SQLite vault
-            count = 0
-            for site, enc_pw_str in data.items():
-                if site in ("__verify__", "__version__"): continue
-                try:
-                    raw_pw = old_cipher.decrypt(enc_pw_str.encode()).decode()
-                    if self.save_password(site, raw_pw):
-                        count += 1
-                except Exception:
-                    continue
-            
+            # 2. Decrypt the legacy vault and re-encrypt it in bulk
+            from src.core.vault_import import VaultImporter
+            try:
+                stats = VaultImporter(self).import_legacy_json(json_path, salt_path, master_password)
+            except ValueError as e:
+                logger.error(f"Migration failed: {e}.")
+                return False
+            count = stats["imported"]
+
             logger.info(f"Successfully migrated {count} passwords from old JSON vault.")
             return True
         except Exception as e:
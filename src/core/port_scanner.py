@@ -0,0 +1,261 @@
+import time
+import socket
+import asyncio
+import logging
+import ipaddress
+import threading
+
+logger = logging.getLogger(__name__)
+
+COMMON_PORTS = [21, 22, 23, 25, 53, 80, 110, 135, 139, 143, 443, 445, 993, 995, 1723, 3306, 3389, 5900, 8080]
+DEFAULT_PORT_SPEC = "1-1024,1433,1723,3306,3389,5432,5900,6379,8000,8080,8443,9200,27017"
+
+MAX_HOSTS = 4096            # refuse subnets larger than a /20
+DEFAULT_CONCURRENCY = 512   # simultaneous connection attempts
+INITIAL_TIMEOUT = 0.5       # seconds, before any RTT to a host is known
+MIN_TIMEOUT = 0.1
+MAX_TIMEOUT = 2.0
+BANNER_TIMEOUT = 0.6
+CACHE_TTL = 300             # seconds a host's open/refused results stay valid
+
+_HTTP_PORTS = {80, 443, 8000, 8008, 8080, 8443, 8888, 9200}
+
+# host -> {port: (checked_at, result dict or None for closed)}
+_cache = {}
+_cache_lock = threading.Lock()
+
+# _probe's answer for a port that neither accepted nor refused in time.  With
+# timeouts as short as MIN_TIMEOUT that says little, so it is never cached.
+_NO_ANSWER = object()
+
+
+def parse_ports(spec):
+    """Turn "22,80,8000-8100" (or an iterable of ints) into a sorted port list."""
+    if spec is None:
+        return list(COMMON_PORTS)
+    if not isinstance(spec, str):
+        return sorted({int(p) for p in spec if 0 < int(p) < 65536})
+    ports = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            ports.update(range(max(1, int(lo)), min(65535, int(hi)) + 1))
+        else:
+            ports.add(int(part))
+    return sorted(p for p in ports if 0 < p < 65536)
+
+
+def expand_hosts(spec):
+    """Expand "host", "a, b" or a CIDR subnet such as "192.168.1.0/24" into host strings."""
+    hosts = []
+    for part in str(spec).replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "/" in part:
+            network = ipaddress.ip_network(part, strict=False)
+            if network.num_addresses > MAX_HOSTS:
+                raise ValueError(f"Subnet {part} has more than {MAX_HOSTS} addresses")
+            hosts.extend(str(ip) for ip in (network.hosts() if network.num_addresses > 2 else network))
+        else:
+            hosts.append(part)
+    return list(dict.fromkeys(hosts))
+
+
+def fingerprint(port, banner):
+    """Best-effort service name from a banner, falling back to the port's registered name."""
+    text = (banner or "").lower()
+    if text.startswith("ssh-"):
+        return "ssh"
+    if text.startswith("http/"):
+        return "https" if port in (443, 8443) else "http"
+    if text.startswith("220") and "ftp" in text:
+        return "ftp"
+    if text.startswith("220") and ("smtp" in text or "esmtp" in text):
+        return "smtp"
+    if text.startswith("+ok"):
+        return "pop3"
+    if text.startswith("* ok"):
+        return "imap"
+    if "mysql" in text or "mariadb" in text:
+        return "mysql"
+    if text.startswith("rfb "):
+        return "vnc"
+    if text.startswith("-err") or text.startswith("+pong"):
+        return "redis"
+    try:
+        return socket.getservbyport(port, "tcp")
+    except OSError:
+        return "unknown"
+
+
+def clear_cache(host=None):
+    with _cache_lock:
+        if host is None:
+            _cache.clear()
+        else:
+            _cache.pop(host, None)
+
+
+class _HostTiming:
+    """Per-host RTT estimate (RFC 6298 style) used to size connect timeouts."""
+
+    __slots__ = ("srtt", "rttvar")
+
+    def __init__(self):
+        self.srtt = None
+        self.rttvar = None
+
+    def update(self, rtt):
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+    def timeout(self):
+        if self.srtt is None:
+            return INITIAL_TIMEOUT
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, self.srtt + 4 * self.rttvar))
+
+
+class PortScanner:
+    """Asynchronous TCP connect scanner.
+
+    A fixed window of ``concurrency`` coroutines pulls (host, port) pairs
+    from a shared iterator, so memory stays flat for any number of ports.
+    Connect timeouts adapt to the RTT observed for each host, open ports
+    get a short banner read, and each host's open and refused ports are
+    cached for CACHE_TTL seconds so repeat scans only probe what expired
+    or did not answer.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, timeout=None, grab_banners=True, cache_ttl=CACHE_TTL):
+        self.concurrency = concurrency
+        self.fixed_timeout = timeout
+        self.grab_banners = grab_banners
+        self.cache_ttl = cache_ttl
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def scan(self, targets="127.0.0.1", ports=None, on_open=None, progress_callback=None):
+        """Scan and return {host: [{"host", "port", "service", "banner", "cached"}, ...]}.
+
+        on_open(result) fires for every open port as soon as it is found
+        (cached hits included); progress_callback(percent, message) reports
+        overall progress.
+        """
+        hosts = expand_hosts(targets) if isinstance(targets, str) else list(targets)
+        port_list = parse_ports(ports)
+        self._cancel_event.clear()
+        return asyncio.run(self._scan(hosts, port_list, on_open, progress_callback))
+
+    async def _scan(self, hosts, ports, on_open, progress_callback):
+        results = {host: [] for host in hosts}
+        timings = {host: _HostTiming() for host in hosts}
+        now = time.time()
+        pending = []
+
+        with _cache_lock:
+            for host in hosts:
+                cached = _cache.get(host, {})
+                for port in ports:
+                    hit = cached.get(port)
+                    if hit and now - hit[0] < self.cache_ttl:
+                        if hit[1] is not None:
+                            entry = dict(hit[1], cached=True)
+                            results[host].append(entry)
+                            if on_open:
+                                on_open(entry)
+                    else:
+                        pending.append((host, port))
+
+        total = len(pending)
+        state = {"done": 0, "last": 0.0}
+        work = iter(pending)
+        fresh = []
+
+        async def worker():
+            for host, port in work:
+                if self._cancel_event.is_set():
+                    return
+                entry = await self._probe(host, port, timings[host])
+                if entry is _NO_ANSWER:
+                    entry = None
+                else:
+                    fresh.append((host, port, entry))
+                if entry is not None:
+                    results[host].append(entry)
+                    if on_open:
+                        on_open(entry)
+                state["done"] += 1
+                t = time.perf_counter()
+                if progress_callback and (t - state["last"] >= 0.25 or state["done"] == total):
+                    state["last"] = t
+                    progress_callback(int(state["done"] * 100 / total), f"Probed {state['done']}/{total} ports")
+
+        if pending:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, total))))
+
+        stamp = time.time()
+        with _cache_lock:
+            for host, port, entry in fresh:
+                _cache.setdefault(host, {})[port] = (stamp, entry)
+
+        for entries in results.values():
+            entries.sort(key=lambda e: e["port"])
+        if progress_callback:
+            progress_callback(100, "Scan stopped" if self.cancelled else "Scan complete")
+        return results
+
+    async def _probe(self, host, port, timing):
+        timeout = self.fixed_timeout or timing.timeout()
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        except ConnectionRefusedError:
+            timing.update(time.perf_counter() - start)  # closed, but the host answered
+            return None
+        except (asyncio.TimeoutError, OSError):
+            return _NO_ANSWER
+        timing.update(time.perf_counter() - start)
+
+        banner = ""
+        try:
+            if self.grab_banners:
+                banner = await self._read_banner(reader, writer, host, port)
+        finally:
+            writer.close()
+            try:
+                await asyncio.wait_for(writer.wait_closed(), 0.2)
+            except (asyncio.TimeoutError, OSError):
+                pass
+        return {"host": host, "port": port, "service": fingerprint(port, banner), "banner": banner, "cached": False}
+
+    @staticmethod
+    async def _read_banner(reader, writer, host, port):
+        try:
+            data = await asyncio.wait_for(reader.read(256), BANNER_TIMEOUT)
+            if not data and port in _HTTP_PORTS:
+                raise asyncio.TimeoutError
+        except asyncio.TimeoutError:
+            if port not in _HTTP_PORTS:
+                return ""
+            # HTTP servers wait for the client to speak first.
+            try:
+                writer.write(f"HEAD / HTTP/1.0\r\nHost: {host}\r\n\r\n".encode("ascii"))
+                await writer.drain()
+                data = await asyncio.wait_for(reader.read(256), BANNER_TIMEOUT)
+            except (asyncio.TimeoutError, OSError):
+                return ""
+        except OSError:
+            return ""
+        return data.decode("utf-8", errors="replace").splitlines()[0].strip() if data else ""
@@ -0,0 +1,428 @@
+import os
+import sys
+import time
+import struct
+import socket
+import asyncio
+import logging
+import threading
+
+from src.utils import win_icmp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COUNT = 4
+DEFAULT_INTERVAL = 0.2   # seconds between probes to the same target
+DEFAULT_TIMEOUT = 1.0    # seconds to wait for each reply
+TCP_PORTS = (443, 80)    # tried in order when no form of ICMP echo is available
+
+_ICMP_ECHO_REQUEST = {socket.AF_INET: 8, socket.AF_INET6: 128}
+_ICMP_ECHO_REPLY = {socket.AF_INET: 0, socket.AF_INET6: 129}
+
+_icmp_allowed = {}
+
+
+def _checksum(data):
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _open_icmp_socket(family):
+    proto = socket.IPPROTO_ICMP if family == socket.AF_INET else socket.IPPROTO_ICMPV6
+    sock = socket.socket(family, socket.SOCK_DGRAM, proto)
+    sock.setblocking(False)
+    return sock
+
+
+def icmp_allowed(family=socket.AF_INET):
+    """True if this process may open unprivileged ICMP datagram sockets.
+
+    Linux allows them when the group is inside net.ipv4.ping_group_range and
+    macOS always does; Windows has no such socket type (see win_icmp).
+    """
+    if family not in _icmp_allowed:
+        try:
+            _open_icmp_socket(family).close()
+            _icmp_allowed[family] = True
+        except (OSError, AttributeError):
+            _icmp_allowed[family] = False
+    return _icmp_allowed[family]
+
+
+async def _recvfrom(loop, sock, size):
+    """loop.sock_recvfrom, with an add_reader fallback for Python 3.10."""
+    if hasattr(loop, "sock_recvfrom"):
+        return await loop.sock_recvfrom(sock, size)
+    future = loop.create_future()
+
+    def ready():
+        if future.done():
+            return
+        try:
+            future.set_result(sock.recvfrom(size))
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            future.set_exception(e)
+
+    loop.add_reader(sock.fileno(), ready)
+    try:
+        return await future
+    finally:
+        loop.remove_reader(sock.fileno())
+
+
+def _echo_request(family, ident, seq):
+    header = struct.pack("!BBHHH", _ICMP_ECHO_REQUEST[family], 0, 0, ident, seq)
+    payload = struct.pack("!d", time.time()) + bytes(24)
+    if family == socket.AF_INET:
+        header = header[:2] + struct.pack("!H", _checksum(header + payload)) + header[4:]
+    return header + payload
+
+
+def _echo_reply(family, data):
+    """(ident, seq) of an echo reply, or None for any other ICMP message."""
+    if family == socket.AF_INET and data and data[0] >> 4 == 4:
+        data = data[(data[0] & 0x0F) * 4:]  # macOS includes the IP header
+    if len(data) < 8 or data[0] != _ICMP_ECHO_REPLY[family]:
+        return None
+    return struct.unpack("!HH", data[4:8])
+
+
+async def _resolve(target):
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(target, None, type=socket.SOCK_DGRAM)
+    # Prefer IPv4 like the ping command does by default.
+    infos.sort(key=lambda info: info[0] != socket.AF_INET)
+    family, _, _, _, sockaddr = infos[0]
+    return family, sockaddr
+
+
+async def _sendto(loop, sock, data, address):
+    try:
+        await loop.sock_sendto(sock, data, address)
+    except (AttributeError, NotImplementedError):
+        sock.sendto(data, address)
+
+
+def summarize(rtts):
+    """Latency stats from per-probe RTTs in ms (None = lost).
+
+    Jitter is the mean absolute difference between consecutive replies, as
+    the old text-parsing implementation computed it.
+    """
+    got = [r for r in rtts if r is not None]
+    loss = int(round(100 * (len(rtts) - len(got)) / len(rtts))) if rtts else 100
+    if not got:
+        return {"avg": -1, "jitter": -1, "loss": 100, "min": -1, "max": -1}
+    jitter = 0
+    if len(got) > 1:
+        jitter = sum(abs(got[i] - got[i - 1]) for i in range(1, len(got))) / (len(got) - 1)
+    return {"avg": sum(got) / len(got), "jitter": jitter, "loss": loss, "min": min(got), "max": max(got)}
+
+
+class ProbeEngine:
+    """Probes many targets at once on a single asyncio loop.
+
+    Each target gets an unprivileged ICMP echo socket where the OS permits
+    it; on Windows IPv4 echoes go through IcmpSendEcho instead (like
+    ping.exe, no admin rights needed).  Only when neither is possible is
+    RTT taken from a TCP connect to TCP_PORTS (a refused connection still
+    measures one round trip).  All targets run concurrently, so N targets
+    take about as long as one.
+    """
+
+    def __init__(self, count=DEFAULT_COUNT, interval=DEFAULT_INTERVAL, timeout=DEFAULT_TIMEOUT, method="auto"):
+        self.count = count
+        self.interval = interval
+        self.timeout = timeout
+        self.method = method  # "auto", "icmp" or "tcp"
+        self._ident = os.getpid() & 0xFFFF
+
+    # ── public API ───────────────────────────────────────────────────────
+    def run(self, targets):
+        """Probe every target; returns {target: {"rtts", "method", "avg", "jitter", "loss", ...}}."""
+        targets = list(dict.fromkeys(targets))
+        if not targets:
+            return {}
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.probe_all(targets))
+        # Called from inside a running loop: do the work on a private one.
+        box = {}
+        t = threading.Thread(target=lambda: box.update(asyncio.run(self.probe_all(targets))), daemon=True)
+        t.start()
+        t.join()
+        return box
+
+    async def probe_all(self, targets):
+        results = await asyncio.gather(*(self.probe(t) for t in targets))
+        return dict(zip(targets, results))
+
+    async def probe(self, target):
+        try:
+            family, address = await _resolve(target)
+        except (OSError, UnicodeError) as e:
+            logger.debug(f"Cannot resolve {target}: {e}")
+            result = summarize([None] * self.count)
+            result.update({"rtts": [None] * self.count, "method": "none", "error": str(e)})
+            return result
+
+        method = self.method
+        use_win_icmp = family == socket.AF_INET and win_icmp.available()
+        if method == "auto":
+            method = "icmp" if use_win_icmp or icmp_allowed(family) else "tcp"
+        rtts = None
+        if method == "icmp" and use_win_icmp:
+            try:
+                rtts = await self._probe_win_icmp(address)
+            except OSError as e:
+                logger.debug(f"IcmpSendEcho to {address[0]} failed, falling back to TCP: {e}")
+                method = "tcp"
+        elif method == "icmp":
+            rtts = await self._probe_icmp(family, address)
+        if rtts is None:
+            rtts = await self._probe_tcp(family, address)
+        result = summarize(rtts)
+        result.update({"rtts": rtts, "method": method, "address": address[0]})
+        return result
+
+    # ── internals ────────────────────────────────────────────────────────
+    async def _probe_icmp(self, family, address):
+        loop = asyncio.get_running_loop()
+        sock = _open_icmp_socket(family)
+        sent = {}
+        rtts = [None] * self.count
+        match_ident = not sys.platform.startswith("linux")  # Linux rewrites the id to the socket's port
+
+        async def receive():
+            while any(r is None for r in rtts):
+                data, source = await _recvfrom(loop, sock, 2048)
+                now = time.perf_counter()
+                if source[0] != address[0]:
+                    continue  # another target's reply (macOS shares ident and seq numbers across sockets)
+                reply = _echo_reply(family, data)
+                if reply is None:
+                    continue
+                ident, seq = reply
+                if match_ident and ident != self._ident:
+                    continue
+                if seq in sent and rtts[seq] is None:
+                    rtts[seq] = (now - sent[seq]) * 1000
+
+        receiver = asyncio.ensure_future(receive())
+        try:
+            for seq in range(self.count):
+                packet = _echo_request(family, self._ident, seq)
+                sent[seq] = time.perf_counter()
+                try:
+                    await _sendto(loop, sock, packet, address)
+                except OSError as e:
+                    logger.debug(f"ICMP send to {address[0]} failed: {e}")
+                if seq < self.count - 1:
+                    await asyncio.sleep(self.interval)
+            try:
+                await asyncio.wait_for(asyncio.shield(receiver), self.timeout)
+            except asyncio.TimeoutError:
+                pass
+        except OSError as e:
+            logger.debug(f"ICMP probe of {address[0]} failed: {e}")
+        finally:
+            receiver.cancel()
+            try:
+                await receiver
+            except (asyncio.CancelledError, OSError):
+                pass
+            sock.close()
+        return rtts
+
+    async def _probe_win_icmp(self, address):
+        loop = asyncio.get_running_loop()
+        pending = []
+        for seq in range(self.count):
+            pending.append(loop.run_in_executor(None, win_icmp.echo, address[0], None, self.timeout))
+            if seq < self.count - 1:
+                await asyncio.sleep(self.interval)
+        rtts = []
+        for status, source, rtt in await asyncio.gather(*pending):
+            rtts.append(rtt if status == win_icmp.IP_SUCCESS and source == address[0] else None)
+        return rtts
+
+    async def _probe_tcp(self, family, address):
+        rtts = []
+        ports = list(TCP_PORTS)
+        for seq in range(self.count):
+            rtt, port = await self._tcp_rtt(family, address[0], ports)
+            if port is not None and ports[0] != port:
+                # Stick with the port that answered instead of waiting on a filtered one again.
+                ports.remove(port)
+                ports.insert(0, port)
+            rtts.append(rtt)
+            if seq < self.count - 1:
+                await asyncio.sleep(self.interval)
+        return rtts
+
+    async def _tcp_rtt(self, family, host, ports):
+        loop = asyncio.get_running_loop()
+        for port in ports:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(loop.sock_connect(sock, (host, port)), self.timeout)
+                return (time.perf_counter() - start) * 1000, port
+            except ConnectionRefusedError:
+                return (time.perf_counter() - start) * 1000, port  # the RST is a full round trip
+            except (asyncio.TimeoutError, OSError):
+                continue
+            finally:
+                sock.close()
+        return None, None
+
+
+class EchoSession:
+    """Repeated single echoes to one target, for continuous monitoring.
+
+    The target is resolved once and, with ICMP sockets, one socket stays
+    open with a single receiver matching replies by sequence number, so a
+    ping costs one sendto.  Windows uses IcmpSendEcho for IPv4.  TCP is the
+    last resort: a port is chosen once and ``min_interval`` tells the caller
+    not to connect more often than TCP_MIN_INTERVAL.
+    """
+
+    TCP_MIN_INTERVAL = 1.0   # seconds between TCP connects to the same host
+    TCP_RETRY = 10.0         # seconds before looking for an open port again
+
+    def __init__(self, target, timeout=DEFAULT_TIMEOUT, method="auto"):
+        self.target = target
+        self.timeout = timeout
+        self.method = method
+        self.family = self.address = None
+        self.min_interval = 0.0
+        self._sock = None
+        self._receiver = None
+        self._waiting = {}   # seq -> (sent perf_counter, future)
+        self._seq = 0
+        self._port = None
+        self._port_retry_at = 0.0
+
+    async def open(self):
+        """Resolve the target and pick the probe method; raises OSError if it cannot be resolved."""
+        self.family, self.address = await _resolve(self.target)
+        use_win_icmp = self.family == socket.AF_INET and win_icmp.available()
+        method = self.method
+        if method == "auto":
+            method = "icmp" if use_win_icmp or icmp_allowed(self.family) else "tcp"
+        if method == "icmp" and use_win_icmp:
+            method = "win_icmp"
+        elif method == "icmp":
+            try:
+                self._sock = _open_icmp_socket(self.family)
+            except OSError as e:
+                logger.debug(f"ICMP socket for {self.target} failed, falling back to TCP: {e}")
+                method = "tcp"
+            else:
+                self._receiver = asyncio.ensure_future(self._receive())
+        self.method = method
+        if method == "tcp":
+            self.min_interval = self.TCP_MIN_INTERVAL
+        return self
+
+    def close(self):
+        if self._receiver is not None:
+            self._receiver.cancel()
+            self._receiver = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    async def ping(self):
+        """One echo; returns the RTT in ms, or None if it was lost."""
+        if self.method == "win_icmp":
+            loop = asyncio.get_running_loop()
+            try:
+                status, source, rtt = await loop.run_in_executor(None, win_icmp.echo, self.address[0], None, self.timeout)
+            except OSError as e:
+                logger.debug(f"IcmpSendEcho to {self.address[0]} failed: {e}")
+                return None
+            return rtt if status == win_icmp.IP_SUCCESS and source == self.address[0] else None
+        if self.method == "icmp":
+            return await self._ping_icmp()
+        return await self._ping_tcp()
+
+    async def _ping_icmp(self):
+        loop = asyncio.get_running_loop()
+        seq = self._seq
+        self._seq = (seq + 1) & 0xFFFF
+        future = loop.create_future()
+        self._waiting[seq] = (time.perf_counter(), future)
+        try:
+            await _sendto(loop, self._sock, _echo_request(self.family, os.getpid() & 0xFFFF, seq), self.address)
+            return await asyncio.wait_for(future, self.timeout)
+        except (asyncio.TimeoutError, OSError):
+            return None
+        finally:
+            self._waiting.pop(seq, None)
+
+    async def _receive(self):
+        loop = asyncio.get_running_loop()
+        match_ident = not sys.platform.startswith("linux")  # Linux rewrites the id to the socket's port
+        while True:
+            try:
+                data, source = await _recvfrom(loop, self._sock, 2048)
+            except OSError as e:
+                logger.debug(f"ICMP receive from {self.address[0]} failed: {e}")
+                await asyncio.sleep(self.timeout)
+                continue
+            now = time.perf_counter()
+            reply = _echo_reply(self.family, data) if source[0] == self.address[0] else None
+            if reply is None or (match_ident and reply[0] != os.getpid() & 0xFFFF):
+                continue
+            sent, future = self._waiting.get(reply[1], (None, None))
+            if future is not None and not future.done():
+                future.set_result((now - sent) * 1000)
+
+    async def _ping_tcp(self):
+        loop = asyncio.get_running_loop()
+        if self._port is None:
+            if loop.time() < self._port_retry_at:
+                return None
+            # Look for a port that answers once, not on every ping.
+            self._port_retry_at = loop.time() + self.TCP_RETRY
+            for port in TCP_PORTS:
+                rtt = await self._connect(port)
+                if rtt is not None:
+                    self._port = port
+                    return rtt
+            return None
+        rtt = await self._connect(self._port)
+        if rtt is None:
+            self._port = None  # it stopped answering; search again after TCP_RETRY
+            self._port_retry_at = loop.time() + self.TCP_RETRY
+        return rtt
+
+    async def _connect(self, port):
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, (self.address[0], port)), self.timeout)
+        except ConnectionRefusedError:
+            if sys.platform == "win32":
+                return None  # Windows retries the SYN after a RST, so this is not one round trip
+        except (asyncio.TimeoutError, OSError):
+            return None
+        finally:
+            sock.close()
+        return (time.perf_counter() - start) * 1000
+
+
+def ping_many(targets,count=DEFAULT_COUNT, interval=DEFAULT_INTERVAL, timeout=DEFAULT_TIMEOUT):
+    """Probe all targets concurrently; see ProbeEngine.run for the result shape."""
+    return ProbeEngine(count=count, interval=interval, timeout=timeout).run(targets)
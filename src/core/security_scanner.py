@@ -1,38 +1,101 @@
 import subprocess
 import sys
 import os
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from src.utils.powershell_host import run_powershell
 
 logger = logging.getLogger(__name__)
 CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
 
 class SecurityScanner:
-    def get_report(self):
-        issues = []
+    # Each check gets its own deadline, and the whole report one overall
+    # deadline; a hung check is reported as timed out instead of holding up
+    # the rest of the report (or the checks queued behind it).
+    CHECK_TIMEOUT = 20
+    MAX_WORKERS = 6
+
+    def __init__(self, check_timeout=None, max_workers=None):
+        self.check_timeout = check_timeout or self.CHECK_TIMEOUT
+        self.max_workers = max_workers or self.MAX_WORKERS
+
+    def _get_checks(self):
         if sys.platform == 'win32':
-            issues.append(self._check_windows_defender())
-            issues.append(self._check_firewall())
-            issues.append(self._check_uac())
-            issues.append(self._check_smbv1())
-            issues.append(self._check_shares())
-            issues.append(self._check_rdp())
-            issues.append(self._check_windows_update_enabled())
-            issues.append(self._check_autorun_entries())
-            issues.append(self._check_bitlocker())
-            issues.append(self._check_guest_account())
-            issues.append(self._check_open_ports())
-        else:
-            issues.append(self._check_linux_firewall())
-            issues.append(self._check_ssh_status())
-            issues.append(self._check_root_login())
-            issues.append(self._check_sudo_nopasswd())
-            issues.append(self._check_world_writable())
-        return issues
+            return [
+                self._check_windows_defender,
+                self._check_firewall,
+                self._check_uac,
+                self._check_smbv1,
+                self._check_shares,
+                self._check_rdp,
+                self._check_windows_update_enabled,
+                self._check_autorun_entries,
+                self._check_bitlocker,
+                self._check_guest_account,
+                self._check_open_ports,
+            ]
+        return [
+            self._check_linux_firewall,
+            self._check_ssh_status,
+            self._check_root_login,
+            self._check_sudo_nopasswd,
+            self._check_world_writable,
+        ]
+
+    def get_report(self):
+        """Run every check concurrently and return the results in check order."""
+        results = dict(self.iter_report())
+        return [results[i] for i in sorted(results)]
+
+    def iter_report(self):
+        """Run the checks in a bounded pool, yielding (index, result) as each finishes.
+
+        A check that runs longer than ``check_timeout`` yields a timeout result;
+        its thread is abandoned rather than waited for.  Hung checks still
+        occupy pool threads, so everything unfinished (queued checks too)
+        times out at an overall deadline: the time every round of checks
+        would take if each used its full ``check_timeout``.
+        """
+        checks = self._get_checks()
+        started = {}
+        rounds = -(-len(checks) // self.max_workers)
+        deadline = time.monotonic() + rounds * self.check_timeout
+
+        def run_check(index, check):
+            started[index] = time.monotonic()
+            return check()
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            pending = {pool.submit(run_check, i, check): i for i, check in enumerate(checks)}
+            while pending:
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        yield index, future.result()
+                    except Exception as e:
+                        logger.warning(f"Security check {checks[index].__name__} failed: {e}")
+                        yield index, (f"Error running {self._check_label(checks[index])} check", "Medium", None)
+                now = time.monotonic()
+                for future, index in list(pending.items()):
+                    if now > deadline or (index in started and now - started[index] > self.check_timeout):
+                        del pending[future]
+                        logger.warning(f"Security check {checks[index].__name__} timed out")
+                        yield index, (f"{self._check_label(checks[index])} check timed out", "Medium", None)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _check_label(check):
+        name = check.__name__.replace("_check_", "", 1).replace("_", " ")
+        return name.title().replace("Uac", "UAC").replace("Rdp", "RDP").replace("Smbv1", "SMBv1").replace("Ssh", "SSH")
 
     def _check_linux_firewall(self):
         from src.utils.helpers import run_command
         try:
-            res = run_command(["ufw", "status"])
+            res = run_command(["ufw", "status"], timeout=self.check_timeout)
             if "inactive" in res.stdout.lower():
                 return "UFW Firewall is Inactive", "High", "enable_ufw"
             return "UFW Firewall is Active", "Low", None
@@ -43,7 +106,7 @@ class SecurityScanner:
     def _check_ssh_status(self):
         from src.utils.helpers import run_command
         try:
-            res = run_command(["systemctl", "is-active", "ssh"])
+            res = run_command(["systemctl", "is-active", "ssh"], timeout=self.check_timeout)
             if "active" in res.stdout.lower():
                 return "SSH Service is Active (Ensure it's needed)", "Medium", None
             return "SSH Service is Inactive", "Low", None
@@ -64,7 +127,6 @@ class SecurityScanner:
             return "Could not check SSH config", "Low", None
 
     def _check_windows_defender(self):
-        from src.utils.helpers import run_command
         try:
             # AMRunningMode is the most reliable signal on Windows 10/11.
             #   Normal  = Defender is the active AV, fully protecting the system.
@@ -87,7 +149,7 @@ class SecurityScanner:
                 "  else { 'DISABLED:' + $tamper } "
                 "}"
             )
-            res = run_command(["powershell", "-NoProfile", "-Command", ps_cmd])
+            res = run_powershell(ps_cmd, timeout=self.check_timeout)
             output = res.stdout.strip()
             if output == "OK":
                 return "Windows Defender & Real-time Protection Enabled", "Low", None
@@ -107,7 +169,7 @@ class SecurityScanner:
     def _check_firewall(self):
         from src.utils.helpers import run_command
         try:
-            res = run_command(["netsh", "advfirewall", "show", "allprofiles", "state"])
+            res = run_command(["netsh", "advfirewall", "show", "allprofiles", "state"], timeout=self.check_timeout)
             if "OFF" in res.stdout.upper():
                 return "Firewall Disabled on some profiles", "Critical", "enable_firewall"
             return "Firewall Enabled on all profiles", "Low", None
@@ -116,10 +178,9 @@ class SecurityScanner:
             return "Error checking Firewall", "Medium", None
 
     def _check_uac(self):
-        from src.utils.helpers import run_command
         try:
             ps_cmd = "(Get-ItemProperty HKLM:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Policies\\System).EnableLUA"
-            res = run_command(["powershell", "-NoProfile", "-Command", ps_cmd])
+            res = run_powershell(ps_cmd, timeout=self.check_timeout)
             if res.stdout.strip() == "0":
                 return "UAC Disabled", "High", "enable_uac"
             return "UAC Enabled", "Low", None
@@ -128,10 +189,9 @@ class SecurityScanner:
             return "Error checking UAC", "Medium", None
 
     def _check_smbv1(self):
-        from src.utils.helpers import run_command
         try:
             ps_cmd = "(Get-WindowsOptionalFeature -Online -FeatureName SMB1Protocol).State"
-            res = run_command(["powershell", "-NoProfile", "-Command", ps_cmd])
+            res = run_powershell(ps_cmd, timeout=self.check_timeout)
             if "Enabled" in res.stdout:
                 return "SMBv1 Enabled (Security Risk)", "High", "disable_smbv1"
             return "SMBv1 Disabled", "Low", None
@@ -142,7 +202,7 @@ class SecurityScanner:
     def _check_shares(self):
         from src.utils.helpers import run_command
         try:
-            res = run_command(["net", "share"])
+            res = run_command(["net", "share"], timeout=self.check_timeout)
             shares = [line for line in res.stdout.split('\n') if line and not line.startswith(('Share name', '----------', 'The command completed')) and '$' not in line]
             if shares:
                 return f"{len(shares)} Active Network Shares", "Low", None
@@ -182,13 +242,12 @@ class SecurityScanner:
             return "Could not check Windows Update policy", "Low", None
 
     def _check_autorun_entries(self):
-        from src.utils.helpers import run_command
         try:
             ps_cmd = (
                 "Get-ItemProperty 'HKLM:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Run' "
                 "| Select-Object * -ExcludeProperty PS* | ConvertTo-Json -Compress"
             )
-            res = run_command(["powershell", "-NoProfile", "-Command", ps_cmd])
+            res = run_powershell(ps_cmd, timeout=self.check_timeout)
             import json
             data = json.loads(res.stdout.strip()) if res.stdout.strip() else {}
             count = len(data)
@@ -200,10 +259,9 @@ class SecurityScanner:
             return "Could not enumerate autorun entries", "Low", None
 
     def _check_bitlocker(self):
-        from src.utils.helpers import run_command
         try:
             ps_cmd = "Get-BitLockerVolume -MountPoint $env:SystemDrive -ErrorAction SilentlyContinue | Select-Object -ExpandProperty ProtectionStatus"
-            res = run_command(["powershell", "-NoProfile", "-Command", ps_cmd])
+            res = run_powershell(ps_cmd, timeout=self.check_timeout)
             output = res.stdout.strip()
             if "On" in output or output == "1":
                 return "BitLocker Encryption is Active on System Drive", "Low", None
@@ -215,7 +273,7 @@ class SecurityScanner:
     def _check_guest_account(self):
         from src.utils.helpers import run_command
         try:
-            res = run_command(["net", "user", "Guest"])
+            res = run_command(["net", "user", "Guest"], timeout=self.check_timeout)
             if "Account active" in res.stdout and "Yes" in res.stdout:
                 return "Guest Account is Enabled", "High", "disable_guest"
             return "Guest Account is Disabled", "Low", None
@@ -224,14 +282,13 @@ class SecurityScanner:
             return "Could not check Guest account", "Low", None
 
     def _check_open_ports(self):
-        from src.utils.helpers import run_command
         try:
             ps_cmd = (
                 "Get-NetTCPConnection -State Listen | "
                 "Where-Object { $_.LocalAddress -eq '0.0.0.0' } | "
                 "Select-Object -ExpandProperty LocalPort | Sort-Object -Unique"
             )
-            res = run_command(["powershell", "-NoProfile", "-Command", ps_cmd])
+            res = run_powershell(ps_cmd, timeout=self.check_timeout)
             ports = [p.strip() for p in res.stdout.strip().splitlines() if p.strip()]
             risky = [p for p in ports if p in ["23", "21", "3389", "5900", "4444", "1433", "3306"]]
             if risky:
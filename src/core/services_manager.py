@@ -1,6 +1,7 @@
 import sys
 import logging
 from src.utils.helpers import run_command
+from src.utils.powershell_host import run_powershell
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +18,7 @@ class ServicesManager:
     def get_services():
         """List all services and their status."""
         if sys.platform == "win32":
-            cmd = ["powershell", "-Command", "Get-Service | Select-Object Name, DisplayName, Status, StartType | ConvertTo-Json"]
-            proc = run_command(cmd)
+            proc = run_powershell("Get-Service | Select-Object Name, DisplayName, Status, StartType | ConvertTo-Json")
             import json
             try:
                 services = json.loads(proc.stdout)
@@ -38,13 +38,13 @@ class ServicesManager:
         """Action: start, stop, enable, disable."""
         if sys.platform == "win32":
             cmd_map = {
-                "start": ["powershell", "-Command", f"Start-Service -Name {name}"],
-                "stop": ["powershell", "-Command", f"Stop-Service -Name {name}"],
-                "enable": ["powershell", "-Command", f"Set-Service -Name {name} -StartupType Automatic"],
-                "disable": ["powershell", "-Command", f"Set-Service -Name {name} -StartupType Disabled"]
+                "start": f"Start-Service -Name {name}",
+                "stop": f"Stop-Service -Name {name}",
+                "enable": f"Set-Service -Name {name} -StartupType Automatic",
+                "disable": f"Set-Service -Name {name} -StartupType Disabled"
             }
             if action in cmd_map:
-                proc = run_command(cmd_map[action])
+                proc = run_powershell(cmd_map[action])
                 return proc.returncode == 0, proc.stdout if proc.returncode == 0 else proc.stderr
         elif sys.platform == "linux":
             proc = run_command(["sudo", "systemctl", action, name])
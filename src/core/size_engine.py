@@ -0,0 +1,209 @@
+import os
+import stat
+import time
+import logging
+import heapq
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def default_workers():
+    """Directory listing is I/O bound, so use a few threads per core."""
+    return min(16, (os.cpu_count() or 4) * 2)
+
+
+class DirSizeScan:
+    """Parallel, resumable directory walk built on os.scandir.
+
+    Subdirectories are pushed onto a shared work queue and pulled by a pool
+    of worker threads, so large trees are spread across the pool instead of
+    being walked depth-first by a single thread.  File sizes come from
+    DirEntry.stat(), which on Windows is served from the directory listing
+    itself and costs no extra system call.
+
+    Calling cancel() stops the workers after the directory they are
+    currently listing; the directories not yet visited stay in ``pending``
+    and a later run() picks up where the scan stopped.
+    """
+
+    def __init__(self, roots, workers=None, on_file=None, cancel_event=None):
+        if isinstance(roots, (str, os.PathLike)):
+            roots = [roots]
+        self.pending = deque(os.fspath(r) for r in roots)
+        self.workers = workers or default_workers()
+        self.on_file = on_file  # called from worker threads as on_file(path, stat_result)
+        self.total_bytes = 0
+        self.file_count = 0
+        self.dir_count = 0
+        self.error_count = 0
+        self._cancel = cancel_event or threading.Event()
+        self._cond = threading.Condition()
+        self._active = 0
+
+    # ── state ────────────────────────────────────────────────────────────
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        with self._cond:
+            return not self.pending and self._active == 0
+
+    def cancel(self):
+        self._cancel.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def snapshot(self):
+        """Return the partial totals gathered so far."""
+        with self._cond:
+            return {
+                "bytes": self.total_bytes,
+                "files": self.file_count,
+                "dirs": self.dir_count,
+                "errors": self.error_count,
+                "pending": len(self.pending),
+            }
+
+    # ── running ──────────────────────────────────────────────────────────
+    def run(self, progress_callback=None, interval=0.25):
+        """Scan until finished or cancelled and return the total size in bytes.
+
+        progress_callback, if given, receives snapshot() dicts roughly every
+        ``interval`` seconds while the scan is running.
+        """
+        for snap in self.iter_progress(interval):
+            if progress_callback:
+                progress_callback(snap)
+        return self.total_bytes
+
+    def iter_progress(self, interval=0.25):
+        """Run the scan in the background, yielding partial totals as it goes.
+
+        The final snapshot is always yielded once all workers have stopped.
+        """
+        if self.cancelled:
+            # A previous run was cancelled; resuming clears the flag.
+            self._cancel.clear()
+        threads = [
+            threading.Thread(target=self._worker, daemon=True)
+            for _ in range(max(1, self.workers))
+        ]
+        for t in threads:
+            t.start()
+        try:
+            while any(t.is_alive() for t in threads):
+                threads[0].join(interval)
+                if any(t.is_alive() for t in threads):
+                    yield self.snapshot()
+        finally:
+            # If the consumer abandons the generator, stop the pool with it.
+            if any(t.is_alive() for t in threads):
+                self.cancel()
+                for t in threads:
+                    t.join()
+        yield self.snapshot()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self.pending and self._active and not self._cancel.is_set():
+                    self._cond.wait()
+                if self._cancel.is_set() or not self.pending:
+                    self._cond.notify_all()
+                    return
+                path = self.pending.pop()
+                self._active += 1
+            subdirs, size, files, errors = self._scan_dir(path)
+            # Publish children and drop the active count in one step so idle
+            # workers never see an empty queue with nothing in flight early.
+            with self._cond:
+                self._active -= 1
+                self.pending.extend(subdirs)
+                self.total_bytes += size
+                self.file_count += files
+                self.dir_count += 1
+                self.error_count += errors
+                self._cond.notify_all()
+
+    def _scan_dir(self, path):
+        subdirs = []
+        size = 0
+        files = 0
+        errors = 0
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Junctions look like plain directories on Windows
+                            # and can loop back into the tree; skip them.
+                            if getattr(entry, "is_junction", None) and entry.is_junction():
+                                continue
+                            subdirs.append(entry.path)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                        if not stat.S_ISREG(st.st_mode):
+                            continue
+                        size += st.st_size
+                        files += 1
+                        if self.on_file:
+                            self.on_file(entry.path, st)
+                    except OSError:
+                        errors += 1
+                    except Exception as e:
+                        logger.error(f"Size scan callback failed for {entry.path}: {e}")
+                        errors += 1
+        except OSError as e:
+            logger.debug(f"Cannot list {path}: {e}")
+            errors += 1
+        return subdirs, size, files, errors
+
+
+class LargestFiles:
+    """Thread-safe bounded min-heap keeping only the ``limit`` largest files.
+
+    Pass add() as a DirSizeScan on_file callback.  Memory stays at ``limit``
+    entries however many files the scan visits.
+    """
+
+    def __init__(self, limit=100, min_size=0):
+        self.limit = limit
+        self.min_size = min_size
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def add(self, path, st):
+        size = st.st_size
+        if size <= self.min_size:
+            return
+        with self._lock:
+            if len(self._heap) < self.limit:
+                heapq.heappush(self._heap, (size, path))
+            elif size > self._heap[0][0]:
+                heapq.heapreplace(self._heap, (size, path))
+                # Everything smaller than the heap floor can be skipped unlocked.
+                self.min_size = max(self.min_size, self._heap[0][0])
+
+    def results(self):
+        """Return (path, size) tuples, largest first."""
+        with self._lock:
+            ordered = sorted(self._heap, reverse=True)
+        return [(path, size) for size, path in ordered]
+
+
+def get_dir_size(path, workers=None, cancel_event=None, progress_callback=None):
+    """Convenience wrapper returning the total size of all files under path."""
+    if not os.path.isdir(path):
+        return 0
+    scan = DirSizeScan(path, workers=workers, cancel_event=cancel_event)
+    started = time.perf_counter()
+    total = scan.run(progress_callback)
+    logger.debug(
+        f"Sized {path}: {total} bytes in {scan.file_count} files "
+        f"({time.perf_counter() - started:.2f}s)"
+    )
+    return total
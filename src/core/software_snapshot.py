@@ -0,0 +1,288 @@
+import os
+import sys
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+_UNINSTALL_KEYS = (
+    r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
+    r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall",
+)
+
+# Width of the word-start keys in the name index; shorter queries fall back to a scan.
+_TOKEN_KEY_LEN = 4
+
+
+def program_roots():
+    """The directories Windows installers normally drop applications into."""
+    roots = [
+        os.environ.get('ProgramFiles', 'C:\\Program Files'),
+        os.environ.get('ProgramFiles(x86)', 'C:\\Program Files (x86)'),
+        os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Programs'),
+    ]
+    seen = []
+    for root in roots:
+        if root and root not in seen:
+            seen.append(root)
+    return seen
+
+
+def _word_starts(text):
+    """Yield every index in ``text`` where a space-separated word begins."""
+    for i, ch in enumerate(text):
+        if ch != " " and (i == 0 or text[i - 1] == " "):
+            yield i
+
+
+class SoftwareSnapshot:
+    """Point-in-time view of installed software, indexed for O(1) lookups.
+
+    Built once per refresh from the executables on PATH plus, on Windows,
+    the winget list, the uninstall registry entries and a one-level listing
+    of the program roots, or on Linux the flatpak/snap/dpkg package lists.
+    Every lookup afterwards is a dict or set probe; only path_changed()
+    touches the filesystem again, to stat the PATH directories.
+    """
+
+    def __init__(self):
+        self.winget = {}          # lowercase name or id -> winget id
+        self.registry_names = set()
+        self.program_files = {}   # lowercase file name -> full path, one level under each program root
+        self.path_commands = {}   # file name (lowercase on Windows) -> full path, first PATH match wins
+        self.path_exts = [".exe"]
+        self.path_dirs = {}       # PATH directory -> mtime_ns when it was listed
+        self.path_env = None
+        self.packages = set()     # lowercase flatpak/snap/dpkg package names (Linux)
+        self._name_tokens = {}    # word-start prefix -> names containing a word with that prefix
+        self.built_at = 0.0
+
+    @classmethod
+    def build(cls, winget=None):
+        """Collect a fresh snapshot; ``winget`` is a name/id -> id mapping from `winget list`."""
+        snap = cls()
+        started = time.perf_counter()
+        snap.winget = dict(winget or {})
+        snap._index_path()
+        if sys.platform == 'win32':
+            snap.registry_names = cls._read_uninstall_names()
+            for root in program_roots():
+                snap._index_program_root(root)
+        elif sys.platform.startswith('linux'):
+            snap.packages = snap._read_linux_packages()
+        snap._build_token_index()
+        snap.built_at = time.time()
+        logger.info(
+            f"Software snapshot: {len(snap.winget)} winget keys, {len(snap.registry_names)} registry entries, "
+            f"{len(snap.program_files)} program files, {len(snap.packages)} packages, "
+            f"{len(snap.path_commands)} PATH commands "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return snap
+
+    def refreshed(self):
+        """Rebuild everything except the winget list, which is slow to fetch."""
+        return SoftwareSnapshot.build(winget=self.winget)
+
+    def path_changed(self):
+        """True when $PATH or any directory on it changed since the snapshot was built."""
+        if os.environ.get("PATH", "") != self.path_env:
+            return True
+        for directory, mtime in self.path_dirs.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                if mtime is not None:
+                    return True
+        return False
+
+    def with_fresh_path(self):
+        """Copy of this snapshot with only the PATH index rebuilt."""
+        snap = SoftwareSnapshot()
+        snap.__dict__.update(self.__dict__)
+        snap.path_commands = {}
+        snap.path_dirs = {}
+        snap._index_path()
+        return snap
+
+    @staticmethod
+    def _read_uninstall_names():
+        names = set()
+        try:
+            import winreg
+        except ImportError:
+            return names
+        for hive in (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER):
+            for key_path in _UNINSTALL_KEYS:
+                try:
+                    key = winreg.OpenKey(hive, key_path)
+                except OSError:
+                    continue
+                with key:
+                    index = 0
+                    while True:
+                        try:
+                            sub_name = winreg.EnumKey(key, index)
+                        except OSError:
+                            break
+                        index += 1
+                        try:
+                            with winreg.OpenKey(key, sub_name) as sub:
+                                display, _ = winreg.QueryValueEx(sub, "DisplayName")
+                        except OSError:
+                            continue
+                        if isinstance(display, str) and display.strip():
+                            names.add(display.strip().lower())
+        return names
+
+    def _index_program_root(self, root):
+        """Index files directly in ``root`` and in each of its immediate subfolders."""
+        try:
+            entries = list(os.scandir(root))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    with os.scandir(entry.path) as inner:
+                        for f in inner:
+                            if f.is_file():
+                                self.program_files.setdefault(f.name.lower(), f.path)
+                elif entry.is_file():
+                    self.program_files.setdefault(entry.name.lower(), entry.path)
+            except OSError:
+                continue
+
+    def _index_path(self):
+        if sys.platform == 'win32':
+            self.path_exts = [e.lower() for e in os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").split(";") if e]
+        else:
+            self.path_exts = [""]
+        self.path_env = os.environ.get("PATH", "")
+        for directory in self.path_env.split(os.pathsep):
+            if not directory or directory in self.path_dirs:
+                continue
+            try:
+                # Taken before listing, so a change during the listing still looks stale later.
+                self.path_dirs[directory] = os.stat(directory).st_mtime_ns
+            except OSError:
+                self.path_dirs[directory] = None
+                continue
+            try:
+                with os.scandir(directory) as it:
+                    for f in it:
+                        try:
+                            if not f.is_file():
+                                continue
+                            if sys.platform != 'win32' and not os.access(f.path, os.X_OK):
+                                continue
+                        except OSError:
+                            continue
+                        key = f.name if sys.platform != 'win32' else f.name.lower()
+                        self.path_commands.setdefault(key, f.path)
+            except OSError:
+                continue
+
+    def _read_linux_packages(self):
+        """Installed flatpak apps, snaps and dpkg packages, each listed with one command."""
+        from concurrent.futures import ThreadPoolExecutor
+        from src.utils.helpers import run_command
+
+        queries = {
+            "dpkg-query": (["dpkg-query", "-W", "-f", "${Package}\t${Status}\n"], self._parse_dpkg),
+            "flatpak": (["flatpak", "list", "--app", "--columns=application,name"], self._parse_flatpak),
+            "snap": (["snap", "list"], self._parse_snap),
+        }
+        queries = {tool: q for tool, q in queries.items() if self.find_command(tool)}
+        packages = set()
+        if not queries:
+            return packages
+
+        def query(item):
+            tool, (cmd, parse) = item
+            try:
+                proc = run_command(cmd, timeout=30)
+                return parse(proc.stdout) if proc.returncode == 0 else set()
+            except Exception as e:
+                logger.debug(f"Listing {tool} packages failed: {e}")
+                return set()
+
+        with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+            for names in pool.map(query, queries.items()):
+                packages |= names
+        return packages
+
+    @staticmethod
+    def _parse_dpkg(output):
+        names = set()
+        for line in output.splitlines():
+            name, _, status = line.partition("\t")
+            if status.endswith(" installed"):
+                names.add(name.strip().lower())
+        return names
+
+    @staticmethod
+    def _parse_flatpak(output):
+        names = set()
+        for line in output.splitlines():
+            app_id, _, name = line.partition("\t")
+            app_id = app_id.strip().lower()
+            if not app_id:
+                continue
+            names.add(app_id)
+            names.add(app_id.rsplit(".", 1)[-1])  # org.mozilla.firefox -> firefox
+            if name.strip():
+                names.add(name.strip().lower())
+        return names
+
+    @staticmethod
+    def _parse_snap(output):
+        names = set()
+        for line in output.splitlines()[1:]:  # skip the header row
+            fields = line.split()
+            if fields:
+                names.add(fields[0].lower())
+        return names
+
+    def _build_token_index(self):
+        index = {}
+        for name in list(self.winget) + list(self.registry_names):
+            for i in _word_starts(name):
+                index.setdefault(name[i:i + _TOKEN_KEY_LEN], set()).add(name)
+        self._name_tokens = index
+
+    # ── lookups ──────────────────────────────────────────────────────────
+    def find_command(self, name):
+        """Resolve a command name the way Get-Command / `which` would, or return None."""
+        key = name if sys.platform != 'win32' else name.lower()
+        if key in self.path_commands:
+            return self.path_commands[key]
+        if not os.path.splitext(key)[1]:
+            for ext in self.path_exts:
+                if key + ext in self.path_commands:
+                    return self.path_commands[key + ext]
+        return None
+
+    def find_program_file(self, name):
+        """Path of a file named ``name`` one level under a program root, or None."""
+        return self.program_files.get(name.lower())
+
+    def has_package(self, name):
+        return name.lower() in self.packages
+
+    def winget_id(self, key):
+        return self.winget.get(key.lower())
+
+    def has_registry_name(self, name):
+        return name.lower() in self.registry_names
+
+    def names_with_word(self, text):
+        """Installed names (winget or registry) that contain ``text`` starting at a word boundary."""
+        text = text.lower()
+        if len(text) >= _TOKEN_KEY_LEN:
+            candidates = self._name_tokens.get(text[:_TOKEN_KEY_LEN], ())
+        else:
+            candidates = list(self.winget) + list(self.registry_names)
+        needle = f" {text}"
+        return [name for name in candidates if needle in f" {name}"]
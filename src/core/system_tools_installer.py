@@ -1,16 +1,22 @@
 import os
 import sys
 import subprocess
-import json
 import logging
 import re
+import threading
 from enum import Enum
 from src.utils.helpers import get_resource_path
+from src.utils.powershell_host import run_powershell
+from src.core.software_snapshot import SoftwareSnapshot
+from src.core.catalog_index import LazyCatalog, load_index
 
 CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
 
 logger = logging.getLogger(__name__)
 
+# `Get-Command <name> -ErrorAction SilentlyContinue`, the catalog's usual check
+_GET_COMMAND_RE = re.compile(r"^Get-Command\s+(.+?)\s+-ErrorAction\s+SilentlyContinue$", re.IGNORECASE)
+
 class ToolCategory(Enum):
     BROWSERS = "Browsers"
     COMMUNICATIONS = "Communications"
@@ -31,9 +37,13 @@ class ToolCategory(Enum):
     HARDWARE_TOOLS = "Hardware Tools"
 
 class SystemTool:
+    __slots__ = ("id", "name", "description", "category", "install_commands", "check_command",
+                 "requires_admin", "requires_restart", "post_install_message", "executable_name",
+                 "is_installed", "winget_id", "detected_winget_id")
+
     def __init__(self, tool_id, name, description, category, install_commands, 
                  check_command, requires_admin=False, requires_restart=False, 
-                 post_install_message="", executable_name=None):
+                 post_install_message="", executable_name=None, winget_id=None):
         self.id = tool_id
         self.name = name
         self.description = description
@@ -45,212 +55,197 @@ class SystemTool:
         self.post_install_message = post_install_message
         self.executable_name = executable_name
         self.is_installed = False
-        self.winget_id = self._extract_winget_id()
+        self.winget_id = winget_id or extract_winget_id(install_commands)
         self.detected_winget_id = None
 
-    def _extract_winget_id(self):
-        for cmd in self.install_commands:
-            if "winget" in cmd.lower() and "--id" in cmd:
-                match = re.search(r'--id\s+([^\s]+)', cmd)
-                if match:
-                    return match.group(1)
-        return None
+
+def extract_winget_id(install_commands):
+    for cmd in install_commands:
+        if "winget" in cmd.lower() and "--id" in cmd:
+            match = re.search(r'--id\s+([^\s]+)', cmd)
+            if match:
+                return match.group(1)
+    return None
+
+
+def prepare_tool_entry(entry):
+    """Catalog compile step: resolve the winget id once instead of on every load."""
+    entry = dict(entry)
+    entry["winget_id"] = extract_winget_id(entry.get("install_commands", []))
+    return entry
+
+
+CATEGORY_MAP = {
+    "Browsers": ToolCategory.BROWSERS,
+    "Communications": ToolCategory.COMMUNICATIONS,
+    "Development": ToolCategory.DEVELOPMENT,
+    "Games": ToolCategory.GAMES,
+    "Microsoft Tools": ToolCategory.MS_TOOLS,
+    "Multimedia Tools": ToolCategory.MULTIMEDIA,
+    "Pro Tools": ToolCategory.PRO_TOOLS,
+    "Selfhosted Tools": ToolCategory.SELFHOSTED,
+    "Utilities": ToolCategory.UTILITIES,
+    "Ghosty Tools": ToolCategory.GHOSTY_TOOLS,
+    "Development Environment": ToolCategory.DEV_ENV,
+    "Development Tools": ToolCategory.DEV_TOOLS,
+    "Terminal & Shell": ToolCategory.TERMINAL,
+    "Package Managers": ToolCategory.PACKAGE_MGR,
+    "Essential Utilities": ToolCategory.ESSENTIAL_UTILS,
+    "Hardware Tools": ToolCategory.HARDWARE_TOOLS
+}
+
+
+def _tool_from_entry(tool_data):
+    return SystemTool(
+        tool_id=tool_data["id"],
+        name=tool_data["name"],
+        description=tool_data["description"],
+        category=CATEGORY_MAP.get(tool_data["category"], ToolCategory.DEV_TOOLS),
+        install_commands=tool_data["install_commands"],
+        check_command=tool_data["check_command"],
+        requires_admin=tool_data.get("requires_admin", False),
+        requires_restart=tool_data.get("requires_restart", False),
+        post_install_message=tool_data.get("post_install_message", ""),
+        executable_name=tool_data.get("executable_name"),
+        winget_id=tool_data.get("winget_id")
+    )
 
 class SystemToolsInstaller:
     def __init__(self, config_path=None):
         self.tools = {}
         self._winget_installed_cache = {}
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
         if config_path is None:
             config_path = get_resource_path(os.path.join("config", "system_tools.json"))
         self.config_path = config_path
         self._load_config()
 
     def _load_config(self):
+        """Open the compiled catalog; SystemTool objects are built per category on first use."""
         try:
             if not os.path.exists(self.config_path): return
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            cat_map = {
-                "Browsers": ToolCategory.BROWSERS,
-                "Communications": ToolCategory.COMMUNICATIONS,
-                "Development": ToolCategory.DEVELOPMENT,
-                "Games": ToolCategory.GAMES,
-                "Microsoft Tools": ToolCategory.MS_TOOLS,
-                "Multimedia Tools": ToolCategory.MULTIMEDIA,
-                "Pro Tools": ToolCategory.PRO_TOOLS,
-                "Selfhosted Tools": ToolCategory.SELFHOSTED,
-                "Utilities": ToolCategory.UTILITIES,
-                "Ghosty Tools": ToolCategory.GHOSTY_TOOLS,
-                "Development Environment": ToolCategory.DEV_ENV,
-                "Development Tools": ToolCategory.DEV_TOOLS,
-                "Terminal & Shell": ToolCategory.TERMINAL,
-                "Package Managers": ToolCategory.PACKAGE_MGR,
-                "Essential Utilities": ToolCategory.ESSENTIAL_UTILS,
-                "Hardware Tools": ToolCategory.HARDWARE_TOOLS
-            }
-            
-            for tool_data in config.get("tools", []):
-                tool = SystemTool(
-                    tool_id=tool_data["id"],
-                    name=tool_data["name"],
-                    description=tool_data["description"],
-                    category=cat_map.get(tool_data["category"], ToolCategory.DEV_TOOLS),
-                    install_commands=tool_data["install_commands"],
-                    check_command=tool_data["check_command"],
-                    requires_admin=tool_data.get("requires_admin", False),
-                    requires_restart=tool_data.get("requires_restart", False),
-                    post_install_message=tool_data.get("post_install_message", ""),
-                    executable_name=tool_data.get("executable_name")
-                )
-                self.tools[tool.id] = tool
+            self.tools = LazyCatalog(load_index(self.config_path, prepare_tool_entry), _tool_from_entry)
         except Exception as e:
             logger.error(f"Failed to load system tools config: {e}")
 
-    def check_tool_status(self, tool):
+    def summaries(self):
+        """(id, name, description, category) per tool, without building the SystemTool objects."""
+        if not isinstance(self.tools, LazyCatalog):
+            return [(t.id, t.name, t.description, t.category) for t in self.tools.values()]
+        return [(tool_id, name, description, CATEGORY_MAP.get(category, ToolCategory.DEV_TOOLS))
+                for tool_id, name, description, category, _ in self.tools.summaries()]
+
+    def check_tool_status(self, tool, refresh=False):
+        """Detect whether ``tool`` is installed.
+
+        Checks are answered from the cached SoftwareSnapshot, whose PATH
+        index is rebuilt when a PATH directory changes; pass ``refresh`` to
+        rebuild all of it first (e.g. right after an install).
+        """
         tool.detected_winget_id = None
         if sys.platform != 'win32':
             try:
-                # On Linux, try 'which' or 'command -v'
-                exec_name = tool.executable_name or tool.name.lower().replace(" ", "-")
-                if exec_name.endswith(".exe"): exec_name = exec_name[:-4]
-                
-                from src.utils.helpers import run_command
-                res = run_command(["which", exec_name])
-                if res.returncode == 0:
-                    tool.is_installed = True
-                    return True
-                
-                # Check for common linux names
-                for alt in [tool.name.lower(), tool.name.lower().replace(" ", "")]:
-                    if run_command(["which", alt]).returncode == 0:
-                        tool.is_installed = True
-                        return True
-            except: pass
-            
-            tool.is_installed = False
-            return False
-        from src.utils.helpers import run_command
+                tool.is_installed = self._check_posix(tool, self._get_snapshot(refresh=refresh))
+            except Exception as e:
+                logger.error(f"Failed to check status for tool '{getattr(tool, 'name', tool)}': {e}")
+                tool.is_installed = False
+            return tool.is_installed
         try:
-            # 1. Try defined check_command
-            # Optimization: If it's a winget check, use the cache
-            if "winget" in tool.check_command.lower() and tool.winget_id:
-                # Try finding by ID first
-                if tool.winget_id.lower() in self._winget_installed_cache:
-                    tool.detected_winget_id = self._winget_installed_cache[tool.winget_id.lower()]
-                    tool.is_installed = True
-                    return True
-                # Fallback to finding by tool name in cache
-                if tool.name.lower() in self._winget_installed_cache:
-                    tool.detected_winget_id = self._winget_installed_cache[tool.name.lower()]
-                    tool.is_installed = True
+            snapshot = self._get_snapshot(refresh=refresh)
+            tool.is_installed = self._check_windows(tool, snapshot)
+            return tool.is_installed
+        except Exception as e:
+            logger.error(f"Failed to check status for tool '{getattr(tool, 'name', tool)}': {e}")
+            return False
+
+    def _get_snapshot(self, refresh=False):
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                self._snapshot = SoftwareSnapshot.build(winget=self._winget_installed_cache)
+            elif refresh:
+                self._snapshot = self._snapshot.refreshed()
+            elif self._snapshot.path_changed():
+                self._snapshot = self._snapshot.with_fresh_path()
+            return self._snapshot
+
+    def _check_posix(self, tool, snapshot):
+        exec_name = tool.executable_name or tool.name.lower().replace(" ", "-")
+        if exec_name.endswith(".exe"): exec_name = exec_name[:-4]
+        # The executable name, then common Linux spellings of the tool name
+        candidates = [exec_name, tool.name.lower(), tool.name.lower().replace(" ", "")]
+        if any(snapshot.find_command(name) for name in candidates):
+            return True
+        candidates.append(tool.name.lower().replace(" ", "-"))
+        return any(snapshot.has_package(name) for name in candidates)
+
+    def _check_windows(self, tool, snapshot):
+        low_name = tool.name.lower()
+
+        # 1. The catalog check_command.  Get-Command checks are PATH lookups and
+        # winget checks are list lookups, both answered from the snapshot;
+        # anything else still runs in PowerShell.
+        command_match = _GET_COMMAND_RE.match(tool.check_command.strip())
+        if command_match:
+            if snapshot.find_command(command_match.group(1)):
+                return True
+        elif "winget" in tool.check_command.lower() and tool.winget_id:
+            for key in (tool.winget_id, low_name):
+                found = snapshot.winget_id(key)
+                if found:
+                    tool.detected_winget_id = found
                     return True
-                
-                # If it's explicitly a winget check and NOT in cache, we can skip the slow process call
-                if "winget list --id" in tool.check_command:
-                    # Fall through to step 3 (file check) as winget might not have it but it might still be there
-                    pass
-                else:
-                    ps_cmd = ["powershell.exe", "-NoProfile", "-NonInteractive", "-Command", tool.check_command]
-                    result = run_command(ps_cmd, timeout=30)
-                    if result.returncode == 0:
-                        tool.is_installed = True
-                        return True
-            else:
-                ps_cmd = ["powershell.exe", "-NoProfile", "-NonInteractive", "-Command", tool.check_command]
-                result = run_command(ps_cmd, timeout=30)
-                if result.returncode == 0:
-                    tool.is_installed = True
+            # A `winget list --id` miss is already answered by the cached list;
+            # fall through to the file checks in case winget does not track it.
+            if "winget list --id" not in tool.check_command:
+                if run_powershell(tool.check_command, timeout=30).returncode == 0:
                     return True
+        elif run_powershell(tool.check_command, timeout=30).returncode == 0:
+            return True
 
-            # 2. Try winget list if ID is available (use cache)
-            if tool.winget_id:
-                low_id = tool.winget_id.lower()
-                low_name = tool.name.lower()
-                
-                # Check ID directly
-                if low_id in self._winget_installed_cache:
-                    tool.detected_winget_id = self._winget_installed_cache[low_id]
-                    tool.is_installed = True
+        # 2. Installed-package names: winget list and the uninstall registry.
+        if snapshot.has_registry_name(low_name):
+            return True
+        if tool.winget_id:
+            # Try the ID, the name and common variations (e.g. "Teams" -> "Microsoft Teams")
+            keys = [tool.winget_id, low_name, f"microsoft {low_name}", f"google {low_name}",
+                    f"mozilla {low_name}", f"{low_name} desktop", f"{low_name} client"]
+            for key in keys:
+                found = snapshot.winget_id(key)
+                if found:
+                    tool.detected_winget_id = found
                     return True
-                
-                # Check Name directly
-                if low_name in self._winget_installed_cache:
-                    tool.detected_winget_id = self._winget_installed_cache[low_name]
-                    tool.is_installed = True
+                if snapshot.has_registry_name(key):
                     return True
-                
-                # Try common variations (e.g. "Teams" -> "Microsoft Teams")
-                variations = [
-                    f"microsoft {low_name}",
-                    f"google {low_name}",
-                    f"mozilla {low_name}",
-                    f"{low_name} desktop",
-                    f"{low_name} client"
-                ]
-                for var in variations:
-                    if var in self._winget_installed_cache:
-                        tool.detected_winget_id = self._winget_installed_cache[var]
-                        tool.is_installed = True
-                        return True
-                
-                # Last resort: substring match if tool.name is long enough
-                if len(low_name) >= 4:
-                    for cache_key, actual_id in self._winget_installed_cache.items():
-                        if low_name in cache_key:
-                            # Verify it's not a different tool (e.g. "Teams" matching "TeamSpeak")
-                            # We check if it's a word boundary or a common prefix
-                            if f" {low_name}" in f" {cache_key}":
-                                tool.detected_winget_id = actual_id
-                                tool.is_installed = True
-                                return True
-
-            # 3. Try searching common paths if executable name is known
-            lookup_names = []
-            if tool.executable_name:
-                lookup_names.append(tool.executable_name)
-            
-            # Fallback names based on tool name
-            lookup_names.append(f"{tool.name}.exe")
-            lookup_names.append(tool.name)
 
-            common_roots = [
-                os.environ.get('ProgramFiles', 'C:\\Program Files'),
-                os.environ.get('ProgramFiles(x86)', 'C:\\Program Files (x86)'),
-                os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Programs')
-            ]
+            # Last resort: an installed name containing the tool name at a word start
+            if len(low_name) >= 4:
+                for name in snapshot.names_with_word(low_name):
+                    found = snapshot.winget_id(name)
+                    if found:
+                        tool.detected_winget_id = found
+                    return True
 
-            for root in common_roots:
-                if not os.path.exists(root): continue
-                for name in lookup_names:
-                    if not name.lower().endswith(".exe") and "." not in name:
-                        name = f"{name}.exe"
-                    
-                    # Search ToolName folder first
-                    potential_dir = os.path.join(root, tool.name)
-                    if os.path.exists(os.path.join(potential_dir, name)):
-                        tool.is_installed = True
-                        return True
-                    
-                    # Then search all folders in root (one level deep)
-                    try:
-                        for item in os.listdir(root):
-                            item_path = os.path.join(root, item)
-                            if os.path.isdir(item_path):
-                                if os.path.exists(os.path.join(item_path, name)):
-                                    tool.is_installed = True
-                                    return True
-                    except: continue
-
-            tool.is_installed = False
-            return False
-        except Exception as e:
-            logger.error(f"Failed to check status for tool '{getattr(tool, 'name', tool)}': {e}")
-            return False
+        # 3. Executables one level under the program roots
+        lookup_names = []
+        if tool.executable_name:
+            lookup_names.append(tool.executable_name)
+        lookup_names.append(f"{tool.name}.exe")
+        lookup_names.append(tool.name)
+        for name in lookup_names:
+            if not name.lower().endswith(".exe") and "." not in name:
+                name = f"{name}.exe"
+            if snapshot.find_program_file(name):
+                return True
+        return False
 
     def refresh_installed_cache(self):
-        """Pre-fetch all installed winget app IDs to avoid repeated slow calls."""
-        if sys.platform != 'win32': return
+        """Fetch the winget list once and rebuild the installed-software snapshot."""
+        if sys.platform != 'win32':
+            snapshot = SoftwareSnapshot.build()
+            with self._snapshot_lock:
+                self._snapshot = snapshot
+            return
         
         from src.utils.helpers import run_command
         try:
@@ -265,6 +260,10 @@ class SystemToolsInstaller:
             logger.error(f"Error refreshing winget cache: {e}")
             self._winget_installed_cache = {}
 
+        snapshot = SoftwareSnapshot.build(winget=self._winget_installed_cache)
+        with self._snapshot_lock:
+            self._snapshot = snapshot
+
     def _parse_winget_ids(self, output):
         """Extract mapping of Name/ID -> Actual ID from winget list output."""
         mapping = {}
@@ -1,13 +1,16 @@
-import requests
 import logging
 import os
 import sys
 import json
 import subprocess
 import shutil
+import time
+import threading
+from concurrent.futures import Future
 from datetime import datetime
 from PyQt6.QtCore import QThread, pyqtSignal
 from src.utils.helpers import get_config_dir, get_resource_path, get_logs_dir
+from src.utils.http_client import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -22,20 +25,107 @@ except Exception as e:
     logger.error(f"Failed to load version: {e}")
 
 REPO_URL = "https://api.github.com/repos/Ghostshadowplays/Ghosty-Tools/releases/latest"
+RELEASE_FRESH_SECONDS = 600  # cached release metadata is used without asking GitHub for this long
 
 class UpdateManager:
     def __init__(self):
         self.current_version = CURRENT_VERSION
         self.config_dir = get_config_dir()
         self.version_file = os.path.join(self.config_dir, "version_info.json")
+        self.release_cache_file = os.path.join(self.config_dir, "release_cache.json")
+        self._release_lock = threading.Lock()
+        self._release_inflight = None
+
+    # ── release metadata cache ───────────────────────────────────────────
+    def _load_release_cache(self):
+        try:
+            with open(self.release_cache_file, "r") as f:
+                cache = json.load(f)
+            if isinstance(cache, dict) and "data" in cache:
+                return cache
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _save_release_cache(self, cache):
+        try:
+            tmp = self.release_cache_file + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp, self.release_cache_file)
+        except OSError as e:
+            logger.error(f"Failed to save release cache: {e}")
+
+    def fetch_release(self, force=False):
+        """Latest release JSON, shared by every caller.
+
+        Metadata younger than RELEASE_FRESH_SECONDS is returned from the
+        config dir without touching the network (force=True skips that).
+        Otherwise one conditional request (If-None-Match/If-Modified-Since)
+        revalidates it; concurrent callers wait for that same request
+        instead of issuing their own.  Falls back to the cached copy when
+        GitHub is unreachable; returns None if there is nothing at all.
+        """
+        with self._release_lock:
+            inflight = self._release_inflight
+            if inflight is None:
+                inflight = self._release_inflight = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return inflight.result()
 
-    def check_for_updates(self):
-        """Checks GitHub API for the latest release."""
         try:
-            headers = {'User-Agent': 'GhostyTools/1.0'}
-            response = requests.get(REPO_URL, timeout=10, headers=headers)
+            data = self._fetch_release(force)
+        except Exception as e:
+            logger.error(f"Failed to fetch release info: {e}")
+            data = None
+        finally:
+            with self._release_lock:
+                self._release_inflight = None
+        inflight.set_result(data)
+        return data
+
+    def _fetch_release(self, force):
+        cache = self._load_release_cache()
+        if cache and not force and time.time() - cache.get("fetched_at", 0) < RELEASE_FRESH_SECONDS:
+            return cache["data"]
+
+        headers = {'User-Agent': 'GhostyTools/1.0'}
+        if cache:
+            if cache.get("etag"):
+                headers["If-None-Match"] = cache["etag"]
+            if cache.get("last_modified"):
+                headers["If-Modified-Since"] = cache["last_modified"]
+        try:
+            response = get_client().get(REPO_URL, timeout=10, headers=headers)
+            if response.status_code == 304 and cache:
+                cache["fetched_at"] = time.time()
+                self._save_release_cache(cache)
+                return cache["data"]
             response.raise_for_status()
-            data = response.json()
+        except Exception as e:
+            if cache:
+                logger.warning(f"Release check failed, using cached metadata: {e}")
+                return cache["data"]
+            raise
+
+        data = response.json()
+        self._save_release_cache({
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "data": data,
+        })
+        return data
+
+    def check_for_updates(self, force=False):
+        """Checks GitHub API for the latest release."""
+        try:
+            data = self.fetch_release(force)
+            if data is None:
+                return {"available": False}
             latest_version = data.get("tag_name", "")
             
             if latest_version and self._is_newer(latest_version, self.current_version):
@@ -126,16 +216,8 @@ class UpdateManager:
 
     def get_release_info(self, version=None):
         """Fetches info for a specific version or latest."""
-        try:
-            # For simplicity, we usually want the latest info if it matches current_version
-            headers = {'User-Agent': 'GhostyTools/1.0'}
-            response = requests.get(REPO_URL, timeout=10, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            return data
-        except Exception as e:
-            logger.error(f"Failed to fetch release info: {e}")
-            return None
+        # For simplicity, we usually want the latest info if it matches current_version
+        return self.fetch_release()
 
 class UpdateWorker(QThread):
     finished = pyqtSignal(bool, str)
@@ -164,21 +246,15 @@ class UpdateWorker(QThread):
             headers = {
                 'User-Agent': 'GhostyTools-Updater/1.0'
             }
-            response = requests.get(self.download_url, stream=True, timeout=30, headers=headers)
-            response.raise_for_status()
-            total_size = int(response.headers.get('content-length', 0))
-            
-            downloaded = 0
             # Ensure target directory exists
             os.makedirs(os.path.dirname(self.target_path), exist_ok=True)
-            
-            with open(self.target_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0:
-                            self.progress.emit(int(downloaded * 100 / total_size))
+
+            def on_chunk(downloaded, total_size):
+                if total_size > 0:
+                    self.progress.emit(int(downloaded * 100 / total_size))
+
+            get_client().download(self.download_url, self.target_path, progress=on_chunk,
+                                  timeout=30, headers=headers)
             
             self.status.emit("Download complete. Preparing to apply update...")
             self.finished.emit(True, self.target_path)
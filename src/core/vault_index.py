@@ -0,0 +1,95 @@
+from bisect import bisect_left, insort
+
+GRAM = 3  # n-gram length; shorter queries fall back to a scan of the sorted list
+
+
+def _grams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class SiteIndex:
+    """Sorted, searchable set of vault site names.
+
+    Names are kept in case-insensitive order in a list (bisect keeps
+    inserts and removals incremental) and a trigram -> names map answers
+    substring queries by intersecting the posting sets of the query's
+    trigrams.  Holds names only, never passwords.
+    """
+
+    def __init__(self, sites=()):
+        self.clear()
+        self.rebuild(sites)
+
+    def clear(self):
+        self._order = []    # [(casefolded, site)] sorted
+        self._keys = {}     # site -> casefolded
+        self._postings = {}  # trigram -> {site}
+
+    def rebuild(self, sites):
+        self.clear()
+        for site in sites:
+            key = site.casefold()
+            self._keys[site] = key
+            for gram in _grams(key):
+                self._postings.setdefault(gram, set()).add(site)
+        self._order = sorted((key, site) for site, key in self._keys.items())
+
+    def add(self, site):
+        if site in self._keys:
+            return
+        key = site.casefold()
+        self._keys[site] = key
+        insort(self._order, (key, site))
+        for gram in _grams(key):
+            self._postings.setdefault(gram, set()).add(site)
+
+    def remove(self, site):
+        key = self._keys.pop(site, None)
+        if key is None:
+            return
+        i = bisect_left(self._order, (key, site))
+        if i < len(self._order) and self._order[i] == (key, site):
+            del self._order[i]
+        for gram in _grams(key):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(site)
+                if not posting:
+                    del self._postings[gram]
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, site):
+        return site in self._keys
+
+    def all(self):
+        return [site for _, site in self._order]
+
+    def search(self, query):
+        """Sites containing ``query`` (case-insensitive), names starting with it first."""
+        q = query.strip().casefold()
+        if not q:
+            return self.all()
+        if len(q) < GRAM:
+            hits = [(key, site) for key, site in self._order if q in key]
+        else:
+            postings = sorted((self._postings.get(g, ()) for g in _grams(q)), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:]) if postings[0] else set()
+            hits = sorted((self._keys[s], s) for s in candidates if q in self._keys[s])
+        prefix = [site for key, site in hits if key.startswith(q)]
+        return prefix + [site for key, site in hits if not key.startswith(q)]
+
+    @staticmethod
+    def refine(results, query):
+        """Narrow a previous result list to ``query`` without touching the index.
+
+        Valid when ``query`` extends the query that produced ``results``,
+        which is the common case while typing.
+        """
+        q = query.strip().casefold()
+        # Same order as search(): the other matches mix the old prefix and
+        # non-prefix groups, so they are re-sorted by name.
+        hits = sorted((site.casefold(), site) for site in results if q in site.casefold())
+        prefix = [site for key, site in hits if key.startswith(q)]
+        return prefix + [site for key, site in hits if not key.startswith(q)]
@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import base64
+import logging
+import threading
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+try:
+    from cryptography.hazmat.primitives.kdf.argon2 import Argon2id
+except ImportError:  # cryptography < 44
+    Argon2id = None
+
+from src.utils.helpers import get_config_dir
+
+logger = logging.getLogger(__name__)
+
+# What vaults created before KDF parameters were stored use.
+LEGACY_PARAMS = {"name": "pbkdf2-sha256", "iterations": 390000}
+
+TARGET_SECONDS = 0.5        # aim for roughly this much work per unlock
+# Floors so calibration on a slow machine never produces weaker settings than these.
+MIN_PBKDF2_ITERATIONS = 390000
+MIN_SCRYPT_N = 2 ** 15
+MAX_SCRYPT_N = 2 ** 20      # 1 GiB with r=8
+ARGON2_MEMORY_KIB = 64 * 1024
+ARGON2_LANES = 4
+MIN_ARGON2_ITERATIONS = 2
+MAX_ARGON2_ITERATIONS = 64
+
+_CALIBRATION_FILE = "kdf_calibration.json"
+_calibration_lock = threading.Lock()
+
+
+def available_algorithms():
+    names = ["scrypt", "pbkdf2-sha256"]
+    if Argon2id is not None:
+        names.insert(0, "argon2id")
+    return names
+
+
+def derive_key(password, salt, params=None):
+    """Fernet key (urlsafe base64 of 32 bytes) for ``password`` under ``params``."""
+    params = params or LEGACY_PARAMS
+    name = params["name"]
+    if name == "pbkdf2-sha256":
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=params["iterations"])
+    elif name == "scrypt":
+        kdf = Scrypt(salt=salt, length=32, n=params["n"], r=params["r"], p=params["p"])
+    elif name == "argon2id":
+        if Argon2id is None:
+            raise ValueError("This vault uses Argon2id, which needs a newer cryptography package")
+        kdf = Argon2id(salt=salt, length=32, iterations=params["iterations"], lanes=params["lanes"],
+                       memory_cost=params["memory_kib"])
+    else:
+        raise ValueError(f"Unknown KDF: {name}")
+    return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+
+
+def _time(params, rounds=1):
+    salt = os.urandom(16)
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        derive_key("calibration", salt, params)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(name, target=TARGET_SECONDS):
+    """Pick ``name``'s cost parameters so one derivation takes about ``target`` seconds here."""
+    if name == "pbkdf2-sha256":
+        probe = {"name": name, "iterations": 50000}
+        per_iteration = _time(probe, rounds=2) / probe["iterations"]
+        return {"name": name, "iterations": max(MIN_PBKDF2_ITERATIONS, int(target / per_iteration))}
+    if name == "scrypt":
+        # Memory-hard: cost doubles with n, so step n up until the target is reached.
+        params = {"name": name, "n": MIN_SCRYPT_N, "r": 8, "p": 1}
+        while params["n"] < MAX_SCRYPT_N and _time(params) * 2 <= target:
+            params["n"] *= 2
+        return params
+    if name == "argon2id":
+        # Keep memory fixed and scale passes linearly.
+        params = {"name": name, "iterations": MIN_ARGON2_ITERATIONS, "lanes": ARGON2_LANES,
+                  "memory_kib": ARGON2_MEMORY_KIB}
+        per_pass = _time(params) / params["iterations"]
+        params["iterations"] = min(MAX_ARGON2_ITERATIONS, max(MIN_ARGON2_ITERATIONS, int(target / per_pass)))
+        return params
+    raise ValueError(f"Unknown KDF: {name}")
+
+
+def _calibration_path():
+    return os.path.join(get_config_dir(), _CALIBRATION_FILE)
+
+
+def calibrated_params(name=None, target=TARGET_SECONDS, recalibrate=False):
+    """Parameters for new vaults, benchmarked once per machine and cached in the config dir.
+
+    ``name`` defaults to the strongest available algorithm (Argon2id, then
+    scrypt).  Safe to call from a worker thread at startup so the first
+    vault creation does not pay for the benchmark.
+    """
+    name = name or available_algorithms()[0]
+    key = f"{name}@{target}"
+    path = _calibration_path()
+    with _calibration_lock:
+        cache = {}
+        try:
+            with open(path, "r") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if not recalibrate and isinstance(cache.get(key), dict):
+            return dict(cache[key])
+
+        start = time.perf_counter()
+        params = benchmark(name, target)
+        logger.info(f"Calibrated {name} for {target}s unlocks in {time.perf_counter() - start:.2f}s: {params}")
+        cache[key] = params
+        try:
+            with open(path, "w") as f:
+                json.dump(cache, f)
+        except OSError as e:
+            logger.error(f"Failed to save KDF calibration: {e}")
+        return dict(params)
+
+
+class KeySession:
+    """Holds a derived vault key for at most ``timeout`` seconds after the vault is locked.
+
+    Opt-in: with a timeout of 0 nothing is kept.  Reopening within the
+    window skips the KDF (and the password prompt); afterwards the key is
+    dropped on the next access.
+    """
+
+    def __init__(self, timeout=0):
+        self.timeout = timeout
+        self._key = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def store(self, key):
+        with self._lock:
+            if self.timeout > 0 and key:
+                self._key, self._expires = key, time.monotonic() + self.timeout
+            else:
+                self._key = None
+
+    def take(self):
+        """The stored key if it has not expired, else None.  The key stays stored until expiry."""
+        with self._lock:
+            if self._key is not None and time.monotonic() >= self._expires:
+                self._key = None
+            return self._key
+
+    def clear(self):
+        with self._lock:
+            self._key = None
+            self._expires = 0.0
+
+    @property
+    def active(self):
+        return self.take() is not None
@@ -7,6 +7,7 @@ import re
 
 import requests
 import zipfile
+from src.utils.http_client import get_client
 try:
     import winreg
 except ImportError:
@@ -265,13 +266,8 @@ class MaintenanceWorker(QThread):
             "    Write-Host \"Cleared Temp for $($_.Name)\" }"
             "}")
         if os.path.exists(r"C:\Windows.old"):
-            total = 0
-            for root, _, files in os.walk(r"C:\Windows.old"):
-                for f in files:
-                    try:
-                        total += os.path.getsize(os.path.join(root, f))
-                    except OSError:
-                        pass
+            from src.core.size_engine import get_dir_size
+            total = get_dir_size(r"C:\Windows.old")
             self.output.emit(
                 f"  WARN Windows.old detected (~{total / (1024**3):.1f} GB). "
                 "Use Disk Cleanup (cleanmgr) to safely remove it.", "warning")
@@ -603,12 +599,17 @@ class GenericCommandWorker(QThread):
 class SecurityScanWorker(QThread):
     finished = pyqtSignal(list)
     output = pyqtSignal(str, str)
+    result_ready = pyqtSignal(tuple)  # one (issue, severity, action_key) per finished check
 
     def run(self):
         try:
             self.output.emit("Starting background security scan...", "info")
             scanner = SecurityScanner()
-            issues = scanner.get_report()
+            results = {}
+            for index, entry in scanner.iter_report():
+                results[index] = entry
+                self.result_ready.emit(tuple(entry))
+            issues = [results[i] for i in sorted(results)]
             self.finished.emit(issues)
         except Exception as e:
             logger.error(f"Security Scan Error: {e}")
@@ -640,13 +641,14 @@ class BloatScanWorker(QThread):
 class UpdateCheckWorker(QThread):
     finished = pyqtSignal(dict)
     
-    def __init__(self, update_manager):
+    def __init__(self, update_manager, force=False):
         super().__init__()
         self.update_manager = update_manager
+        self.force = force
         
     def run(self):
         try:
-            res = self.update_manager.check_for_updates()
+            res = self.update_manager.check_for_updates(force=self.force)
             self.finished.emit(res)
         except Exception as e:
             logger.error(f"UpdateCheckWorker error: {e}")
@@ -672,7 +674,8 @@ class SensorWorker(QThread):
     
     def run(self):
         try:
-            r = requests.get("http://localhost:8085/data.json", timeout=2)
+            # Polled every 2 s; the pooled client keeps the connection to LHM alive, and the next poll is the retry.
+            r = get_client().get("http://localhost:8085/data.json", timeout=2, retries=0)
             data = r.json()
 
             sensors = {}
@@ -934,14 +937,12 @@ class MonitoringSetupWorker(QThread):
         # Download
         try:
             self.output.emit("Downloading LibreHardwareMonitor...", "info")
-            r = requests.get(url, timeout=10)
-            if r.status_code != 200:
-                self.finished.emit(False, f"Download failed: HTTP {r.status_code}")
+            try:
+                get_client().download(url, zip_path, timeout=10)
+            except requests.HTTPError as e:
+                self.finished.emit(False, f"Download failed: HTTP {e.response.status_code}")
                 return
 
-            with open(zip_path, "wb") as f:
-                f.write(r.content)
-
             self.output.emit("Download complete.", "success")
 
         except Exception as e:
@@ -1018,20 +1019,12 @@ class DownloadWorker(QThread):
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             }
             
-            response = requests.get(self.url, stream=True, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            with open(self.dest_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0:
-                            percent = (downloaded / total_size) * 100
-                            self.output.emit(f"{prefix}Download Progress: {percent:.1f}%", "debug")
+            def on_chunk(downloaded, total_size):
+                if total_size > 0:
+                    percent = (downloaded / total_size) * 100
+                    self.output.emit(f"{prefix}Download Progress: {percent:.1f}%", "debug")
+
+            get_client().download(self.url, self.dest_path, progress=on_chunk, headers=headers, timeout=30)
             
             self.finished.emit(True, f"Download completed: {self.dest_path}")
             
@@ -1041,23 +1034,40 @@ class DownloadWorker(QThread):
 
 class NetworkWorker(QThread):
     finished = pyqtSignal(dict)
+    port_found = pyqtSignal(dict)  # {"host", "port", "service", "banner", "cached"} as each open port is found
+    progress = pyqtSignal(int, str)
     
-    def __init__(self, task="ip", target="127.0.0.1"):
+    def __init__(self, task="ip", target="127.0.0.1", ports=None, force=False):
         super().__init__()
         self.task = task
         self.target = target
+        self.ports = ports
+        self.force = force
+        self._scanner = None
+
+    def stop(self):
+        if self._scanner:
+            self._scanner.cancel()
         
     def run(self):
         from src.core.network_tools import NetworkTools
         if self.task == "ip":
-            res = NetworkTools.get_ip_intelligence()
+            res = NetworkTools.get_ip_intelligence(force=self.force)
             self.finished.emit({"task": "ip", "data": res})
         elif self.task == "dns":
             res = NetworkTools.benchmark_dns()
             self.finished.emit({"task": "dns", "data": res})
         elif self.task == "port":
-            res = NetworkTools.port_scan(self.target)
-            self.finished.emit({"task": "port", "data": res})
+            from src.core.port_scanner import PortScanner
+            self._scanner = PortScanner()
+            try:
+                res = self._scanner.scan(self.target, self.ports,
+                                         on_open=self.port_found.emit, progress_callback=self.progress.emit)
+                data = [entry for entries in res.values() for entry in entries]
+                self.finished.emit({"task": "port", "data": data, "cancelled": self._scanner.cancelled})
+            except Exception as e:
+                logger.error(f"Port scan error: {e}")
+                self.finished.emit({"task": "port", "data": [], "error": str(e)})
 
 class TaskManagerWorker(QThread):
     finished = pyqtSignal(dict)
@@ -1074,3 +1084,122 @@ class PrivacyAuditWorker(QThread):
         from src.core.privacy_cleaner import PrivacyCleaner
         res = PrivacyCleaner.run_privacy_audit()
         self.finished.emit(res)
+
+class LargeFileScanWorker(QThread):
+    """Streams the current top-N large files while a directory scan runs."""
+    partial_results = pyqtSignal(list)  # [(path, size), ...] largest first
+    finished = pyqtSignal(list)
+
+    def __init__(self, root_dir, min_size_mb=100, limit=100, index=None):
+        super().__init__()
+        from src.core.cleanup_engine import CleanupEngine
+        self.engine = CleanupEngine(index)
+        self.root_dir = root_dir
+        self.min_size_mb = min_size_mb
+        self.limit = limit
+
+    def stop(self):
+        self.engine.cancel()
+
+    def run(self):
+        results = []
+        try:
+            for results in self.engine.iter_large_files(self.root_dir, self.min_size_mb, self.limit):
+                self.partial_results.emit(results)
+        except Exception as e:
+            logger.error(f"Large file scan error: {e}")
+        self.finished.emit(results)
+
+class ShredWorker(QThread):
+    """Shreds files, folders and glob patterns in the background."""
+    progress = pyqtSignal(int, str)        # percent, throughput message
+    file_done = pyqtSignal(str, bool, str) # path, success, message
+    finished = pyqtSignal(dict)            # manifest
+
+    def __init__(self, targets, passes=3, pattern="random"):
+        super().__init__()
+        import threading
+        self.targets = targets
+        self.passes = passes
+        self.pattern = pattern
+        self._cancel_event = threading.Event()
+
+    def stop(self):
+        self._cancel_event.set()
+
+    def run(self):
+        from src.core.file_shredder import FileShredder
+        try:
+            manifest = FileShredder.shred_batch(
+                self.targets, passes=self.passes, pattern=self.pattern,
+                progress_callback=self.progress.emit, file_callback=self.file_done.emit,
+                cancel_event=self._cancel_event
+            )
+        except Exception as e:
+            logger.error(f"Shred worker error: {e}")
+            manifest = {"targets": self.targets, "files_total": 0, "files_shredded": 0,
+                        "files_failed": 0, "bytes_destroyed": 0, "mb_per_sec": 0,
+                        "cancelled": False, "error": str(e), "entries": []}
+        self.finished.emit(manifest)
+
+class VaultImportWorker(QThread):
+    """Imports a CSV/JSON export into an unlocked vault in the background."""
+    progress = pyqtSignal(int, str)  # percent, throughput message
+    finished = pyqtSignal(dict)      # import stats, or {"error": ...}
+
+    def __init__(self, password_manager, path):
+        super().__init__()
+        self.password_manager = password_manager
+        self.path = path
+
+    def run(self):
+        from src.core.vault_import import VaultImporter
+        try:
+            stats = VaultImporter(self.password_manager).import_file(self.path, progress_callback=self.progress.emit)
+        except Exception as e:
+            logger.error(f"Vault import error: {e}")
+            stats = {"error": str(e)}
+        self.finished.emit(stats)
+
+class VaultUnlockWorker(QThread):
+    """Runs the vault KDF (and a legacy migration for new vaults) off the GUI thread."""
+    status = pyqtSignal(str, str)   # message, level
+    finished = pyqtSignal(bool)
+
+    def __init__(self, password_manager, password, is_new, legacy_json=None, legacy_salt=None):
+        super().__init__()
+        self.password_manager = password_manager
+        self.password = password
+        self.is_new = is_new
+        self.legacy_json = legacy_json
+        self.legacy_salt = legacy_salt
+
+    def run(self):
+        pm = self.password_manager
+        try:
+            if not self.is_new:
+                self.finished.emit(pm.unlock(self.password))
+                return
+            if not pm.initialize_vault(self.password):
+                self.finished.emit(False)
+                return
+            if self.legacy_json and os.path.exists(self.legacy_json) and os.path.exists(self.legacy_salt):
+                self.status.emit("Legacy vault found. Attempting migration...", "info")
+                if pm.migrate_from_json(self.legacy_json, self.legacy_salt, self.password):
+                    self.status.emit("Migration successful.", "success")
+            self.finished.emit(True)
+        except Exception as e:
+            logger.error(f"Vault unlock error: {e}")
+            self.finished.emit(False)
+        finally:
+            self.password = None
+
+class KdfCalibrationWorker(QThread):
+    """Benchmarks the vault KDF once per machine so creating a vault does not wait for it."""
+
+    def run(self):
+        from src.core.vault_kdf import calibrated_params
+        try:
+            calibrated_params()
+        except Exception as e:
+            logger.error(f"KDF calibration failed: {e}")
@@ -1,7 +1,9 @@
 import sys
+import math
+from array import array
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QFrame, QGridLayout, QProgressBar)
-from PyQt6.QtCore import Qt, QRectF, pyqtProperty
+from PyQt6.QtCore import Qt, QRectF, QPointF, pyqtProperty
 from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QConicalGradient
 
 class NavButton(QPushButton):
@@ -155,6 +157,86 @@ class CircularProgressBar(QWidget):
         status_rect = QRectF(0, height/2 + 5, width, 20)
         painter.drawText(status_rect, Qt.AlignmentFlag.AlignCenter, self._status)
 
+class LatencyChart(QWidget):
+    """Line chart of a NetworkMonitor's recent RTTs, one series per target.
+
+    Samples are copied into arrays allocated once here, so refreshing the
+    chart on a timer creates no new buffers.
+    """
+    COLORS = ["#00ff88", "#4158D0", "#f0a030", "#c850c0"]
+
+    def __init__(self, points=300, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(140)
+        self._monitor = None
+        self._points = points
+        self._series = {}
+        self._versions = {}
+
+    def set_monitor(self, monitor):
+        self._monitor = monitor
+        self._series = {}
+        self._versions = {}
+        self.update()
+
+    def refresh(self):
+        """Pull new samples from the monitor; repaints only if something changed."""
+        if not self._monitor:
+            return
+        changed = False
+        # Targets can join after start (the gateway is looked up in the monitor thread).
+        for target in self._monitor.targets:
+            if target not in self._series:
+                self._series[target] = (array("d", bytes(8 * self._points)), array("d", bytes(8 * self._points)), [0])
+        for target, (times, values, count) in self._series.items():
+            version = self._monitor.buffers[target].version
+            if self._versions.get(target) != version:
+                self._versions[target] = version
+                count[0] = self._monitor.copy_into(target, times, values, self._points)
+                changed = True
+        if changed:
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        w, h = self.width(), self.height()
+        painter.fillRect(0, 0, w, h, QColor("#151518"))
+
+        peak = 10.0
+        for _, values, count in self._series.values():
+            for i in range(count[0]):
+                v = values[i]
+                if not math.isnan(v) and v > peak:
+                    peak = v
+        peak *= 1.1
+
+        painter.setFont(QFont("Segoe UI", 8))
+        painter.setPen(QPen(QColor("#666")))
+        painter.drawText(QRectF(4, 2, 120, 14), Qt.AlignmentFlag.AlignLeft, f"{peak:.0f} ms")
+
+        step = w / max(1, self._points - 1)
+        for idx, (target, (_, values, count)) in enumerate(self._series.items()):
+            n = count[0]
+            offset = self._points - n  # newest sample sits at the right edge
+            color = QColor(self.COLORS[idx % len(self.COLORS)])
+            prev = None
+            for i in range(n):
+                v = values[i]
+                x = (offset + i) * step
+                if math.isnan(v):
+                    painter.setPen(QPen(QColor("#f44747"), 2))
+                    painter.drawLine(QPointF(x, h - 6), QPointF(x, h))
+                    prev = None
+                    continue
+                point = QPointF(x, h - 4 - (h - 20) * v / peak)
+                if prev is not None:
+                    painter.setPen(QPen(color, 1.5))
+                    painter.drawLine(prev, point)
+                prev = point
+            painter.setPen(QPen(color))
+            painter.drawText(QRectF(w - 130, 2 + 14 * idx, 126, 14), Qt.AlignmentFlag.AlignRight, target)
+
 class PageHeader(QWidget):
     def __init__(self, title, subtitle="", parent=None):
         super().__init__(parent)
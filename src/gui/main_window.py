@@ -15,7 +15,7 @@ from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                              QPushButton, QLabel, QCheckBox, QGroupBox, QSplitter,
                              QScrollArea, QMessageBox, QProgressBar, QStackedWidget,
-                             QFrame, QListWidget, QListWidgetItem, QTreeWidget, QTreeWidgetItem,
+                             QFrame, QListWidget, QListWidgetItem, QListView, QTreeWidget, QTreeWidgetItem,
                              QTreeWidgetItemIterator, QComboBox, QTextEdit, QLineEdit, QDialog, QFormLayout,
                              QApplication)
 from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer, QSize
@@ -50,16 +50,20 @@ from src.core.workers import (
     DownloadWorker,
     NetworkWorker,
     TaskManagerWorker,
-    PrivacyAuditWorker
+    PrivacyAuditWorker,
+    ShredWorker, VaultImportWorker, VaultUnlockWorker, KdfCalibrationWorker, LargeFileScanWorker
 )
 from src.core.password_manager import PasswordManager
 from src.core.bloat_remover import BloatRemover, BloatwareCategory, SafetyLevel
 from src.core.system_tools_installer import SystemToolsInstaller, ToolCategory
+from src.core.port_scanner import DEFAULT_PORT_SPEC
+from src.core.net_monitor import NetworkMonitor
 from src.core.security_scanner import SecurityScanner
 from src.core.update_manager import UpdateManager, UpdateWorker
 from src.core.diagnostics import Diagnostics
 from src.gui.dialogs import MasterPasswordDialog, HostsEditorDialog, AppearanceDialog, UpdateDialog, TidyDesktopDialog, GameCompatibilityDialog
-from src.gui.dashboard import DashboardPage, DashboardCard, PageHeader, NavButton, NotificationBanner
+from src.gui.vault_model import VaultListModel
+from src.gui.dashboard import DashboardPage, DashboardCard, PageHeader, NavButton, NotificationBanner, LatencyChart
 from src.utils.theme_manager import ThemeManager
 from src.utils.helpers import is_admin, elevate_privileges, get_config_dir, ensure_private_file, get_resource_path, get_logs_dir, get_os_info
 from PyQt6.QtWidgets import QSystemTrayIcon, QMenu
@@ -119,7 +123,8 @@ class GhostyTool(QMainWindow):
     status_update_signal = pyqtSignal(object, bool) # (QTreeWidgetItem, is_installed)
     scan_cleanup_signal = pyqtSignal()
     check_tools_signal = pyqtSignal(bool) # force
-    finish_cleanup_signal = pyqtSignal(int, int)
+    finish_cleanup_signal = pyqtSignal(int, int, int)
+    _file_index_lock = threading.Lock()
 
     def __init__(self):
         super().__init__()
@@ -155,7 +160,8 @@ class GhostyTool(QMainWindow):
 
         config_dir = get_config_dir()
         self.db_path = os.path.join(config_dir, "vault.db")
-        self.password_manager = PasswordManager(self.db_path)
+        # Lazy: unlocking reads only site names; passwords are decrypted when an entry is opened.
+        self.password_manager = PasswordManager(self.db_path, lazy=True)
 
         # Activity log + settings paths
         self.activity_log_path = os.path.join(config_dir, "activity.json")
@@ -175,6 +181,8 @@ class GhostyTool(QMainWindow):
         self._app_settings.setdefault("minimize_to_tray", False)
         self._app_settings.setdefault("shortcut_prompted", False)
         self._app_settings.setdefault("gaming_mode_active", False)
+        self._app_settings.setdefault("vault_key_session_sec", 0)
+        self.password_manager.key_session.timeout = self._app_settings["vault_key_session_sec"]
 
         # Detect Linux package manager once at startup
         self.pkg_manager = self._detect_pkg_manager()
@@ -208,6 +216,9 @@ class GhostyTool(QMainWindow):
 
         QTimer.singleShot(1000, self.check_for_updates)
         QTimer.singleShot(2000, self.check_for_whats_new)
+        # One-time KDF benchmark for new vaults; the result is cached in the config dir.
+        self.kdf_calibration_worker = KdfCalibrationWorker()
+        QTimer.singleShot(5000, self.kdf_calibration_worker.start)
 
         # First-launch: prompt to create a desktop shortcut (Windows only)
         if sys.platform == 'win32' and not self._app_settings.get("shortcut_prompted", False):
@@ -1269,40 +1280,42 @@ class GhostyTool(QMainWindow):
         self.log_signal.emit("Initializing security scan...", "info")
         self.scan_worker = SecurityScanWorker()
         self.scan_worker.output.connect(self.log_to_terminal)
+        self.scan_worker.result_ready.connect(self._on_security_result)
         self.scan_worker.finished.connect(self._on_security_scan_finished)
         self.scan_worker.start()
 
-    def _on_security_scan_finished(self, issues):
-        if not issues:
-            self.log_signal.emit("Security scan failed or returned no results.", "error")
-            return
+    def _on_security_result(self, entry):
+        # Support both old 2-tuple and new 3-tuple format
+        if len(entry) == 3:
+            issue, severity, action_key = entry
+        else:
+            issue, severity = entry
+            action_key = None
 
-        for entry in issues:
-            # Support both old 2-tuple and new 3-tuple format
-            if len(entry) == 3:
-                issue, severity, action_key = entry
-            else:
-                issue, severity = entry
-                action_key = None
+        prefix = "[>] " if action_key else "[ ] "
+        item = QListWidgetItem(f"{prefix}[{severity}] {issue}")
+        item.setData(Qt.ItemDataRole.UserRole, action_key)
 
-            prefix = "[>] " if action_key else "[ ] "
-            item = QListWidgetItem(f"{prefix}[{severity}] {issue}")
-            item.setData(Qt.ItemDataRole.UserRole, action_key)
+        if action_key:
+            item.setToolTip("Double-click to take action on this item.")
+        else:
+            item.setToolTip("No quick action available for this item.")
 
-            if action_key:
-                item.setToolTip("Double-click to take action on this item.")
-            else:
-                item.setToolTip("No quick action available for this item.")
+        if severity in ("Critical", "High"):
+            item.setForeground(Qt.GlobalColor.red)
+        elif severity == "Medium":
+            item.setForeground(QColor("orange"))
+        else:
+            item.setForeground(Qt.GlobalColor.green)
 
-            if severity in ("Critical", "High"):
-                item.setForeground(Qt.GlobalColor.red)
-            elif severity == "Medium":
-                item.setForeground(QColor("orange"))
-            else:
-                item.setForeground(Qt.GlobalColor.green)
+        self.security_list.addItem(item)
 
-            self.security_list.addItem(item)
+    def _on_security_scan_finished(self, issues):
+        if not issues:
+            self.log_signal.emit("Security scan failed or returned no results.", "error")
+            return
 
+        # Items were already added by _on_security_result as each check finished.
         self._session_last_security_results = list(issues)
         highs = sum(1 for e in issues if (e[1] if len(e) >= 2 else "") in ("Critical", "High"))
         self.log_signal.emit("Security scan completed. Double-click an item to act on it.", "success")
@@ -1439,7 +1452,7 @@ class GhostyTool(QMainWindow):
         refresh_ip_btn = QPushButton("Refresh Network Info")
         refresh_ip_btn.setFixedHeight(35)
         refresh_ip_btn.setStyleSheet("background-color: #1e1e1e; border: 1px solid #333; border-radius: 5px;")
-        refresh_ip_btn.clicked.connect(self.refresh_network_info)
+        refresh_ip_btn.clicked.connect(lambda: self.refresh_network_info(force=True))
         ip_layout.addRow(refresh_ip_btn)
         
         ip_card.layout.addLayout(ip_layout)
@@ -1481,28 +1494,62 @@ class GhostyTool(QMainWindow):
         
         layout.addLayout(row_layout)
         
+        # Live Quality Card
+        quality_card = DashboardCard("LIVE CONNECTION QUALITY")
+        self.latency_chart = LatencyChart()
+        quality_card.layout.addWidget(self.latency_chart)
+        self.quality_stats_label = QLabel("Monitor stopped.")
+        self.quality_stats_label.setStyleSheet("color: #d4d4d4; font-family: 'Consolas'; font-size: 11px;")
+        self.quality_stats_label.setWordWrap(True)
+        quality_card.layout.addWidget(self.quality_stats_label)
+        self.monitor_btn = QPushButton("Start Monitor")
+        self.monitor_btn.setFixedHeight(35)
+        self.monitor_btn.setStyleSheet("background-color: #1e1e1e; border: 1px solid #333; border-radius: 5px;")
+        self.monitor_btn.clicked.connect(self.toggle_network_monitor)
+        quality_card.layout.addWidget(self.monitor_btn)
+        layout.addWidget(quality_card)
+        self.net_monitor = None
+        self.net_monitor_timer = QTimer(self)
+        self.net_monitor_timer.timeout.connect(self._refresh_network_monitor)
+
         # Port Scanner Card
         port_card = DashboardCard("PORT SCANNER")
         self.port_results_text = QTextEdit()
         self.port_results_text.setReadOnly(True)
-        self.port_results_text.setMaximumHeight(80)
+        self.port_results_text.setMaximumHeight(160)
         self.port_results_text.setStyleSheet("background-color: transparent; color: #d4d4d4; border: none; font-family: 'Consolas';")
+        port_inputs = QHBoxLayout()
+        self.port_target_input = QLineEdit("127.0.0.1")
+        self.port_target_input.setPlaceholderText("Host, list or subnet (e.g. 192.168.1.0/24)")
+        self.port_range_input = QLineEdit(DEFAULT_PORT_SPEC)
+        self.port_range_input.setPlaceholderText("Ports (e.g. 1-1024,3389)")
+        port_inputs.addWidget(self.port_target_input, 1)
+        port_inputs.addWidget(self.port_range_input, 2)
+        port_card.layout.addLayout(port_inputs)
         port_card.layout.addWidget(self.port_results_text)
-        run_port_btn = QPushButton("Scan Local Ports")
-        run_port_btn.setFixedHeight(35)
-        run_port_btn.setStyleSheet("background-color: #1e1e1e; border: 1px solid #333; border-radius: 5px;")
-        run_port_btn.clicked.connect(self.run_port_scan)
-        port_card.layout.addWidget(run_port_btn)
+        self.port_scan_btn = QPushButton("Scan Ports")
+        self.port_scan_btn.setFixedHeight(35)
+        self.port_scan_btn.setStyleSheet("background-color: #1e1e1e; border: 1px solid #333; border-radius: 5px;")
+        self.port_scan_btn.clicked.connect(self.run_port_scan)
+        port_card.layout.addWidget(self.port_scan_btn)
         layout.addWidget(port_card)
         
         layout.addStretch()
         self.content_stack.addWidget(page)
         self.refresh_network_info()
 
-    def refresh_network_info(self):
-        self.local_ip_label.setText("Fetching...")
-        self.public_ip_label.setText("Fetching...")
-        self.network_worker = NetworkWorker(task="ip")
+    def refresh_network_info(self, force=False):
+        from src.core.network_tools import NetworkTools
+        details, fresh = NetworkTools.cached_ip_intelligence()
+        if details:
+            # Show the last known details at once; the worker only replaces them if they changed.
+            self._on_network_task_finished({"task": "ip", "data": details})
+            if fresh and not force:
+                return
+        else:
+            self.local_ip_label.setText("Fetching...")
+            self.public_ip_label.setText("Fetching...")
+        self.network_worker = NetworkWorker(task="ip", force=force)
         self.network_worker.finished.connect(self._on_network_task_finished)
         self.network_worker.start()
 
@@ -1513,12 +1560,61 @@ class GhostyTool(QMainWindow):
         self.dns_worker.finished.connect(self._on_network_task_finished)
         self.dns_worker.start()
 
+    def toggle_network_monitor(self):
+        if self.net_monitor and self.net_monitor.running:
+            self.net_monitor.stop()
+            self.net_monitor_timer.stop()
+            self.monitor_btn.setText("Start Monitor")
+            return
+        self.net_monitor = NetworkMonitor()
+        self.latency_chart.set_monitor(self.net_monitor)
+        self.net_monitor.start()
+        self.net_monitor_timer.start(500)
+        self.monitor_btn.setText("Stop Monitor")
+
+    def _refresh_network_monitor(self):
+        self.latency_chart.refresh()
+        lines = []
+        for target, st in self.net_monitor.summary(window=30).items():
+            label = f"{target} (gateway)" if target == self.net_monitor.gateway else target
+            if st["avg"] < 0:
+                lines.append(f"{label}: no replies ({st['samples']} probes)")
+                continue
+            lines.append(f"{label}: {st['p50']:.1f} ms, jitter {st['jitter']:.1f} ms, loss {st['loss']:.0f}% "
+                         f"({st['loss_bursts']} bursts), spikes {st['spikes']}, bloat {st['bloat']:.0f} ms [{st['grade']}]")
+        self.quality_stats_label.setText("\n".join(lines))
+
     def run_port_scan(self):
-        self.port_results_text.setText("Scanning common ports on localhost...")
-        self.port_worker = NetworkWorker(task="port")
+        if getattr(self, "port_worker", None) and self.port_worker.isRunning():
+            self.port_worker.stop()
+            self.port_scan_btn.setEnabled(False)
+            self.port_scan_btn.setText("Stopping...")
+            return
+        target = self.port_target_input.text().strip() or "127.0.0.1"
+        ports = self.port_range_input.text().strip() or DEFAULT_PORT_SPEC
+        self.port_results_text.setText(f"Scanning {target} ({ports})...")
+        self.port_scan_btn.setText("Stop Scan")
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.port_worker = NetworkWorker(task="port", target=target, ports=ports)
+        self.port_worker.port_found.connect(self._on_port_found)
+        self.port_worker.progress.connect(self._on_port_scan_progress)
         self.port_worker.finished.connect(self._on_network_task_finished)
         self.port_worker.start()
 
+    def _on_port_scan_progress(self, percent, message):
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"%p% - {message}")
+
+    def _on_port_found(self, entry):
+        line = f"{entry['host']}:{entry['port']}  {entry['service']}"
+        if entry.get("banner"):
+            line += f"  - {entry['banner'][:80]}"
+        if entry.get("cached"):
+            line += "  (cached)"
+        self.port_results_text.append(line)
+
     def _on_network_task_finished(self, result):
         task = result.get("task")
         data = result.get("data")
@@ -1532,12 +1628,25 @@ class GhostyTool(QMainWindow):
             self.dns_results_list.clear()
             for res in data:
                 latency = f"{res['latency']:.2f} ms" if res['latency'] > 0 else "Failed"
-                self.dns_results_list.addItem(f"{res['name']}: {latency}")
+                line = f"{res['name']}: {latency}"
+                cached, uncached = res.get("cached"), res.get("uncached")
+                if cached and uncached and res['latency'] > 0:
+                    line += (f"  (p95 {cached['p95']:.0f} ms, uncached p50 {uncached['p50']:.0f} ms, "
+                             f"{cached['timeouts'] + uncached['timeouts']} timeouts)")
+                self.dns_results_list.addItem(line)
         elif task == "port":
-            if data:
-                self.port_results_text.setText(f"Open Ports: {', '.join(map(str, data))}")
+            self.port_scan_btn.setEnabled(True)
+            self.port_scan_btn.setText("Scan Ports")
+            self.progress_bar.setFormat("%p%")
+            QTimer.singleShot(2000, self.progress_bar.hide)
+            status = "Scan stopped" if result.get("cancelled") else "Scan complete"
+            if result.get("error"):
+                self.port_results_text.append(f"Scan failed: {result['error']}")
+            elif data:
+                hosts = len({entry["host"] for entry in data})
+                self.port_results_text.append(f"{status}: {len(data)} open port(s) on {hosts} host(s).")
             else:
-                self.port_results_text.setText("No common open ports found.")
+                self.port_results_text.append(f"{status}: no open ports found.")
 
     def setup_processes_page(self):
         page = QWidget()
@@ -1776,14 +1885,16 @@ class GhostyTool(QMainWindow):
 
     def populate_debloat_tree(self):
         categories = {}
-        for item in self.bloat_remover.items.values():
-            cat_name = item.category.value
+        # Summary rows come straight from the compiled catalog, so listing the
+        # items does not build BloatwareItem objects.
+        for item_id, name, description, category, safety_level in self.bloat_remover.summaries():
+            cat_name = category.value
             if cat_name not in categories:
                 cat_item = QTreeWidgetItem(self.debloat_tree, [cat_name])
                 categories[cat_name] = cat_item
-            child = QTreeWidgetItem(categories[cat_name], [item.name, item.description, item.safety_level.value])
+            child = QTreeWidgetItem(categories[cat_name], [name, description, safety_level.value])
             child.setCheckState(0, Qt.CheckState.Unchecked)
-            child.setData(0, Qt.ItemDataRole.UserRole, item.id)
+            child.setData(0, Qt.ItemDataRole.UserRole, item_id)
         self.debloat_tree.expandAll()
 
     def scan_bloatware(self):
@@ -1978,25 +2089,41 @@ class GhostyTool(QMainWindow):
         scan_btn.setStyleSheet("QPushButton { background-color: #1a1a1f; color: white; font-weight: bold; border: 1px solid #4158D0; border-radius: 8px; } QPushButton:hover { background-color: #25252b; }")
         scan_btn.clicked.connect(self.scan_cleanup_items)
         
+        self.large_files_btn = QPushButton("Find Large Files")
+        self.large_files_btn.setMinimumHeight(45)
+        self.large_files_btn.setStyleSheet("QPushButton { background-color: #1a1a1f; color: white; font-weight: bold; border: 1px solid #4158D0; border-radius: 8px; } QPushButton:hover { background-color: #25252b; }")
+        self.large_files_btn.clicked.connect(self.scan_large_files)
+
         cleanup_btn = QPushButton("Remove Selected Items")
         cleanup_btn.setMinimumHeight(45)
         cleanup_btn.setStyleSheet("QPushButton { background-color: #f44747; color: white; font-weight: bold; border: none; border-radius: 8px; } QPushButton:hover { background-color: #f65d5d; }")
         cleanup_btn.clicked.connect(self.perform_cleanup)
         
         btn_layout.addWidget(scan_btn)
+        btn_layout.addWidget(self.large_files_btn)
         btn_layout.addWidget(cleanup_btn)
         layout.addLayout(btn_layout)
         
         self.content_stack.addWidget(page)
 
+    def _get_file_index(self):
+        """The on-disk file index shared by the cleanup scans, opened on first use."""
+        with self._file_index_lock:
+            if getattr(self, "file_index", None) is None:
+                from src.core.file_index import FileIndex
+                self.file_index = FileIndex()
+            return self.file_index
+
     def scan_cleanup_items(self):
         self.log_signal.emit("Scanning for unused applications and old files...", "info")
         self.cleanup_tree.show()
         self.cleanup_tree.clear()
+        self.large_cat = None  # deleted with the rest of the tree; a large-file scan recreates it
         
         # Create category nodes immediately
         self.file_cat = QTreeWidgetItem(self.cleanup_tree, ["Old Files (>3 months)"])
         self.app_cat = QTreeWidgetItem(self.cleanup_tree, ["Potentially Unused Apps (>6 months)"])
+        self.dup_cat = QTreeWidgetItem(self.cleanup_tree, ["Duplicate Files (extra copies)"])
         self.cleanup_tree.expandAll()
         
         # Show progress bar in indeterminate mode to show activity
@@ -2014,6 +2141,7 @@ class GhostyTool(QMainWindow):
                 self.log_signal.emit(f"{msg} {s}", "info")
 
             found_files_count = 0
+            found_dup_count = 0
             found_apps_count = 0
 
             try:
@@ -2024,34 +2152,57 @@ class GhostyTool(QMainWindow):
                 ]
                 
                 now = datetime.now()
+                file_index = self._get_file_index()
                 for path in paths_to_scan:
                     if not os.path.exists(path): continue
                     log_step(f"Scanning directory: {path}")
                     try:
-                        # Use os.scandir for better performance
-                        with os.scandir(path) as entries:
-                            for entry in entries:
-                                try:
-                                    if entry.is_file():
-                                        stat = entry.stat()
-                                        mtime = datetime.fromtimestamp(stat.st_mtime)
-                                        days_old = (now - mtime).days
-                                        if days_old > 90: # Older than 3 months
-                                            size_mb = stat.st_size / (1024 * 1024)
-                                            item_data = {
-                                                "name": entry.name,
-                                                "path": entry.path,
-                                                "type": "File",
-                                                "details": f"{days_old} days old, {size_mb:.1f} MB"
-                                            }
-                                            found_files_count += 1
-                                            self.cleanup_item_signal.emit("file", item_data)
-                                            if found_files_count % 10 == 0:
-                                                log_step(f"Found {found_files_count} old files so far...")
-                                except: pass
-                    except: pass
-
-                # 2. Scan for apps (Listing apps with install date > 6 months)
+                        # Only the top level is listed, and only when the folder changed since the last scan
+                        file_index.refresh(path, max_depth=0)
+                        cutoff = now.timestamp() - 90 * 86400 # Older than 3 months
+                        # Indexed mtimes can be stale for files rewritten in place, so confirm each hit on disk
+                        candidates = [row[0] for row in file_index.older_than(90, root=path, recursive=False)]
+                        for file_path, size, mtime, _, _ in file_index.restat(candidates):
+                            if mtime >= cutoff:
+                                continue
+                            days_old = (now - datetime.fromtimestamp(mtime)).days
+                            size_mb = size / (1024 * 1024)
+                            item_data = {
+                                "name": os.path.basename(file_path),
+                                "path": file_path,
+                                "type": "File",
+                                "details": f"{days_old} days old, {size_mb:.1f} MB"
+                            }
+                            found_files_count += 1
+                            self.cleanup_item_signal.emit("file", item_data)
+                            if found_files_count % 10 == 0:
+                                log_step(f"Found {found_files_count} old files so far...")
+                    except Exception as e:
+                        logger.error(f"Failed to scan {path}: {e}")
+
+                # 2. Duplicate copies in Downloads (hashes are cached in the file index)
+                downloads = paths_to_scan[0]
+                if os.path.exists(downloads):
+                    log_step("Looking for duplicate downloads...")
+                    try:
+                        from src.core.duplicate_finder import DuplicateFinder
+                        finder = DuplicateFinder(index=file_index)
+                        for group in finder.find(downloads, min_size=1024 * 1024):
+                            size_mb = group["size"] / (1024 * 1024)
+                            original = os.path.basename(group["paths"][0])
+                            for dup_path in group["paths"][1:]:
+                                item_data = {
+                                    "name": os.path.basename(dup_path),
+                                    "path": dup_path,
+                                    "type": "File",
+                                    "details": f"Copy of {original}, {size_mb:.1f} MB"
+                                }
+                                found_dup_count += 1
+                                self.cleanup_item_signal.emit("duplicate", item_data)
+                    except Exception as e:
+                        logger.error(f"Duplicate scan failed: {e}")
+
+                # 3. Scan for apps (Listing apps with install date > 6 months)
                 log_step("Scanning system registry for unused applications...")
                 try:
                     ps_cmd = '$paths = @("HKLM:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\*", "HKLM:\\SOFTWARE\\WOW6432Node\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\*", "HKCU:\\Software\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\*"); Get-ItemProperty $paths -ErrorAction SilentlyContinue | Where-Object { $_.DisplayName -ne $null } | Select-Object DisplayName, InstallDate | ConvertTo-Json'
@@ -2091,25 +2242,76 @@ class GhostyTool(QMainWindow):
                         except json.JSONDecodeError: pass
                 except: pass
 
-                self.finish_cleanup_signal.emit(found_files_count, found_apps_count)
+                self.finish_cleanup_signal.emit(found_files_count, found_dup_count, found_apps_count)
             except Exception as e:
                 self.log_signal.emit(f"Error during cleanup scan: {e}", "error")
-                self.finish_cleanup_signal.emit(0, 0)
+                self.finish_cleanup_signal.emit(0, 0, 0)
 
         threading.Thread(target=run_scan, daemon=True).start()
 
+    def scan_large_files(self):
+        if getattr(self, "large_file_worker", None) and self.large_file_worker.isRunning():
+            self.large_file_worker.stop()
+            self.large_files_btn.setEnabled(False)
+            self.large_files_btn.setText("Stopping...")
+            return
+        from PyQt6.QtWidgets import QFileDialog
+        root = QFileDialog.getExistingDirectory(self, "Find Large Files In", os.path.expanduser("~"))
+        if not root:
+            return
+        self.cleanup_tree.show()
+        self._large_files_category().takeChildren()
+        self.log_signal.emit(f"Looking for large files in {root}...", "info")
+        self.large_files_btn.setText("Stop")
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.show()
+        self.large_file_worker = LargeFileScanWorker(root, min_size_mb=100, limit=100, index=self._get_file_index())
+        self.large_file_worker.partial_results.connect(self._show_large_files)
+        self.large_file_worker.finished.connect(self._on_large_files_finished)
+        self.large_file_worker.start()
+
+    def _large_files_category(self):
+        if getattr(self, "large_cat", None) is None:
+            self.large_cat = QTreeWidgetItem(self.cleanup_tree, ["Large Files (>100 MB)"])
+        return self.large_cat
+
+    def _show_large_files(self, files):
+        # The list is the current top 100, so redrawing it whole is cheap; keep the user's ticks.
+        self._large_files_category()
+        checked = set()
+        for i in range(self.large_cat.childCount()):
+            child = self.large_cat.child(i)
+            if child.checkState(0) == Qt.CheckState.Checked:
+                checked.add(child.data(0, Qt.ItemDataRole.UserRole))
+        self.large_cat.takeChildren()
+        for path, size in files:
+            child = QTreeWidgetItem(self.large_cat, [os.path.basename(path), "File", f"{size / (1024 ** 2):.1f} MB - {path}"])
+            child.setCheckState(0, Qt.CheckState.Checked if path in checked else Qt.CheckState.Unchecked)
+            child.setData(0, Qt.ItemDataRole.UserRole, path)
+        self.large_cat.setExpanded(True)
+
+    def _on_large_files_finished(self, files):
+        self._show_large_files(files)
+        self.large_files_btn.setEnabled(True)
+        self.large_files_btn.setText("Find Large Files")
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+        total_gb = sum(size for _, size in files) / (1024 ** 3)
+        self.log_signal.emit(f"Found {len(files)} large files ({total_gb:.2f} GB).", "success")
+
     def _add_cleanup_item(self, cat_type, data):
-        parent = self.file_cat if cat_type == "file" else self.app_cat
+        parent = {"file": self.file_cat, "duplicate": self.dup_cat}.get(cat_type, self.app_cat)
         child = QTreeWidgetItem(parent, [data["name"], data["type"], data["details"]])
         child.setCheckState(0, Qt.CheckState.Unchecked)
         # Use path for files, name for apps (as ID for uninstallation)
         child.setData(0, Qt.ItemDataRole.UserRole, data.get("path") or data.get("id"))
         self.cleanup_tree.expandAll()
 
-    def _finish_cleanup_scan(self, file_count, app_count):
+    def _finish_cleanup_scan(self, file_count, dup_count, app_count):
         self.progress_bar.setRange(0, 100)
         self.progress_bar.hide()
-        self.log_signal.emit(f"Scan complete. Found {file_count} old files and {app_count} potentially unused apps.", "success")
+        self.log_signal.emit(f"Scan complete. Found {file_count} old files, {dup_count} duplicate downloads "
+                             f"and {app_count} potentially unused apps.", "success")
 
     def perform_cleanup(self):
         selected_files = []
@@ -2212,15 +2414,15 @@ class GhostyTool(QMainWindow):
         icon_path = os.path.join(self.project_root, "images", "ghosty icon.ico")
         ghosty_icon = QIcon(icon_path) if os.path.exists(icon_path) else QIcon()
         
-        for tool in self.tools_installer.tools.values():
-            cat_name = tool.category.value
+        for tool_id, name, description, category in self.tools_installer.summaries():
+            cat_name = category.value
             if cat_name not in categories:
                 cat_item = QTreeWidgetItem(self.tools_tree, [cat_name])
                 categories[cat_name] = cat_item
-            child = QTreeWidgetItem(categories[cat_name], [tool.name, "Unknown", tool.description])
+            child = QTreeWidgetItem(categories[cat_name], [name, "Unknown", description])
             child.setIcon(0, ghosty_icon)
             child.setCheckState(0, Qt.CheckState.Unchecked)
-            child.setData(0, Qt.ItemDataRole.UserRole, tool.id)
+            child.setData(0, Qt.ItemDataRole.UserRole, tool_id)
         self.tools_tree.expandAll()
 
     def check_tools_status(self, force=False):
@@ -2235,10 +2437,10 @@ class GhostyTool(QMainWindow):
         
         def run_check():
             try:
-                # Prime the winget cache once on Windows to avoid multiple slow calls
+                # Build the installed-software snapshot once so each check is a lookup
                 if sys.platform == "win32":
                     self.log_signal.emit("Refreshing WinGet package cache...", "info")
-                    self.tools_installer.refresh_installed_cache()
+                self.tools_installer.refresh_installed_cache()
 
                 items_to_check = []
                 iterator = QTreeWidgetItemIterator(self.tools_tree)
@@ -2584,7 +2786,7 @@ class GhostyTool(QMainWindow):
             except Exception as e:
                 self.log_signal.emit(f"Error installing {tool.name}: {e}", "error")
         self.log_signal.emit(f"Verifying installation for {tool.name}...", "info")
-        self.tools_installer.check_tool_status(tool)
+        self.tools_installer.check_tool_status(tool, refresh=True)
         if tool.is_installed:
             self._update_item_status_by_id(tool.id, True)
             self._brand_tool_installation(tool)
@@ -2794,6 +2996,12 @@ class GhostyTool(QMainWindow):
         select_file_btn.setStyleSheet("background-color: #1e1e1e; border: 1px solid #333; border-radius: 5px;")
         select_file_btn.clicked.connect(self.select_file_to_shred)
         shred_layout.addWidget(select_file_btn)
+
+        select_folder_btn = QPushButton("Select Folder to Shred")
+        select_folder_btn.setFixedHeight(35)
+        select_folder_btn.setStyleSheet("background-color: #1e1e1e; border: 1px solid #333; border-radius: 5px;")
+        select_folder_btn.clicked.connect(self.select_folder_to_shred)
+        shred_layout.addWidget(select_folder_btn)
         
         self.shred_btn = QPushButton("Shred File Permanently")
         self.shred_btn.setFixedHeight(40)
@@ -2801,6 +3009,13 @@ class GhostyTool(QMainWindow):
         self.shred_btn.setEnabled(False)
         self.shred_btn.clicked.connect(self.run_file_shredder)
         shred_layout.addWidget(self.shred_btn)
+
+        self.shred_cancel_btn = QPushButton("Cancel Shredding")
+        self.shred_cancel_btn.setFixedHeight(35)
+        self.shred_cancel_btn.setStyleSheet("background-color: #1e1e1e; border: 1px solid #333; border-radius: 5px;")
+        self.shred_cancel_btn.clicked.connect(self.cancel_file_shredder)
+        self.shred_cancel_btn.hide()
+        shred_layout.addWidget(self.shred_cancel_btn)
         
         shred_card.layout.addLayout(shred_layout)
         layout.addWidget(shred_card)
@@ -2859,25 +3074,72 @@ class GhostyTool(QMainWindow):
             self.shred_path_label.setText(file_path)
             self.shred_btn.setEnabled(True)
 
+    def select_folder_to_shred(self):
+        from PyQt6.QtWidgets import QFileDialog
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder to Shred")
+        if folder:
+            self.shred_path_label.setText(folder)
+            self.shred_btn.setEnabled(True)
+
     def run_file_shredder(self):
-        file_path = self.shred_path_label.text()
-        if not os.path.exists(file_path): return
-        
+        target = self.shred_path_label.text()
+        if not os.path.exists(target): return
+
+        what = "folder and everything in it" if os.path.isdir(target) else "file"
         reply = QMessageBox.warning(self, "Confirm Shredding", 
-                                  "Are you sure? This file will be PERMANENTLY deleted and CANNOT be recovered.",
+                                  f"Are you sure? This {what} will be PERMANENTLY deleted and CANNOT be recovered.",
                                   QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            from src.core.file_shredder import FileShredder
-            success, msg = FileShredder.shred(file_path)
-            if success:
-                self.log_signal.emit(msg, "success")
-                self.notify_tray("File Shredded", f"Securely deleted: {os.path.basename(file_path)}")
-                self.log_activity(f"Shredded: {os.path.basename(file_path)}")
-                self.shred_path_label.setText("No file selected")
-                self.shred_btn.setEnabled(False)
-            else:
-                self.log_signal.emit(msg, "error")
+            self.shred_btn.setEnabled(False)
+            self.shred_cancel_btn.show()
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(0)
+            self.progress_bar.show()
+            self.log_signal.emit(f"Shredding {target}...", "info")
+
+            self.shred_worker = ShredWorker([target])
+            self.shred_worker.progress.connect(self._on_shred_progress)
+            self.shred_worker.file_done.connect(self._on_shred_file_done)
+            self.shred_worker.finished.connect(self._on_shred_finished)
+            self.shred_worker.start()
+
+    def cancel_file_shredder(self):
+        if getattr(self, "shred_worker", None) and self.shred_worker.isRunning():
+            self.shred_worker.stop()
+            self.log_signal.emit("Cancelling shredding after the current chunk...", "warning")
+
+    def _on_shred_progress(self, percent, message):
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"%p% - {message}")
+
+    def _on_shred_file_done(self, path, success, message):
+        self.log_signal.emit(message, "debug" if success else "error")
+
+    def _on_shred_finished(self, manifest):
+        self.shred_cancel_btn.hide()
+        self.progress_bar.setFormat("%p%")
+        QTimer.singleShot(2000, self.progress_bar.hide)
+
+        from src.core.file_shredder import FileShredder
+        manifest_path = os.path.join(get_logs_dir(), f"shred_manifest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        FileShredder.save_manifest(manifest, manifest_path)
+
+        shredded = manifest.get("files_shredded", 0)
+        failed = manifest.get("files_failed", 0)
+        size_mb = manifest.get("bytes_destroyed", 0) / (1024 * 1024)
+        summary = (f"Shredded {shredded} file(s), {size_mb:.1f} MB at {manifest.get('mb_per_sec', 0)} MB/s"
+                   f"{f', {failed} failed' if failed else ''}{' (cancelled)' if manifest.get('cancelled') else ''}.")
+        if manifest.get("error"):
+            self.log_signal.emit(f"Shredding failed: {manifest['error']}", "error")
+        else:
+            self.log_signal.emit(f"{summary} Manifest: {manifest_path}", "success" if not failed else "warning")
+        if shredded:
+            target = os.path.basename(self.shred_path_label.text())
+            self.notify_tray("File Shredded", f"Securely deleted: {target}")
+            self.log_activity(f"Shredded: {target} ({shredded} file(s))")
+        self.shred_path_label.setText("No file selected")
+        self.shred_btn.setEnabled(False)
 
     def run_win_tool(self, tool):
         from src.core.platform_tools.windows import WindowsTools
@@ -3071,11 +3333,11 @@ class GhostyTool(QMainWindow):
         login_widget = QWidget()
         login_layout = QVBoxLayout(login_widget)
         login_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        unlock_btn = QPushButton("Unlock Password Vault")
-        unlock_btn.setFixedSize(280, 60)
-        unlock_btn.setStyleSheet("QPushButton { background-color: #4158D0; color: white; font-weight: bold; border-radius: 12px; font-size: 16px; } QPushButton:hover { background-color: #4b6de3; }")
-        unlock_btn.clicked.connect(self.unlock_vault)
-        login_layout.addWidget(unlock_btn)
+        self.vault_unlock_btn = QPushButton("Unlock Password Vault")
+        self.vault_unlock_btn.setFixedSize(280, 60)
+        self.vault_unlock_btn.setStyleSheet("QPushButton { background-color: #4158D0; color: white; font-weight: bold; border-radius: 12px; font-size: 16px; } QPushButton:hover { background-color: #4b6de3; }")
+        self.vault_unlock_btn.clicked.connect(self.unlock_vault)
+        login_layout.addWidget(self.vault_unlock_btn)
         self.vault_stack.addWidget(login_widget)
         
         self.vault_main_widget = QWidget()
@@ -3100,9 +3362,20 @@ class GhostyTool(QMainWindow):
         form_card.layout.addLayout(v_form_layout)
         v_main_layout.addWidget(form_card)
         
-        self.vault_list = QListWidget()
-        self.vault_list.setStyleSheet("QListWidget { background-color: #1a1a1f; border: 1px solid #333; border-radius: 10px; color: #d4d4d4; padding: 5px; } QListWidget::item { padding: 8px; border-bottom: 1px solid #25252b; }")
-        self.vault_list.itemClicked.connect(self.on_vault_item_clicked)
+        self.vault_search_entry = QLineEdit()
+        self.vault_search_entry.setPlaceholderText("Search sites...")
+        self.vault_search_entry.setClearButtonEnabled(True)
+        self.vault_search_entry.setStyleSheet(entry_style)
+        self.vault_search_entry.textChanged.connect(self.vault_model_filter)
+        v_main_layout.addWidget(self.vault_search_entry)
+
+        # Model/view list: only visible rows are painted, and filtering narrows the model in place.
+        self.vault_model = VaultListModel(self)
+        self.vault_list = QListView()
+        self.vault_list.setModel(self.vault_model)
+        self.vault_list.setUniformItemSizes(True)
+        self.vault_list.setStyleSheet("QListView { background-color: #1a1a1f; border: 1px solid #333; border-radius: 10px; color: #d4d4d4; padding: 5px; } QListView::item { padding: 8px; border-bottom: 1px solid #25252b; }")
+        self.vault_list.clicked.connect(self.on_vault_item_clicked)
         v_main_layout.addWidget(self.vault_list)
         
         v_actions = QHBoxLayout()
@@ -3111,6 +3384,17 @@ class GhostyTool(QMainWindow):
         del_v_btn.setStyleSheet("QPushButton { background-color: #f44747; color: white; font-weight: bold; border-radius: 5px; } QPushButton:hover { background-color: #f65d5d; }")
         del_v_btn.clicked.connect(self.delete_vault_entry)
         v_actions.addWidget(del_v_btn)
+        import_v_btn = QPushButton("Import...")
+        import_v_btn.setFixedHeight(35)
+        import_v_btn.setToolTip("Import a browser/password manager CSV export or a JSON file")
+        import_v_btn.setStyleSheet("QPushButton { background-color: #1e1e1e; color: white; border: 1px solid #333; border-radius: 5px; } QPushButton:hover { background-color: #2a2a2a; }")
+        import_v_btn.clicked.connect(self.import_vault_entries)
+        v_actions.addWidget(import_v_btn)
+        self.vault_lock_btn = QPushButton("Lock Vault")
+        self.vault_lock_btn.setFixedHeight(35)
+        self.vault_lock_btn.setStyleSheet("QPushButton { background-color: #1e1e1e; color: white; border: 1px solid #333; border-radius: 5px; } QPushButton:hover { background-color: #2a2a2a; }")
+        self.vault_lock_btn.clicked.connect(self.lock_vault)
+        v_actions.addWidget(self.vault_lock_btn)
         v_main_layout.addLayout(v_actions)
         
         self.vault_stack.addWidget(self.vault_main_widget)
@@ -3165,6 +3449,12 @@ class GhostyTool(QMainWindow):
 
 
     def unlock_vault(self):
+        if getattr(self, "vault_unlock_worker", None) and self.vault_unlock_worker.isRunning():
+            return
+        if self.password_manager.resume_session():
+            self._on_vault_unlocked(True)
+            return
+
         config_dir = os.path.dirname(self.db_path)
         old_json = os.path.join(config_dir, "vault.json")
         old_salt = os.path.join(config_dir, "salt")
@@ -3173,33 +3463,47 @@ class GhostyTool(QMainWindow):
         dlg = MasterPasswordDialog(is_new=is_new)
         
         if dlg.exec() == QDialog.DialogCode.Accepted:
-            password = dlg.password
-            success = False
-            
-            if is_new:
-                if self.password_manager.initialize_vault(password):
-                    success = True
-                    if os.path.exists(old_json) and os.path.exists(old_salt):
-                        self.log_signal.emit("Legacy vault found. Attempting migration...", "info")
-                        if self.password_manager.migrate_from_json(old_json, old_salt, password):
-                            self.log_signal.emit("Migration successful.", "success")
-            else:
-                success = self.password_manager.unlock(password)
-            
-            if success:
-                try: ensure_private_file(self.db_path)
+            # The KDF is deliberately slow; derive the key in a worker so the window stays responsive.
+            self.log_signal.emit("Deriving vault key...", "info")
+            self.vault_unlock_btn.setEnabled(False)
+            self.vault_unlock_worker = VaultUnlockWorker(self.password_manager, dlg.password, is_new,
+                                                         old_json, old_salt)
+            self.vault_unlock_worker.status.connect(self.log_signal.emit)
+            self.vault_unlock_worker.finished.connect(self._on_vault_unlocked)
+            self.vault_unlock_worker.start()
+
+    def _on_vault_unlocked(self, success):
+        self.vault_unlock_btn.setEnabled(True)
+        if success:
+            # WAL mode keeps recent writes in the -wal/-shm side files.
+            for path in (self.db_path, self.db_path + "-wal", self.db_path + "-shm"):
+                try: ensure_private_file(path)
                 except: pass
-                self.refresh_vault_list()
-                self.vault_stack.setCurrentIndex(1)
-                self.log_signal.emit("Vault unlocked.", "success")
-            else:
-                self.log_signal.emit("Failed to unlock vault.", "error")
-                QMessageBox.critical(self, "Unlock Failed", "Invalid password.")
+            self.refresh_vault_list()
+            self.vault_stack.setCurrentIndex(1)
+            self.log_signal.emit("Vault unlocked.", "success")
+        else:
+            self.log_signal.emit("Failed to unlock vault.", "error")
+            QMessageBox.critical(self, "Unlock Failed", "Invalid password.")
+
+    def lock_vault(self):
+        if getattr(self, "vault_import_worker", None) and self.vault_import_worker.isRunning():
+            # The importer writes decrypted entries back into memory; let it finish first.
+            self.log_signal.emit("Wait for the import to finish before locking the vault.", "warning")
+            return
+        self.password_manager.lock()
+        self.vault_model.clear()
+        self.vault_search_entry.clear()
+        self.vault_site_entry.clear()
+        self.vault_pass_entry.clear()
+        self.vault_stack.setCurrentIndex(0)
+        self.log_signal.emit("Vault locked.", "info")
 
     def refresh_vault_list(self):
-        self.vault_list.clear()
-        if self.password_manager:
-            self.vault_list.addItems(self.password_manager.get_all_sites())
+        self.vault_model.set_manager(self.password_manager)
+
+    def vault_model_filter(self, text):
+        self.vault_model.set_query(text)
 
     def save_vault_entry(self):
         site = self.vault_site_entry.text().strip()
@@ -3214,17 +3518,50 @@ class GhostyTool(QMainWindow):
                 self.log_signal.emit("Failed to save password.", "error")
 
     def delete_vault_entry(self):
-        item = self.vault_list.currentItem()
-        if item and self.password_manager:
-            site = item.text()
+        site = self.vault_model.site(self.vault_list.currentIndex().row())
+        if site and self.password_manager:
             if self.password_manager.delete_password(site):
                 self.refresh_vault_list()
                 self.log_signal.emit(f"Deleted password for {site}.", "warning")
 
-    def on_vault_item_clicked(self, item):
-        site = item.text()
-        if self.password_manager and hasattr(self.password_manager, "passwords"):
-            pw = self.password_manager.passwords.get(site, "")
+    def import_vault_entries(self):
+        from PyQt6.QtWidgets import QFileDialog
+        if getattr(self, "vault_import_worker", None) and self.vault_import_worker.isRunning():
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Import Passwords", "", "Password exports (*.csv *.json)")
+        if not path:
+            return
+        self.log_signal.emit(f"Importing passwords from {os.path.basename(path)}...", "info")
+        self.vault_lock_btn.setEnabled(False)
+        self.vault_unlock_btn.setEnabled(False)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.vault_import_worker = VaultImportWorker(self.password_manager, path)
+        self.vault_import_worker.progress.connect(self._on_vault_import_progress)
+        self.vault_import_worker.finished.connect(self._on_vault_import_finished)
+        self.vault_import_worker.start()
+
+    def _on_vault_import_progress(self, percent, message):
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"%p% - {message}")
+
+    def _on_vault_import_finished(self, stats):
+        self.vault_lock_btn.setEnabled(True)
+        self.vault_unlock_btn.setEnabled(True)
+        self.progress_bar.setFormat("%p%")
+        QTimer.singleShot(2000, self.progress_bar.hide)
+        self.refresh_vault_list()
+        if stats.get("error"):
+            self.log_signal.emit(f"Import failed: {stats['error']}", "error")
+            return
+        self.log_signal.emit(f"Imported {stats['imported']} of {stats['total']} entries in "
+                             f"{stats['seconds']:.1f}s ({stats['rate']:.0f}/s, {stats['failed']} skipped).", "success")
+
+    def on_vault_item_clicked(self, index):
+        site = self.vault_model.site(index.row())
+        if self.password_manager:
+            pw = self.password_manager.get_password(site)
             self.vault_site_entry.setText(site)
             self.vault_pass_entry.setText(pw)
             self.copy_to_clipboard(pw)
@@ -3902,6 +4239,21 @@ class GhostyTool(QMainWindow):
         startup_row.addStretch()
         general_card.layout.addLayout(startup_row)
 
+        # Vault key session
+        session_row = QHBoxLayout()
+        session_label = QLabel("Keep vault key after locking:")
+        session_label.setStyleSheet("color: #d4d4d4;")
+        session_label.setToolTip("Reopening the vault within this time skips the master password and key derivation.")
+        self._s_vault_session = QComboBox()
+        self._s_vault_session.addItems(["Off", "1 minute", "5 minutes", "15 minutes"])
+        session_map = {0: 0, 60: 1, 300: 2, 900: 3}
+        self._s_vault_session.setCurrentIndex(session_map.get(self._app_settings.get("vault_key_session_sec", 0), 0))
+        self._s_vault_session.currentIndexChanged.connect(self._save_general_settings)
+        session_row.addWidget(session_label)
+        session_row.addWidget(self._s_vault_session)
+        session_row.addStretch()
+        general_card.layout.addLayout(session_row)
+
         layout.addWidget(general_card)
 
         # ── Startup with Windows (Windows only) ────────────────────────
@@ -4564,7 +4916,12 @@ class GhostyTool(QMainWindow):
         self._app_settings["minimize_to_tray"] = self._s_minimize_tray.isChecked()
         self._app_settings["alert_refresh_sec"] = new_sec
         self._app_settings["startup_page"] = self._s_startup_page.currentIndex()
+        session_values = [0, 60, 300, 900]
+        self._app_settings["vault_key_session_sec"] = session_values[max(0, self._s_vault_session.currentIndex())]
         self._save_json(self.settings_path, self._app_settings)
+        self.password_manager.key_session.timeout = self._app_settings["vault_key_session_sec"]
+        if not self.password_manager.key_session.timeout:
+            self.password_manager.key_session.clear()
 
         # Apply alert refresh interval live
         if hasattr(self, 'alerts_timer'):
@@ -4745,7 +5102,8 @@ class GhostyTool(QMainWindow):
         dlg.exec()
 
     def check_for_updates(self, manual=False):
-        self.update_check_worker = UpdateCheckWorker(self.update_manager)
+        # Manual checks revalidate with GitHub; the startup check may be served from the release cache.
+        self.update_check_worker = UpdateCheckWorker(self.update_manager, force=manual)
         self.update_check_worker.finished.connect(lambda info: self._on_update_check_finished(info, manual))
         self.update_check_worker.start()
 
@@ -6218,6 +6576,7 @@ rm -- "$0"
                     2500
                 )
         else:
+            self.password_manager.close()
             event.accept()
 
     def changeEvent(self, event):
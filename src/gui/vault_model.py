@@ -0,0 +1,82 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+from src.core.vault_index import SiteIndex
+
+
+class VaultListModel(QAbstractListModel):
+    """Site names for the vault list view, filtered through the vault's SiteIndex.
+
+    While the user keeps typing (each query extending the last) the
+    current rows are narrowed in place instead of searching the index
+    again, and only the rows that dropped out are removed, so the view
+    never rebuilds tens of thousands of items per keystroke.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sites = []
+        self._query = ""
+        self._manager = None
+
+    def set_manager(self, manager):
+        self._manager = manager
+        self.refresh()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._sites)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self._sites[index.row()]
+        return None
+
+    def site(self, row):
+        return self._sites[row] if 0 <= row < len(self._sites) else None
+
+    def clear(self):
+        self.beginResetModel()
+        self._sites = []
+        self.endResetModel()
+
+    def refresh(self):
+        """Re-run the current query against the index (after a save, delete or import)."""
+        sites = self._manager.search_sites(self._query) if self._manager and self._manager.cipher else []
+        self.beginResetModel()
+        self._sites = sites
+        self.endResetModel()
+
+    def set_query(self, query):
+        previous, self._query = self._query, query
+        if not self._manager:
+            return
+        q, prev = query.strip().casefold(), previous.strip().casefold()
+        if prev and q.startswith(prev) and q != prev:
+            self._narrow(SiteIndex.refine(self._sites, query))
+        elif q != prev:
+            self.refresh()
+
+    def _narrow(self, ordered):
+        keep = set(ordered)
+        if len(keep) < len(self._sites) // 2:
+            # Most rows are going; one reset is cheaper than many removals.
+            self.beginResetModel()
+            self._sites = ordered
+            self.endResetModel()
+            return
+        # Remove dropped rows in contiguous runs, bottom-up so row numbers stay valid.
+        row = len(self._sites) - 1
+        while row >= 0:
+            if self._sites[row] in keep:
+                row -= 1
+                continue
+            end = row
+            while row >= 0 and self._sites[row] not in keep:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, end)
+            del self._sites[row + 1:end + 1]
+            self.endRemoveRows()
+        if self._sites != ordered:
+            # Prefix matches move to the top for the longer query.
+            self.beginResetModel()
+            self._sites = ordered
+            self.endResetModel()
@@ -0,0 +1,168 @@
+import copy
+import logging
+import threading
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "GhostyTools/1.0"
+DEFAULT_TIMEOUT = 10
+POOL_HOSTS = 16             # distinct hosts kept in the connection pool
+PER_HOST_CONNECTIONS = 4    # simultaneous connections allowed to one host
+RETRIES = 3
+BACKOFF = 0.5               # seconds; doubles on each retry
+CACHE_ENTRIES = 64
+CACHE_MAX_BYTES = 2 * 1024 * 1024  # bodies larger than this are never cached
+
+
+class HttpClient:
+    """Shared HTTP client with pooled keep-alive connections.
+
+    One HTTPAdapter (and so one urllib3 pool per host) is shared by all
+    threads; each thread gets its own lightweight Session on top of it,
+    because Session objects are not safe to share.  Idempotent requests
+    are retried with exponential backoff on connection errors and
+    429/5xx, and GETs made with ``cache=True`` are revalidated with
+    If-None-Match / If-Modified-Since so an unchanged resource costs a
+    304 instead of a full download.  Callers that poll or only check
+    reachability pass ``retries=0`` (or another count) to any request
+    method; each retry setting gets its own adapter and pool.
+    """
+
+    def __init__(self, pool_hosts=POOL_HOSTS, per_host=PER_HOST_CONNECTIONS, retries=RETRIES,
+                 backoff=BACKOFF, cache_entries=CACHE_ENTRIES):
+        self.pool_hosts = pool_hosts
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self._adapters = {}
+        self._adapters_lock = threading.Lock()
+        self.adapter = self._adapter(retries)
+        self.cache_entries = cache_entries
+        self._cache = OrderedDict()  # url -> response with a validator
+        self._cache_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _adapter(self, retries):
+        with self._adapters_lock:
+            adapter = self._adapters.get(retries)
+            if adapter is None:
+                retry = Retry(total=retries, connect=retries, read=retries, status=retries,
+                              backoff_factor=self.backoff, status_forcelist=(429, 500, 502, 503, 504),
+                              allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+                              respect_retry_after_header=True, raise_on_status=False)
+                # pool_block caps connections per host instead of opening throwaway extras.
+                adapter = self._adapters[retries] = HTTPAdapter(
+                    pool_connections=self.pool_hosts, pool_maxsize=self.per_host,
+                    max_retries=retry, pool_block=True)
+            return adapter
+
+    def _session(self, retries):
+        sessions = getattr(self._local, "sessions", None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+        session = sessions.get(retries)
+        if session is None:
+            adapter = self._adapter(retries)
+            session = sessions[retries] = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        return session
+
+    @property
+    def session(self):
+        return self._session(self.retries)
+
+    # ── requests ─────────────────────────────────────────────────────────
+    def request(self, method, url, timeout=DEFAULT_TIMEOUT, retries=None, **kwargs):
+        """``retries`` overrides the client's retry count for this call (0 disables retries)."""
+        session = self._session(self.retries if retries is None else retries)
+        return session.request(method, url, timeout=timeout, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault("allow_redirects", True)
+        return self.request("HEAD", url, **kwargs)
+
+    def get(self, url, cache=False, **kwargs):
+        """GET ``url``.  With cache=True a stored ETag/Last-Modified is sent and a 304 is
+        answered from memory, so the caller always sees a normal 200 response."""
+        if not cache or kwargs.get("stream"):
+            return self.request("GET", url, **kwargs)
+
+        with self._cache_lock:
+            cached = self._cache.get(url)
+            if cached is not None:
+                self._cache.move_to_end(url)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached is not None:
+            if "ETag" in cached.headers:
+                headers.setdefault("If-None-Match", cached.headers["ETag"])
+            if "Last-Modified" in cached.headers:
+                headers.setdefault("If-Modified-Since", cached.headers["Last-Modified"])
+
+        response = self.request("GET", url, headers=headers, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            logger.debug(f"Not modified: {url}")
+            hit = copy.copy(cached)
+            hit.from_cache = True
+            return hit
+        if response.status_code == 200:
+            self._store(url, response)
+        return response
+
+    def download(self, url, dest_path, chunk_size=65536, progress=None, **kwargs):
+        """Stream ``url`` to ``dest_path``; progress(downloaded, total) is called per chunk.
+
+        Returns the number of bytes written.  Raises requests.HTTPError on
+        an error status.
+        """
+        with self.request("GET", url, stream=True, **kwargs) as response:
+            response.raise_for_status()
+            total = int(response.headers.get("content-length", 0))
+            downloaded = 0
+            with open(dest_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        if progress:
+                            progress(downloaded, total)
+            return downloaded
+
+    # ── validator cache ──────────────────────────────────────────────────
+    def _store(self, url, response):
+        if not ("ETag" in response.headers or "Last-Modified" in response.headers):
+            return
+        if len(response.content) > CACHE_MAX_BYTES:
+            return
+        response.from_cache = False
+        with self._cache_lock:
+            self._cache[url] = response
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self, url=None):
+        with self._cache_lock:
+            if url is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(url, None)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide HttpClient."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,267 @@
+import os
+import re
+import sys
+import time
+import queue
+import base64
+import shutil
+import logging
+import threading
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0x08000000)
+
+# Marks protocol lines so stray console writes from a script cannot be
+# mistaken for a result.
+_MARKER = "@@GHOSTY@@"
+
+# Runs inside the long-lived PowerShell process.  Each request is one stdin
+# line "<id>\t<base64 utf-8 script>"; each reply is one stdout line
+# "@@GHOSTY@@<id>\t<rc>\t<base64 stdout>\t<base64 stderr>".  *>&1 pulls
+# Write-Host/warning output into the result instead of the raw console.
+# Scripts run with & in a child scope so variables and functions one caller
+# defines do not leak into the next, and a native command's nonzero exit
+# code becomes the rc just as it would for `powershell -Command`.
+_BOOTSTRAP = r'''
+$ErrorActionPreference = 'Continue'
+$ProgressPreference = 'SilentlyContinue'
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    $parts = $line.Split("`t", 2)
+    if ($parts.Count -ne 2) { continue }
+    $script = [Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($parts[1]))
+    $Error.Clear()
+    $global:LASTEXITCODE = 0
+    $ok = $true
+    try {
+        $res = @(& ([ScriptBlock]::Create($script)) *>&1)
+        $ok = $?
+    } catch {
+        $res = @($_)
+        $ok = $false
+    }
+    $errs = @($res | Where-Object { $_ -is [System.Management.Automation.ErrorRecord] })
+    $outs = @($res | Where-Object { $_ -isnot [System.Management.Automation.ErrorRecord] })
+    # Mirror `powershell -Command`: a silenced error with no output still fails.
+    if ($outs.Count -eq 0 -and ($errs.Count -gt 0 -or $Error.Count -gt 0)) { $ok = $false }
+    $out = ($outs | Out-String -Width 4096)
+    $err = ($errs | Out-String -Width 4096)
+    $rc = if ($global:LASTEXITCODE) { $global:LASTEXITCODE } elseif ($ok) { 0 } else { 1 }
+    [Console]::Out.WriteLine("@@GHOSTY@@" + $parts[0] + "`t" + $rc + "`t" +
+        [Convert]::ToBase64String([Text.Encoding]::UTF8.GetBytes($out)) + "`t" +
+        [Convert]::ToBase64String([Text.Encoding]::UTF8.GetBytes($err)))
+    [Console]::Out.Flush()
+}
+'''
+
+# Scripts that can end the process are never sent to a shared host.
+_EXIT_RE = re.compile(r'\bexit\b|\[Environment\]::Exit', re.IGNORECASE)
+
+
+class PowerShellResult:
+    def __init__(self, returncode, stdout, stderr):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+def default_host_command():
+    """Command line for a persistent host, or None where PowerShell is unavailable."""
+    if sys.platform == 'win32':
+        exe = "powershell.exe"
+    else:
+        exe = shutil.which("pwsh")
+        if not exe:
+            return None
+    encoded = base64.b64encode(_BOOTSTRAP.encode("utf-16-le")).decode("ascii")
+    return [exe, "-NoLogo", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass",
+            "-EncodedCommand", encoded]
+
+
+class PowerShellHost:
+    """One long-lived PowerShell process that runs scripts sent over stdin.
+
+    Starting powershell.exe costs hundreds of milliseconds; a host pays that
+    once and then runs each script in-process.  ``command`` can point at any
+    program speaking the same line protocol, which is how the host is
+    exercised on Linux without PowerShell.
+    """
+
+    def __init__(self, command):
+        self.command = command
+        self.proc = None
+        self._replies = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _start(self):
+        kwargs = {}
+        if sys.platform == 'win32':
+            kwargs['creationflags'] = CREATE_NO_WINDOW
+        self.proc = subprocess.Popen(
+            self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, **kwargs
+        )
+        self._replies = queue.Queue()
+        threading.Thread(target=self._read_loop, args=(self.proc, self._replies), daemon=True).start()
+
+    @staticmethod
+    def _read_loop(proc, replies):
+        for raw in proc.stdout:
+            line = raw.decode("ascii", errors="replace").rstrip("\r\n")
+            if line.startswith(_MARKER):
+                replies.put(line[len(_MARKER):])
+        replies.put(None)  # process exited
+
+    @property
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def run(self, script, timeout=60):
+        with self._lock:
+            if not self.alive:
+                self._start()
+            self._next_id += 1
+            req_id = str(self._next_id)
+            payload = base64.b64encode(script.encode("utf-8")).decode("ascii")
+            try:
+                self.proc.stdin.write(f"{req_id}\t{payload}\n".encode("ascii"))
+                self.proc.stdin.flush()
+            except OSError as e:
+                self.close()
+                return PowerShellResult(-1, "", f"PowerShell host unavailable: {e}")
+
+            while True:
+                try:
+                    reply = self._replies.get(timeout=timeout)
+                except queue.Empty:
+                    # The script is stuck; the host cannot be reused safely.
+                    self.close()
+                    return PowerShellResult(-1, "", f"PowerShell script timed out after {timeout}s")
+                if reply is None:
+                    self.close()
+                    return PowerShellResult(-1, "", "PowerShell host exited unexpectedly")
+                fields = reply.split("\t")
+                if len(fields) != 4 or fields[0] != req_id:
+                    continue  # stale reply from an earlier, timed-out request
+                try:
+                    return PowerShellResult(
+                        int(fields[1]),
+                        base64.b64decode(fields[2]).decode("utf-8", errors="replace"),
+                        base64.b64decode(fields[3]).decode("utf-8", errors="replace"),
+                    )
+                except ValueError as e:
+                    return PowerShellResult(-1, "", f"Malformed PowerShell host reply: {e}")
+
+    def close(self):
+        if self.proc is not None:
+            try:
+                self.proc.stdin.close()
+            except Exception:
+                pass
+            try:
+                self.proc.kill()
+            except Exception:
+                pass
+            self.proc = None
+
+
+class PowerShellPool:
+    """A small pool of PowerShellHost processes shared across the app.
+
+    run() borrows an idle host, so up to ``size`` scripts run at once;
+    run_many() spreads a batch of scripts across the pool and returns the
+    results in order.
+    """
+
+    def __init__(self, size=3, host_command=None):
+        self.size = size
+        self.host_command = host_command if host_command is not None else default_host_command()
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return bool(self.host_command)
+
+    def _acquire(self, timeout):
+        """Borrow a host, waiting at most ``timeout`` seconds; None if all stay busy."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return PowerShellHost(self.host_command)
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def run(self, script, timeout=60):
+        if not self.available:
+            return PowerShellResult(-1, "", "PowerShell is not available on this platform.")
+        if _EXIT_RE.search(script):
+            return _run_once(script, timeout)
+        started = time.monotonic()
+        host = self._acquire(timeout)
+        if host is None:
+            return PowerShellResult(-1, "", f"PowerShell pool busy: no host free within {timeout}s")
+        # The wait for a host counts against the script's own timeout.
+        remaining = max(timeout - (time.monotonic() - started), 0.1)
+        try:
+            return host.run(script, remaining)
+        finally:
+            self._idle.put(host)
+
+    def run_many(self, scripts, timeout=60):
+        if not scripts:
+            return []
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(self.size, len(scripts))) as pool:
+            return list(pool.map(lambda s: self.run(s, timeout), scripts))
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+
+def _run_once(script, timeout):
+    from src.utils.helpers import run_command
+    exe = "powershell.exe" if sys.platform == 'win32' else (shutil.which("pwsh") or "pwsh")
+    return run_command([exe, "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass", "-Command", script],
+                       timeout=timeout)
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_powershell_pool():
+    """Return the process-wide PowerShell pool, creating it on first use."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            size = int(os.environ.get("GHOSTY_PS_HOSTS", "3"))
+            _shared_pool = PowerShellPool(size=size)
+        return _shared_pool
+
+
+def run_powershell(script, timeout=60):
+    """Run a PowerShell script on the shared pool; returns an object with returncode/stdout/stderr."""
+    return get_powershell_pool().run(script, timeout)
+
+
+def run_powershell_many(scripts, timeout=60):
+    """Run several scripts on the shared pool and return their results in order."""
+    return get_powershell_pool().run_many(scripts, timeout)
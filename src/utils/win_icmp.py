@@ -0,0 +1,93 @@
+import sys
+import time
+import socket
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# IP_STATUS values from ipexport.h
+IP_SUCCESS = 0
+IP_DEST_UNREACHABLE = range(11002, 11006)   # net, host, protocol, port
+IP_REQ_TIMED_OUT = 11010
+IP_TTL_EXPIRED_TRANSIT = 11013
+
+_api = None
+_api_lock = threading.Lock()
+
+
+def _load():
+    """Bind iphlpapi's ICMP functions once; returns None where they do not exist."""
+    global _api
+    with _api_lock:
+        if _api is not None:
+            return _api or None
+        if sys.platform != "win32":
+            _api = False
+            return None
+        import ctypes
+        from ctypes import wintypes
+
+        class IP_OPTION_INFORMATION(ctypes.Structure):
+            _fields_ = [("Ttl", ctypes.c_ubyte), ("Tos", ctypes.c_ubyte), ("Flags", ctypes.c_ubyte),
+                        ("OptionsSize", ctypes.c_ubyte), ("OptionsData", ctypes.c_void_p)]
+
+        class ICMP_ECHO_REPLY(ctypes.Structure):
+            _fields_ = [("Address", ctypes.c_uint32), ("Status", ctypes.c_uint32),
+                        ("RoundTripTime", ctypes.c_uint32), ("DataSize", ctypes.c_ushort),
+                        ("Reserved", ctypes.c_ushort), ("Data", ctypes.c_void_p),
+                        ("Options", IP_OPTION_INFORMATION)]
+
+        try:
+            iphlpapi = ctypes.WinDLL("iphlpapi")
+            iphlpapi.IcmpCreateFile.restype = wintypes.HANDLE
+            iphlpapi.IcmpCloseHandle.argtypes = [wintypes.HANDLE]
+            iphlpapi.IcmpSendEcho.restype = wintypes.DWORD
+            iphlpapi.IcmpSendEcho.argtypes = [wintypes.HANDLE, ctypes.c_uint32, ctypes.c_void_p, wintypes.WORD,
+                                              ctypes.POINTER(IP_OPTION_INFORMATION), ctypes.c_void_p,
+                                              wintypes.DWORD, wintypes.DWORD]
+        except (OSError, AttributeError) as e:
+            logger.debug(f"ICMP helper API unavailable: {e}")
+            _api = False
+            return None
+        _api = (ctypes, iphlpapi, IP_OPTION_INFORMATION, ICMP_ECHO_REPLY, wintypes.HANDLE(-1).value)
+        return _api
+
+
+def available():
+    """True on Windows when IcmpSendEcho can be used (no admin rights needed)."""
+    return _load() is not None
+
+
+def echo(dest_ip, ttl=None, timeout=1.0, payload=b"GHOSTY-PROBE"):
+    """Send one IPv4 echo request and wait for the answer.
+
+    Returns (status, address, rtt_ms): status is an IP_* value (IP_SUCCESS
+    when ``dest_ip`` itself replied, IP_TTL_EXPIRED_TRANSIT when the router
+    at ``address`` dropped it because of ``ttl``), or (None, None, None) if
+    nothing answered.  Blocks for up to ``timeout`` seconds outside the GIL,
+    so callers run it on a thread.
+    """
+    api = _load()
+    if api is None:
+        raise OSError("ICMP helper API is not available on this platform")
+    ctypes, iphlpapi, IP_OPTION_INFORMATION, ICMP_ECHO_REPLY, invalid = api
+
+    dest = int.from_bytes(socket.inet_aton(dest_ip), "little")  # IPAddr is in network byte order
+    handle = iphlpapi.IcmpCreateFile()
+    if not handle or handle == invalid:
+        raise ctypes.WinError()
+    try:
+        options = IP_OPTION_INFORMATION(Ttl=ttl or 128)
+        reply = ctypes.create_string_buffer(ctypes.sizeof(ICMP_ECHO_REPLY) + len(payload) + 64)
+        start = time.perf_counter()
+        # The buffer starts zeroed, so an unanswered request reads back as Address 0.
+        iphlpapi.IcmpSendEcho(handle, dest, payload, len(payload), ctypes.byref(options),
+                              reply, len(reply), max(1, int(timeout * 1000)))
+        elapsed = (time.perf_counter() - start) * 1000
+        answer = ICMP_ECHO_REPLY.from_buffer(reply)
+        if not answer.Address or answer.Status == IP_REQ_TIMED_OUT:
+            return None, None, None
+        return answer.Status, socket.inet_ntoa(answer.Address.to_bytes(4, "little")), elapsed
+    finally:
+        iphlpapi.IcmpCloseHandle(handle)